@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# _bench_common.py - Shared helpers for the Starget benchmarks
+#
+# The driver modules live in ../device and are imported by their bare names,
+# exactly as app.py does. config.py loads config.toml from sys.path[0], so the
+# device directory must be first on the path *before* any driver import.
+# Import this module first in every benchmark script.
+# -----------------------------------------------------------------------------
+import os
+import sys
+import logging
+import threading
+import statistics
+
+DEVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'device'))
+sys.path.insert(0, DEVICE_DIR)
+
+
+def quiet_logger() -> logging.Logger:
+    """Logger for benchmarks: only warnings and errors, to stderr"""
+    logger = logging.getLogger('bench')
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+    return logger
+
+
+def init_device(logger: logging.Logger | None = None):
+    """Start and connect the telescope device and share the logger like app.main()
+
+    Returns:
+        The connected :py:class:`telescopedevice.TelescopeDevice`
+    """
+    import app
+    import telescope
+    logger = logger or quiet_logger()
+    app.share_logger(logger)
+    tel_dev = telescope.start_tel_device(logger)
+    tel_dev.connected = True
+    return tel_dev
+
+
+def start_emulator(latency: float = 0.0005, baudrate: int = 115200):
+    """Start the SERVO42C emulator on a pty and point Config.motors_port at it
+
+    Call before :py:func:`init_device` so the motors of the device use it.
+
+    Returns:
+        The running :py:class:`mks_emulator.MKSEmulator`
+    """
+    from config import Config
+    from mks_emulator import MKSEmulator
+    emulator = MKSEmulator((Config.ra_address, Config.dec_address), latency, baudrate).start()
+    Config.motors_port = emulator.port
+    return emulator
+
+
+def serve_in_thread(falc_app, mode: str, workers: int):
+    """Serve the Falcon app on a free localhost port from a background thread
+
+    Returns:
+        (server, port) - call ``server.shutdown()`` then ``server.server_close()``
+    """
+    import app
+    server = app.make_alpaca_server('127.0.0.1', 0, falc_app, mode=mode, workers=workers)
+    thread = threading.Thread(target=server.serve_forever, name='BenchServer', daemon=True)
+    thread.start()
+    return server, server.server_address[1]
+
+
+def percentile(samples: list, q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]"""
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def latency_summary(latencies_s: list) -> dict:
+    """p50/p95/p99/mean/max of a list of latencies in seconds, reported in ms"""
+    ms = [x * 1000 for x in latencies_s]
+    return {
+        'count': len(ms),
+        'mean_ms': statistics.fmean(ms) if ms else float('nan'),
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': max(ms) if ms else float('nan'),
+    }
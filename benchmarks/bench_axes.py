@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_axes.py - Concurrency of RA and DEC work in AsyncTaskManager
+#
+# Submits two-axis work to the task manager the old way (everything through
+# the single 'main' lane, one task after the other) and through the per-axis
+# lanes, and reports the end-to-end completion time. The axis moves are
+# simulated with asyncio.sleep() of the given durations.
+#
+#   slew       both axes of a slew (add_axes_task vs. two main-lane tasks)
+#   move+guide MoveAxis on RA while a guide pulse runs on DEC
+#
+#   python benchmarks/bench_axes.py [--ra 0.4] [--dec 0.3] [--repeat 5]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+from _bench_common import quiet_logger
+from telescope_enum import TaskPriority
+
+
+def axis_move(duration: float):
+    async def move():
+        await asyncio.sleep(duration)
+    return move
+
+
+def run_serial(tm, ra: float, dec: float) -> float:
+    """Both axis moves queued in the main lane, as before the lanes existed"""
+    finished = threading.Event()
+
+    async def last():
+        await asyncio.sleep(dec)
+        finished.set()
+
+    t0 = time.perf_counter()
+    tm.add_task(axis_move(ra), TaskPriority.SLEW, 'serial RA')
+    tm.add_task(last, TaskPriority.SLEW, 'serial DEC')
+    finished.wait()
+    return time.perf_counter() - t0
+
+
+def run_slew(tm, ra: float, dec: float) -> float:
+    finished = threading.Event()
+
+    async def done():
+        finished.set()
+
+    t0 = time.perf_counter()
+    tm.add_axes_task({'RA': axis_move(ra), 'DEC': axis_move(dec)}, TaskPriority.SLEW, 'slew', done)
+    finished.wait()
+    return time.perf_counter() - t0
+
+
+def run_move_guide(tm, ra: float, dec: float) -> float:
+    remaining = [2]
+    finished = threading.Event()
+    lock = threading.Lock()
+
+    def part(duration):
+        async def run():
+            await asyncio.sleep(duration)
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    finished.set()
+        return run
+
+    t0 = time.perf_counter()
+    tm.add_task(part(ra), TaskPriority.SLEW, 'MoveAxis', 'RA')
+    tm.add_task(part(dec), TaskPriority.GUIDING, 'PulseGuide', 'DEC')
+    finished.wait()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ra', type=float, default=0.4, help='RA move duration [s]')
+    parser.add_argument('--dec', type=float, default=0.3, help='DEC move duration [s]')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from telescopedevice import AsyncTaskManager
+    tm = AsyncTaskManager(quiet_logger())
+    tm.start()
+
+    print(f'RA move {args.ra:.2f} s, DEC move {args.dec:.2f} s, {args.repeat} runs each')
+    print(f'{"case":<22} {"mean s":>8} {"max s":>8}')
+    for label, fn in (('serial (main lane)', run_serial),
+                      ('slew (axis lanes)', run_slew),
+                      ('move+guide (lanes)', run_move_guide)):
+        times = [fn(tm, args.ra, args.dec) for _ in range(args.repeat)]
+        print(f'{label:<22} {statistics.fmean(times):>8.3f} {max(times):>8.3f}')
+    tm.stop_loop()
+
+
+if __name__ == '__main__':
+    main()
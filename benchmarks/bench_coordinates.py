@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_coordinates.py - Equatorial <-> horizontal transforms: speed and accuracy
+#
+# Times utilities.convert_eq_to_altaz / convert_altaz_to_eq with the NumPy
+# engine and with astropy for scalar calls and for batches, and reports the
+# worst difference between the two engines over the batch.
+#
+#   python benchmarks/bench_coordinates.py [--points 10000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import time
+
+import numpy as np
+
+import utilities
+
+LAT, LON, ELEV = 45.0, 2.35, 100.0
+
+
+def timed(fn, repeat: int) -> float:
+    fn()                                                # Warm up (caches, astropy tables)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, default=10000)
+    args = parser.parse_args()
+
+    now = time.time()
+    rng = np.random.default_rng(0)
+    ra = rng.uniform(0, 24, args.points)
+    dec = rng.uniform(-85, 89, args.points)
+
+    print(f'{"case":<28} {"numpy":>14} {"astropy":>14}')
+    for name, fn_np, fn_ap, n in [
+        ('eq_to_altaz scalar',
+         lambda: utilities.convert_eq_to_altaz(5.5, 20.0, LAT, LON, ELEV, now, accurate=False),
+         lambda: utilities.convert_eq_to_altaz(5.5, 20.0, LAT, LON, ELEV, now, accurate=True), 1),
+        (f'eq_to_altaz x{args.points}',
+         lambda: utilities.convert_eq_to_altaz(ra, dec, LAT, LON, ELEV, now, accurate=False),
+         lambda: utilities.convert_eq_to_altaz(ra, dec, LAT, LON, ELEV, now, accurate=True), args.points),
+        (f'altaz_to_eq x{args.points}',
+         lambda: utilities.convert_altaz_to_eq(dec, ra * 15, LAT, LON, ELEV, now, accurate=False),
+         lambda: utilities.convert_altaz_to_eq(dec, ra * 15, LAT, LON, ELEV, now, accurate=True), args.points),
+    ]:
+        t_np = timed(fn_np, 200 if n == 1 else 20)
+        t_ap = timed(fn_ap, 5)
+        print(f'{name:<28} {t_np / n * 1e6:>10.3f} us/pt {t_ap / n * 1e6:>10.1f} us/pt')
+
+    alt_np, az_np = utilities.convert_eq_to_altaz(ra, dec, LAT, LON, ELEV, now, accurate=False)
+    alt_ap, az_ap = utilities.convert_eq_to_altaz(ra, dec, LAT, LON, ELEV, now, accurate=True)
+    daz = ((az_np - az_ap + 180) % 360 - 180) * np.cos(np.radians(alt_ap))
+    print(f'Worst numpy vs astropy: alt {np.abs(alt_np - alt_ap).max() * 3600:.2f}", '
+          f'az {np.abs(daz).max() * 3600:.2f}" (on sky)')
+
+
+if __name__ == '__main__':
+    main()
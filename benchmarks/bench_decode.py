@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_decode.py - MKS SERVO42C read command encode/decode throughput
+#
+# CPU cost of the host side of a motor query, without any I/O: building the
+# command frame and checking + decoding the reply. Compares the cached
+# frames and precompiled struct.Struct decoders of MKSMotor with building
+# the frame via struct.pack and decoding with int.from_bytes on each call.
+#
+#   python benchmarks/bench_decode.py [--number 200000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import struct
+import timeit
+
+from motor_control import MKSMotor, READ_DECODERS, REPLY_LENGTHS, check_reply, decode_reply
+
+# A valid reply for each read command
+REPLIES = {
+    0x30: bytes.fromhex('e0 00 00 00 00 40 00 20'),
+    0x33: bytes.fromhex('e0 00 00 01 00 e1'),
+    0x36: bytes.fromhex('e0 00 00 40 00 20'),
+    0x39: bytes.fromhex('e0 00 b7 97'),
+    0x3A: bytes.fromhex('e0 01 e1'),
+    0x3E: bytes.fromhex('e0 02 e2'),
+}
+SIGNED = {0x33, 0x36, 0x39}
+
+
+def naive(opcode: int, reply: bytes) -> int:
+    command = [0xe0, opcode]
+    frame = struct.pack('<' + 'B' * (len(command) + 1), *command, sum(command) & 0xFF)
+    if len(reply) != REPLY_LENGTHS[opcode] or reply[0] != frame[0] or sum(reply[:-1]) & 0xFF != reply[-1]:
+        raise ValueError
+    if opcode == 0x30:
+        return (int.from_bytes(reply[1:5], 'big', signed=True) << 16) + int.from_bytes(reply[5:7], 'big')
+    return int.from_bytes(reply[1:-1], 'big', signed=opcode in SIGNED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200000, help='calls per measurement')
+    args = parser.parse_args()
+
+    motor = MKSMotor(lambda: True, 'e0')
+    frames = motor._query_frames
+
+    def compiled(opcode: int, reply: bytes):
+        frame, reply_len = frames[opcode]
+        return decode_reply(opcode, check_reply(frame, reply, reply_len))
+
+    print(f'{"command":<8} {"value":>14} {"naive ns":>9} {"compiled ns":>12} {"Mdecodes/s":>11}')
+    for opcode in READ_DECODERS:
+        reply = REPLIES[opcode]
+        assert naive(opcode, reply) == compiled(opcode, reply)
+        t_naive = min(timeit.repeat(lambda: naive(opcode, reply), number=args.number, repeat=3)) / args.number
+        t_comp = min(timeit.repeat(lambda: compiled(opcode, reply), number=args.number, repeat=3)) / args.number
+        value = compiled(opcode, reply)
+        print(f'0x{opcode:02X}     {getattr(value, "name", value):>14} {t_naive * 1e9:>9.0f} {t_comp * 1e9:>12.0f}'
+              f' {1e-6 / t_comp:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
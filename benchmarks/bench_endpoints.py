@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_endpoints.py - Endpoint latency/throughput benchmark with baselines
+#
+# Replays the polling patterns of real Alpaca clients against the telescope
+# endpoints, both in-process (falcon.testing, no network) and over a real
+# keep-alive socket (threaded server):
+#
+#   nina       devicestate + slewing, as NINA's telescope mediator polls
+#   phd2       pulseguide + ispulseguiding, as PHD2 guides through ASCOM
+#   skysafari  rightascension + declination
+#   sweep      every GET endpoint registered by app.init_routes, in turn
+#
+# Reports throughput, p50/p95/p99 latency and, in-process, the memory
+# allocated per request (tracemalloc peak above the starting point) and the
+# blocks still held afterwards (leaks show up here). Results can be saved as
+# a JSON baseline and compared against a previous one:
+#
+#   python benchmarks/bench_endpoints.py --save v0.3
+#   python benchmarks/bench_endpoints.py --compare benchmarks/baselines/v0.3.json
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import datetime
+import http.client
+import inspect
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+from _bench_common import init_device, quiet_logger, serve_in_thread, latency_summary
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+API_ROOT = '/api/v1/telescope/0/'
+
+# name -> [(method, endpoint, fields, weight)]
+SCENARIOS = {
+    'nina': [
+        ('GET', 'devicestate', {}, 1),
+        ('GET', 'slewing', {}, 1),
+    ],
+    'phd2': [
+        ('PUT', 'pulseguide', {'Direction': '0', 'Duration': '20'}, 1),
+        ('GET', 'ispulseguiding', {}, 3),
+    ],
+    'skysafari': [
+        ('GET', 'rightascension', {}, 1),
+        ('GET', 'declination', {}, 1),
+    ],
+}
+
+SWEEP_FIELDS = {'Axis': '0', 'RightAscension': '6.0', 'Declination': '45.0'}
+
+# Reported metrics and whether a higher value is better (for --compare)
+METRICS = {'rps': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False,
+           'alloc_kib_per_req': False}
+
+
+def sweep_scenario() -> list:
+    """Every GET responder of telescope.py, once per round
+
+    Uses the same class inspection as :py:func:`app.init_routes`. Endpoints
+    needing parameters (axisrates, destinationsideofpier...) get them all.
+    """
+    import telescope
+    mix = []
+    for name, cls in inspect.getmembers(telescope, inspect.isclass):
+        if cls.__module__ == telescope.__name__ and hasattr(cls, 'on_get'):
+            mix.append(('GET', name.lower(), SWEEP_FIELDS, 1))
+    return mix
+
+
+def expand(mix: list) -> list:
+    return [(m, API_ROOT + ep, f) for m, ep, f, w in mix for _ in range(w)]
+
+
+class InProcessClient:
+    """Drives the Falcon app directly through falcon.testing"""
+    def __init__(self, falc_app):
+        from falcon import testing
+        self.client = testing.TestClient(falc_app)
+
+    def request(self, method: str, path: str, fields: dict) -> int:
+        if method == 'GET':
+            return self.client.simulate_get(path, params=fields).status_code
+        return self.client.simulate_put(path, body=urlencode(fields),
+                                        content_type='application/x-www-form-urlencoded').status_code
+
+
+class SocketClient:
+    """One keep-alive HTTP connection to the served app"""
+    def __init__(self, port: int):
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+
+    def request(self, method: str, path: str, fields: dict) -> int:
+        if method == 'GET':
+            self.conn.request('GET', f'{path}?{urlencode(fields)}')
+        else:
+            self.conn.request('PUT', path, body=urlencode(fields),
+                              headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        resp = self.conn.getresponse()
+        resp.read()
+        return resp.status
+
+    def close(self):
+        self.conn.close()
+
+
+def drive(client, mix: list, client_id: int, stop_at: float, latencies: list, errors: list):
+    n = 0
+    while time.perf_counter() < stop_at:
+        method, path, fields = mix[n % len(mix)]
+        n += 1
+        fields = dict(fields, ClientID=str(client_id), ClientTransactionID=str(n))
+        t0 = time.perf_counter()
+        try:
+            status = client.request(method, path, fields)
+        except (OSError, http.client.HTTPException) as ex:
+            errors.append(repr(ex))
+            continue
+        latencies.append(time.perf_counter() - t0)
+        if status != 200:
+            errors.append(status)
+
+
+def run_inprocess(falc_app, mix: list, duration: float) -> dict:
+    latencies: list = []
+    errors: list = []
+    client = InProcessClient(falc_app)
+    t0 = time.perf_counter()
+    drive(client, mix, 1, t0 + duration, latencies, errors)
+    elapsed = time.perf_counter() - t0
+    res = latency_summary(latencies)
+    res.update({'rps': len(latencies) / elapsed, 'errors': len(errors)})
+    res.update(measure_allocations(client, mix))
+    return res
+
+
+def measure_allocations(client, mix: list, rounds: int = 20) -> dict:
+    """tracemalloc peak per request and blocks still allocated afterwards"""
+    n = rounds * len(mix)
+    for method, path, fields in mix:                    # Warm caches first
+        client.request(method, path, dict(fields, ClientID='1', ClientTransactionID='1'))
+    tracemalloc.start()
+    peak_total = 0
+    blocks_before = sys.getallocatedblocks()
+    for i in range(n):
+        method, path, fields = mix[i % len(mix)]
+        fields = dict(fields, ClientID='1', ClientTransactionID=str(i + 1))
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        client.request(method, path, fields)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - start
+    retained = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    return {'alloc_kib_per_req': peak_total / n / 1024, 'retained_blocks_per_req': retained / n}
+
+
+def run_socket(port: int, mix: list, nclients: int, duration: float) -> dict:
+    latencies: list = []
+    errors: list = []
+    stop_at = time.perf_counter() + duration
+
+    def one_client(client_id):
+        client = SocketClient(port)
+        drive(client, mix, client_id, stop_at, latencies, errors)
+        client.close()
+
+    threads = [threading.Thread(target=one_client, args=(i + 1,)) for i in range(nclients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    res = latency_summary(latencies)
+    res.update({'rps': len(latencies) / elapsed, 'errors': len(errors), 'clients': nclients})
+    return res
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """Print the change of each metric vs. the baseline, return the regression count"""
+    regressions = 0
+    print(f'\n== vs. {baseline["meta"].get("name", "?")} ({baseline["meta"].get("git", "?")}) ==')
+    for key, res in results.items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        cells = []
+        for metric, higher_better in METRICS.items():
+            if metric not in res or metric not in old or not old[metric]:
+                continue
+            change = res[metric] / old[metric] - 1
+            worse = -change if higher_better else change
+            flag = ''
+            if worse > tolerance:
+                flag = '!'
+                regressions += 1
+            cells.append(f'{metric} {change:+.0%}{flag}')
+        print(f'{key:<20} ' + '  '.join(cells))
+    if regressions:
+        print(f'{regressions} metric(s) worse than the baseline by more than {tolerance:.0%} (marked !)')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds per scenario and transport')
+    parser.add_argument('--scenarios', default=','.join(list(SCENARIOS) + ['sweep']))
+    parser.add_argument('--transports', default='inprocess,socket')
+    parser.add_argument('--clients', type=int, default=1, help='concurrent socket clients per scenario')
+    parser.add_argument('--save', metavar='NAME', help=f'save the results as {BASELINE_DIR}/NAME.json')
+    parser.add_argument('--compare', metavar='FILE', help='compare with a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative change counted as a regression by --compare (exit status 1)')
+    args = parser.parse_args()
+
+    import app
+    logger = quiet_logger()
+    logger.setLevel(logging.CRITICAL)                   # Alpaca errors of the sweep are expected
+    init_device(logger)
+    falc_app = app.create_app()
+    scenarios = dict(SCENARIOS, sweep=sweep_scenario())
+    transports = args.transports.split(',')
+    server = port = None
+    if 'socket' in transports:
+        server, port = serve_in_thread(falc_app, 'threaded', max(2, args.clients))
+
+    results = {}
+    print(f'{"scenario/transport":<20} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+          f' {"KiB/req":>8} {"errors":>6}')
+    for name in args.scenarios.split(','):
+        mix = expand(scenarios[name])
+        for transport in transports:
+            if transport == 'inprocess':
+                r = run_inprocess(falc_app, mix, args.duration)
+            else:
+                run_socket(port, mix, 1, 0.2)           # Warm up the connection path
+                r = run_socket(port, mix, args.clients, args.duration)
+            key = f'{name}/{transport}'
+            results[key] = r
+            kib = f'{r["alloc_kib_per_req"]:>8.1f}' if 'alloc_kib_per_req' in r else f'{"-":>8}'
+            print(f'{key:<20} {r["rps"]:>9.1f} {r["p50_ms"]:>8.3f} {r["p95_ms"]:>8.3f} {r["p99_ms"]:>8.3f}'
+                  f' {kib} {r["errors"]:>6}')
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f'{args.save}.json')
+        meta = {'name': args.save, 'git': git_revision(), 'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(), 'machine': platform.platform(),
+                'duration': args.duration, 'clients': args.clients}
+        with open(path, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+        print(f'\nSaved {path}')
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_homing.py - CPU used while homing
+#
+# Homes the emulated RA and DEC motors (device/mks_emulator.py) to a simulated
+# home switch and reports the wall time and the CPU time of the process:
+#
+#   busy-wait  the former MKSMotor.find_home: one axis after the other, the
+#              switch read in a `while not check_home(): pass` loop
+#   poll       AxisHoming, both axes at once, switch read every 10 ms
+#   edge       AxisHoming, both axes at once, woken by the switch edges
+#              (EdgeHomeSensor.notify, as from a GPIO interrupt)
+#   idle       nothing but the emulator, for reference
+#
+# The switch closes over a window of shaft positions. Its edges are notified
+# by a thread predicting them from the emulated motor speed, standing for
+# the GPIO interrupt. The CPU time includes the emulator and that thread.
+#
+#   python benchmarks/bench_homing.py [--switch 9000] [--repeat 2]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import asyncio
+import threading
+import time
+
+from _bench_common import quiet_logger
+from homing import AxisHoming, EdgeHomeSensor, HomeSensor
+from mks_emulator import MKSEmulator
+from motor_control import AsyncMKSMotor, MKSBus, MKSMotor, MKSTransport
+
+
+class SimulatedSwitch:
+    """Home switch closed while the shaft is within [start, start + width) pulses"""
+    def __init__(self, servo, start: float, width: float):
+        self.servo = servo
+        self.start = start
+        self.width = width
+        self.sensor = None                              # EdgeHomeSensor to notify
+        self._stop = threading.Event()
+
+    def position(self) -> float:
+        servo = self.servo
+        pos = servo.position + servo.velocity * (time.monotonic() - servo.t)
+        if servo.target is not None:
+            pos = min(pos, servo.target) if servo.velocity > 0 else max(pos, servo.target)
+        return pos - servo.zero
+
+    def closed(self) -> bool:
+        return self.start <= self.position() < self.start + self.width
+
+    def watch(self):
+        """Notify the sensor at each edge, sleeping until the next one is due"""
+        state = self.closed()
+        while not self._stop.is_set():
+            v = self.servo.velocity
+            wait = 0.01
+            if v:
+                pos = self.position()
+                edges = [e - pos for e in (self.start, self.start + self.width) if (e - pos) * v > 0]
+                if edges:
+                    wait = min(0.05, min(edges, key=abs) / v)
+            self._stop.wait(max(wait, 0.0005))
+            now = self.closed()
+            if now != state:
+                state = now
+                if self.sensor is not None:
+                    self.sensor.notify()
+
+    def start_watch(self):
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def stop_watch(self):
+        self._stop.set()
+
+
+def reset(emulator):
+    for servo in emulator.servos.values():
+        servo.velocity, servo.target = 0.0, None
+        servo.position = servo.zero = 0.0
+
+
+def measure(fn) -> tuple[float, float]:
+    w0, c0 = time.perf_counter(), time.process_time()
+    fn()
+    return time.perf_counter() - w0, time.process_time() - c0
+
+
+def home_busy_wait(port: str, switches: dict):
+    transport = MKSTransport(port)
+    for address, switch in switches.items():
+        motor = MKSMotor(switch.closed, address, transport=transport)
+        motor.move_constant_speed('CW', 60)
+        while not motor.check_home():
+            pass
+        motor.stop()
+    transport.close()
+
+
+def home_async(port: str, switches: dict, edge: bool) -> list:
+    bus = MKSBus(MKSTransport(port))
+    logger = quiet_logger()
+
+    async def both():
+        homings = []
+        for address, switch in switches.items():
+            sensor = EdgeHomeSensor(switch.closed, 1.0) if edge else HomeSensor(switch.closed, 0.01)
+            switch.sensor = sensor if edge else None
+            homings.append(AxisHoming(address, AsyncMKSMotor(switch.closed, address, bus), sensor, logger))
+        states = await asyncio.gather(*(h.run() for h in homings))
+        return states, sum(h.sensor.reads for h in homings)
+
+    result = asyncio.run(both())
+    bus.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--switch', type=float, default=9000, help='switch position [pulses] from the start')
+    parser.add_argument('--width', type=float, default=800, help='switch window [pulses]')
+    parser.add_argument('--repeat', type=int, default=2)
+    args = parser.parse_args()
+
+    emulator = MKSEmulator(('e0', 'e1')).start()
+    switches = {f'{a:02x}': SimulatedSwitch(servo, args.switch, args.width) for a, servo in emulator.servos.items()}
+    for switch in switches.values():
+        switch.start_watch()
+
+    print(f'Switch at {args.switch:.0f} pulses ({args.width:.0f} wide), seek 60 rpm, approach 5 rpm')
+    print(f'{"mode":<10} {"wall s":>8} {"CPU s":>8} {"CPU %":>7} {"reads":>9} {"result":>8}')
+    for mode in ('busy-wait', 'poll', 'edge', 'idle'):
+        for _ in range(args.repeat):
+            reset(emulator)
+            reads, result = '-', ''
+            if mode == 'busy-wait':
+                wall, cpu = measure(lambda: home_busy_wait(emulator.port, switches))
+            elif mode == 'idle':
+                wall, cpu = measure(lambda: time.sleep(3))
+            else:
+                out = []
+                wall, cpu = measure(lambda: out.append(home_async(emulator.port, switches, mode == 'edge')))
+                states, reads = out[0]
+                result = '/'.join(s.name for s in states)
+            print(f'{mode:<10} {wall:>8.2f} {cpu:>8.2f} {cpu / wall * 100:>7.1f} {reads:>9} {result:>8}')
+    for switch in switches.values():
+        switch.stop_watch()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
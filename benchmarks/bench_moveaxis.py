@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_moveaxis.py - Handset bursts of MoveAxis through the rate mailbox
+#
+# A simulated handset holds the RA button: it PUTs moveaxis with a changing
+# rate at --rate calls/s for --duration seconds, then releases it (Rate=0).
+# The device drives the emulated motors (device/mks_emulator.py).
+#
+#   queued    one AsyncTaskManager task per call, each sending its rate, as
+#             MoveAxis worked before (with the motor command instead of
+#             the 5 s simulation)
+#   mailbox   TelescopeDevice.MoveAxis: the RA RateMailbox, newest rate per
+#             bus slot
+#
+# Reports the motor commands sent, the calls merged, the latency from a call
+# to the motor acknowledging its rate, and the time from the release to the
+# emulated motor standing still.
+#
+#   python benchmarks/bench_moveaxis.py [--rate 1000] [--duration 2]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import math
+import threading
+import time
+from urllib.parse import urlencode
+
+from _bench_common import init_device, quiet_logger, start_emulator
+from telescope_enum import TaskPriority
+
+PATH = '/api/v1/telescope/0/moveaxis'
+
+
+def legacy_move_axis(tel, latencies: list):
+    """MoveAxis as one queued task per call, recording each latency"""
+    apply = tel._axis_mover('RA', tel._RA_motor)
+
+    def move_axis(axis: int, rate: float):
+        posted_at = time.monotonic()
+
+        async def task():
+            await apply(rate)
+            latencies.append(time.monotonic() - posted_at)
+        tel.task_manager.add_task(task, TaskPriority.SLEW, 'MoveAxis', 'RA')
+    return move_axis
+
+
+def handset(falc_app, rate: float, duration: float) -> tuple[int, float]:
+    """PUT a varying RA rate, then 0; return the calls and the release time"""
+    from falcon import testing
+    client = testing.TestClient(falc_app)
+    n = 0
+    t0 = time.perf_counter()
+    next_at = t0
+    while next_at - t0 < duration:
+        time.sleep(max(0.0, next_at - time.perf_counter()))
+        n += 1
+        deg_s = 1.5 + math.sin((time.perf_counter() - t0) * 3)
+        body = urlencode({'Axis': 0, 'Rate': f'{deg_s:.3f}', 'ClientID': 1, 'ClientTransactionID': n})
+        client.simulate_put(PATH, body=body, content_type='application/x-www-form-urlencoded')
+        next_at += 1 / rate
+    released = time.monotonic()
+    body = urlencode({'Axis': 0, 'Rate': 0, 'ClientID': 1, 'ClientTransactionID': n + 1})
+    client.simulate_put(PATH, body=body, content_type='application/x-www-form-urlencoded')
+    return n + 1, released
+
+
+def wait_stopped(servo, timeout: float = 60.0) -> float:
+    end = time.monotonic() + timeout
+    while servo.velocity != 0.0 and time.monotonic() < end:
+        time.sleep(0.0005)
+    return time.monotonic()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=1000, help='moveaxis calls/s while the button is held')
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds the button is held')
+    args = parser.parse_args()
+
+    emulator = start_emulator()
+    import app
+    tel = init_device(quiet_logger())
+    falc_app = app.create_app()
+    servo = emulator.servos[tel._RA_motor.adress]
+    mailbox = tel._move_axis['RA']
+    driver_move_axis = tel.MoveAxis
+
+    print(f'Handset at {args.rate:g} calls/s for {args.duration:g} s, then release')
+    print(f'{"mode":<9} {"calls":>7} {"sent":>7} {"merged":>7} {"lat ms":>8} {"max ms":>8} {"stop ms":>8}')
+    for mode in ('queued', 'mailbox'):
+        latencies: list = []
+        tel.MoveAxis = legacy_move_axis(tel, latencies) if mode == 'queued' else driver_move_axis
+        mailbox.reset_stats()
+        calls, released = handset(falc_app, args.rate, args.duration)
+        stop_ms = (wait_stopped(servo) - released) * 1e3
+        if mode == 'queued':
+            while len(latencies) < calls:
+                time.sleep(0.01)
+            sent, merged = len(latencies), 0
+            lat_ms, max_ms = sum(latencies) / len(latencies) * 1e3, max(latencies) * 1e3
+        else:
+            time.sleep(0.1)
+            st = mailbox.stats()
+            sent, merged = st['sent'], st['merged']
+            lat_ms, max_ms = st['latency_mean'] * 1e3, st['latency_max'] * 1e3
+        print(f'{mode:<9} {calls:>7} {sent:>7} {merged:>7} {lat_ms:>8.1f} {max_ms:>8.1f} {stop_ms:>8.1f}')
+    tel.task_manager.stop_loop()
+    tel._motor_bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
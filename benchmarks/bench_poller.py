@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_poller.py - Position reads from the motor poller vs. from the bus
+#
+# Runs the telescope device against the SERVO42C emulator and lets --clients
+# threads poll rightascension, declination and devicestate in-process, each
+# at --rate requests/s, while the mount is idle then while the RA motor
+# turns at a constant speed:
+#
+#   poller     the properties read the MotorPoller ring buffers (the driver)
+#   bus        the same requests, each also reading both encoders on the bus,
+#              as the properties would without the poller
+#
+# Reports requests/s, latency and the bus load. While the RA motor turns,
+# the axis angle served by the poller is compared with the emulated shaft at
+# the same instant, interpolated and as the newest raw sample.
+#
+#   python benchmarks/bench_poller.py [--clients 4] [--rate 100] [--duration 2]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import statistics
+import threading
+import time
+
+from _bench_common import init_device, latency_summary, quiet_logger, start_emulator
+
+API_ROOT = '/api/v1/telescope/0/'
+ENDPOINTS = ('rightascension', 'declination', 'devicestate')
+
+
+def run_clients(falc_app, nclients: int, rate: float, duration: float, on_request=None) -> dict:
+    from falcon import testing
+    latencies: list = []
+    stop_at = time.perf_counter() + duration
+
+    def one_client(client_id):
+        client = testing.TestClient(falc_app)
+        n = 0
+        next_at = time.perf_counter()
+        while next_at < stop_at:
+            n += 1
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+            t0 = time.perf_counter()
+            if on_request is not None:
+                on_request()
+            client.simulate_get(API_ROOT + ENDPOINTS[n % len(ENDPOINTS)],
+                                params={'ClientID': client_id, 'ClientTransactionID': n})
+            latencies.append(time.perf_counter() - t0)
+            next_at = max(next_at + 1 / rate, t0)
+
+    threads = [threading.Thread(target=one_client, args=(i + 1,)) for i in range(nclients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    res = latency_summary(latencies)
+    res['rps'] = len(latencies) / (time.perf_counter() - t0)
+    return res
+
+
+def shaft_degrees(servo, gear: float) -> float:
+    """Axis angle [°] of an emulated servo now"""
+    pulses = servo.position + servo.velocity * (time.monotonic() - servo.t)
+    return (pulses - servo.zero) / servo.pulses_per_turn * 360 / gear
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=100, help='requests/s of each client')
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds per case')
+    parser.add_argument('--speed', type=int, default=16, help='RA constant speed code (0-127)')
+    args = parser.parse_args()
+
+    emulator = start_emulator()
+    import app
+    tel = init_device(quiet_logger())
+    falc_app = app.create_app()
+    bus, poller = tel._motor_bus, tel._poller
+    while poller.polls == 0:
+        time.sleep(0.01)
+    tel.SyncToCoordinates(6.0, 45.0)
+    encoders = [motor._query_frames[0x30] for motor in (tel._RA_motor, tel._DEC_motor)]
+
+    def read_encoders():
+        for frame, reply_len in encoders:
+            bus.transact(frame, reply_len)
+
+    print(f'{args.clients} clients at {args.rate:g} req/s, {", ".join(ENDPOINTS)}')
+    print(f'{"case":<18} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"bus req/s":>10} {"bus %":>6}')
+    for state, moving in (('idle', False), ('RA turning', True)):
+        if moving:
+            bus.transact(*tel._RA_motor._frame([0xF6, args.speed]))
+            time.sleep(0.5)                             # Poller switches to the slewing interval
+        for mode, hook in (('poller', None), ('bus', read_encoders)):
+            bus.reset_stats()
+            r = run_clients(falc_app, args.clients, args.rate, args.duration, hook)
+            st = bus.stats()
+            print(f'{state + " " + mode:<18} {r["rps"]:>9.1f} {r["p50_ms"]:>8.3f} {r["p99_ms"]:>8.3f}'
+                  f' {st["requests_per_s"]:>10.1f} {st["utilization"] * 100:>6.1f}')
+
+    servo = emulator.servos[int(tel._RA_motor.adress)]
+    interpolated, newest = [], []
+    end = time.perf_counter() + args.duration
+    while time.perf_counter() < end:
+        truth = shaft_degrees(servo, tel.r)
+        angle = poller.position('RA', time.monotonic())
+        sample = poller.rings['RA'].latest()
+        if angle is None:
+            continue
+        interpolated.append(abs(angle - truth) * 3600)
+        newest.append(abs(sample[1] / poller.counts_per_degree - truth) * 3600)
+        time.sleep(0.003)
+    bus.transact(*tel._RA_motor._frame([0xF7]))
+    print(f'\nRA axis error while turning (poll interval {poller.interval * 1e3:.0f} ms,'
+          f' {poller.failures} failed polls), arcsec')
+    print(f'{"read":<18} {"mean":>9} {"max":>9}')
+    print(f'{"interpolated":<18} {statistics.fmean(interpolated):>9.1f} {max(interpolated):>9.1f}')
+    print(f'{"newest sample":<18} {statistics.fmean(newest):>9.1f} {max(newest):>9.1f}')
+    tel.task_manager.stop_loop()
+    bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_pulseguide.py - PulseGuide timing and correction at the motor
+#
+# PUTs pulseguide through the Falcon app, an East/West and a North/South pulse
+# at once, --pulses times in all, with random guiding durations (100-2000 ms
+# by default), on the emulated motors (device/mks_emulator.py), tracking off:
+#
+#   sleep      the pulse ends in a task on the axis lane after
+#              asyncio.sleep(Duration), and counts from when it wakes
+#   deadline   TelescopeDevice.PulseGuide: pulse_guide.PulseGuider, the end
+#              called by the DeadlineScheduler thread and counted at the
+#              exact deadline
+#
+# Reports:
+#   start ms     PUT sent -> the rate synthesizer of the axis takes the pulse
+#   F6 ms        PUT sent -> first 0xF6 of the pulse received by the emulated
+#                motor; at 0.5 x sidereal the guide rate is 3.7 pulses/s and
+#                the dither sends code 1 for a slot once 2.5 pulses are owed,
+#                so this includes up to ~0.7 s of waiting for the first code
+#   F6 bus ms    0xF6 sent by the synthesizer -> received by the motor
+#   end late ms  end of the pulse called -> its deadline (PUT + Duration)
+#   IPG lag ms   IsPulseGuiding seen False (polled every 0.1 ms) -> deadline
+#   shaft "      emulated shaft motion over the pulse - guide rate x
+#                Duration, at the axis (1 pulse = 2.025"): within one dither
+#                slot per pulse (5 pulses), the owed fraction carried over
+#   total "      the same, summed over all the pulses of the axis: the drift
+#                left by the pulses
+#
+# p50 and p99 are those of the magnitudes, max the signed worst value.
+#
+#   python benchmarks/bench_pulseguide.py [--pulses 200] [--min-ms 100] [--max-ms 2000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+from _bench_common import init_device, percentile, quiet_logger, start_emulator
+from pulse_guide import PulseGuider
+from rate_synth import PULSES_PER_CODE
+from telescope_enum import GuideDirections, TaskPriority
+
+PATH = '/api/v1/telescope/0/pulseguide'
+ARCSEC_PER_PULSE = 360 * 3600 / (6400 * 100)          # r=100, Mstep=32
+SETTLE = 0.05                                           # [s] After the pulses, for the last slot and command
+
+
+class SleepGuider:
+    """PulseGuider stand-in ending the pulses with asyncio.sleep on the axis lane"""
+    def __init__(self, tel):
+        self.tel = tel
+        self._active: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def pulse(self, direction, duration_ms, start=None):
+        axis, sign = PulseGuider.AXES[GuideDirections(direction)]
+        mixer = self.tel._rate_mixers[axis]
+        with self._lock:
+            self._ids += 1
+            token = self._active[axis] = self._ids
+        mixer.set('guide', sign * self.tel._guide_codes[axis])
+
+        async def end():
+            await asyncio.sleep(duration_ms / 1000)
+            mixer.set('guide', 0)
+            with self._lock:
+                if self._active.get(axis) == token:
+                    del self._active[axis]
+        self.tel.task_manager.add_task(end, TaskPriority.GUIDING, 'PulseGuide', axis)
+
+    def guiding(self, now=None):
+        with self._lock:
+            return bool(self._active)
+
+    def cancel(self, axis=None):
+        pass
+
+
+class Recorder:
+    """set_code calls and taken changes of the synthesizers, 0xF6 received by the emulated motors, per axis"""
+    def __init__(self, synths: dict, servos: dict):
+        self.calls = {axis: [] for axis in synths}         # (at, called)
+        self.changes = {axis: [] for axis in synths}       # taken
+        self.sent = {axis: [] for axis in synths}          # 0xF6 sent by the synthesizer
+        self.commands = {axis: [] for axis in synths}      # 0xF6 received
+        for axis, synth in synths.items():
+            self._wrap(axis, synth, servos[axis])
+
+    def _wrap(self, axis, synth, servo):
+        set_code = synth.set_code
+
+        def recorded(code, at=None):
+            called = time.monotonic()
+            self.calls[axis].append((called if at is None else at, called))
+            set_code(code, at)
+        synth.set_code = recorded
+
+        def trace(event, code, t):
+            (self.changes if event == 'change' else self.sent)[axis].append(t)
+        synth.trace = trace
+
+        execute = servo.execute
+
+        def received(opcode, args):
+            if opcode == 0xF6:
+                self.commands[axis].append(time.monotonic())
+            return execute(opcode, args)
+        servo.execute = received
+
+    def clear(self):
+        for log in (*self.calls.values(), *self.changes.values(), *self.sent.values(), *self.commands.values()):
+            log.clear()
+
+
+def shaft(servo) -> float:
+    """[pulses] Emulated shaft position now (the emulator advances it on each command)"""
+    return servo.position + servo.velocity * (time.monotonic() - servo.t)
+
+
+def run(tel, falc_app, recorder, servos, pulses: int, min_ms: int, max_ms: int, rng) -> dict:
+    from falcon import testing
+    client = testing.TestClient(falc_app)
+    stats = {k: [] for k in ('start ms', 'F6 ms', 'F6 bus ms', 'end late ms', 'IPG lag ms', 'shaft "')}
+    totals = {axis: 0.0 for axis in servos}
+    n = 0
+    for _ in range(pulses // 2):
+        recorder.clear()
+        puts = {}
+        before = {axis: shaft(servo) for axis, servo in servos.items()}
+        for axis, choices in (('RA', (GuideDirections.guideEast, GuideDirections.guideWest)),
+                              ('DEC', (GuideDirections.guideNorth, GuideDirections.guideSouth))):
+            direction = rng.choice(choices)
+            duration = rng.randint(min_ms, max_ms)
+            n += 1
+            body = urlencode({'Direction': int(direction), 'Duration': duration, 'ClientID': 1,
+                              'ClientTransactionID': n})
+            t_put = time.monotonic()
+            client.simulate_put(PATH, body=body, content_type='application/x-www-form-urlencoded')
+            puts[axis] = (t_put, duration, PulseGuider.AXES[direction][1])
+        deadline = max(t + d / 1000 for t, d, _ in puts.values())
+        while tel.PulseGuiding:
+            time.sleep(0.0001)                          # Not a busy loop: leave the GIL to the scheduler
+        stats['IPG lag ms'].append((time.monotonic() - deadline) * 1e3)
+        time.sleep(SETTLE)
+        for axis, (t_put, duration, sign) in puts.items():
+            _, (end_at, end_called) = recorder.calls[axis][:2]
+            stats['start ms'].append((recorder.changes[axis][0] - t_put) * 1e3)
+            end = t_put + duration / 1000
+            stats['end late ms'].append((end_called - end) * 1e3)
+            sent = [t for t in recorder.commands[axis] if t_put <= t < end]
+            if sent:
+                stats['F6 ms'].append((sent[0] - t_put) * 1e3)
+            for t_sent in recorder.sent[axis]:
+                received = [t for t in recorder.commands[axis] if t >= t_sent]
+                if received:
+                    stats['F6 bus ms'].append((received[0] - t_sent) * 1e3)
+            expected = sign * float(tel._guide_codes[axis]) * PULSES_PER_CODE * duration / 1000
+            error = (shaft(servos[axis]) - before[axis] - expected) * ARCSEC_PER_PULSE
+            stats['shaft "'].append(error)
+            totals[axis] += error
+    stats['total "'] = list(totals.values())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pulses', type=int, default=200, help='pulses per mode (half RA, half Dec)')
+    parser.add_argument('--min-ms', type=int, default=100)
+    parser.add_argument('--max-ms', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    emulator = start_emulator()
+    import app
+    from config import Config
+    tel = init_device(quiet_logger())
+    falc_app = app.create_app()
+    servos = {'RA': emulator.servos[int(Config.ra_address, 16)], 'DEC': emulator.servos[int(Config.dec_address, 16)]}
+    recorder = Recorder(tel._rate_synths, servos)
+    guider = tel._guider
+    time.sleep(0.5)
+
+    print(f'{args.pulses} pulses per mode, {args.min_ms}-{args.max_ms} ms, RA and Dec at once, '
+          f'guide code {float(tel._guide_codes["RA"]):.5f} ({float(tel._guide_codes["RA"]) * 500:.2f} pulses/s)')
+    print(f'{"mode":<9} {"metric":<12} {"p50":>8} {"p99":>8} {"max":>8} {"n":>5}')
+    for mode in ('sleep', 'deadline'):
+        tel._guider = SleepGuider(tel) if mode == 'sleep' else guider
+        stats = run(tel, falc_app, recorder, servos, args.pulses, args.min_ms, args.max_ms, random.Random(args.seed))
+        for metric, samples in stats.items():
+            worst = max(samples, key=abs) if samples else float('nan')
+            p50, p99 = percentile([abs(x) for x in samples], 50), percentile([abs(x) for x in samples], 99)
+            print(f'{mode:<9} {metric:<12} {p50:>8.3f} {p99:>8.3f} {worst:>8.3f} {len(samples):>5}')
+    tel.task_manager.stop_loop()
+    tel._guide_scheduler.close()
+    tel._motor_bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_rate_mixer.py - Bus commands of an RA axis tracking with offsets
+#
+# Simulates --hours of RA tracking (r=100, Mstep=32) in simulated time, with
+# the rate sources of a guided, comet-tracking night updating the axis:
+#
+#   tracking   sidereal, its correction recomputed every --tick s (the
+#              tracking loop), changing by a few % now and then
+#   offset     RightAscensionRate written every second by the client, the
+#              same value, a new one every --offset-every s
+#   guide      an East or West pulse of 100-1000 ms every --guide-every s
+#
+# and counts the 0xF6 commands on the bus for each way of combining them:
+#
+#   per update   every source update converts the new sum and sends it: the
+#                integer code of the slot, then the dither as usual
+#   mixer        rate_mixer.RateMixer: the exact sum goes to the rate
+#                synthesizer when it changes, which sends 0xF6 only when the
+#                integer code of a 10 ms slot changes
+#
+# Both move the axis by the same position (the dither of rate_synth.SpeedDither),
+# checked at the end against the integral of the rates, in pulses: within
+# half a code for a slot (2.5 pulses), whatever the number of updates.
+#
+#   python benchmarks/bench_rate_mixer.py [--hours 1] [--tick 1] [--guide-every 2]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import heapq
+import random
+import time
+from fractions import Fraction
+
+from rate_mixer import RateMixer
+from rate_synth import DRIVE_RATES, PULSES_PER_CODE, SpeedDither, rate_code, round_fraction
+from telescope_enum import DriveRates
+
+R, MSTEP, MOTOR_TYPE = 100, 32, 1.8
+SLOT = 0.01
+
+
+class SlotSynth:
+    """RateSynthesizer in simulated time: the target is taken at the next slot"""
+    def __init__(self):
+        self.dither = SpeedDither(0)
+        self.code = Fraction(0)
+
+    def set_code(self, code, at=None):
+        self.code = Fraction(code)
+        self.dither.retarget(self.code)
+
+    def release(self):
+        pass
+
+
+def events(hours: float, tick: float, offset_every: float, guide_every: float, rng) -> list:
+    """(time, source, code) updates, sorted"""
+    sidereal = rate_code(DRIVE_RATES[DriveRates.driveSidereal], R, MSTEP, MOTOR_TYPE)
+    end = hours * 3600
+    heap = []
+    correction = Fraction(0)
+    for k in range(int(end / tick)):
+        if rng.random() < 0.1:                          # The encoder saw an error
+            correction = round_fraction(sidereal * rng.uniform(-0.05, 0.05))
+        heap.append((k * tick, 'tracking', sidereal + correction))
+    offset = Fraction(0)
+    for k in range(int(end)):
+        if k % int(offset_every) == 0:
+            offset = -rate_code(Fraction(rng.randint(-20, 20), 1000) * DRIVE_RATES[DriveRates.driveSidereal],
+                                R, MSTEP, MOTOR_TYPE)
+        heap.append((k + 0.5, 'offset', offset))
+    guide = rate_code(DRIVE_RATES[DriveRates.driveSidereal] / 2, R, MSTEP, MOTOR_TYPE)
+    t = 0.3
+    while t < end:
+        heap.append((t, 'guide', rng.choice((-1, 1)) * guide))
+        heap.append((t + rng.uniform(0.1, 1.0), 'guide', Fraction(0)))
+        t += guide_every
+    heapq.heapify(heap)
+    return [heapq.heappop(heap) for _ in range(len(heap))]
+
+
+def run(updates: list, hours: float, per_update: bool) -> dict:
+    synth = SlotSynth()
+    mixer = RateMixer(synth)
+    codes = dict.fromkeys(RateMixer.SOURCES, Fraction(0))
+    n_slots = int(hours * 3600 / SLOT)
+    i, last, commands, sums, moved, ideal = 0, None, 0, 0, 0, Fraction(0)
+    for k in range(n_slots):
+        sent = False
+        while i < len(updates) and updates[i][0] < (k + 1) * SLOT:
+            _, source, code = updates[i]
+            if per_update:                              # Each update converts and sends the new sum
+                codes[source] = code
+                synth.set_code(sum(codes.values()))
+                sums += 1
+                commands += 1
+                sent = True
+            else:
+                mixer.set(source, code)
+            i += 1
+        code = synth.dither.next()
+        if code != last and not sent:
+            commands += 1
+        last = code
+        moved += code
+        ideal += synth.code
+    return {'updates': i, 'sums': sums if per_update else mixer.changes, 'commands': commands,
+            'error': float((moved - ideal) * PULSES_PER_CODE * SLOT)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=1.0, help='simulated tracking time')
+    parser.add_argument('--tick', type=float, default=1.0, help='[s] tracking loop period')
+    parser.add_argument('--offset-every', type=float, default=60.0, help='[s] between new RightAscensionRate values')
+    parser.add_argument('--guide-every', type=float, default=2.0, help='[s] between guide pulses')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    updates = events(args.hours, args.tick, args.offset_every, args.guide_every, random.Random(args.seed))
+    print(f'{args.hours:g} h of RA tracking, {len(updates)} source updates, {SLOT * 1000:g} ms dither slots')
+    print(f'{"method":<11} {"updates":>8} {"sums":>8} {"0xF6":>8} {"0xF6/s":>7} {"end pulses":>10} {"CPU s":>6}')
+    for name, per_update in (('per update', True), ('mixer', False)):
+        c0 = time.process_time()
+        result = run(updates, args.hours, per_update)
+        cpu = time.process_time() - c0
+        print(f'{name:<11} {result["updates"]:>8} {result["sums"]:>8} {result["commands"]:>8} '
+              f'{result["commands"] / (args.hours * 3600):>7.2f} {result["error"]:>10.3f} {cpu:>6.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_serial.py - Round-trip time of the MKS SERVO42C commands
+#
+# Runs MKSMotor against the SERVO42C emulator (device/mks_emulator.py) on a
+# pseudo-terminal and reports the round-trip time per command of the framed
+# transport, next to the former write + sleep(0.1) + read_all() exchange.
+# The emulator paces its replies at --baudrate; the pty itself does not, so
+# the command bytes travel instantly.
+#
+# Then two threads (RA and DEC motors) poll the shaft angle through a shared
+# MKSBus for each pipeline depth, and the bus statistics are reported. The
+# utilization is computed at 115200 baud, as the line would be loaded.
+#
+#   python benchmarks/bench_serial.py [--count 200] [--latency 0.0005]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import statistics
+import threading
+import time
+
+from mks_emulator import MKSEmulator
+from motor_control import MKSBus, MKSMotor, MKSTransport, REPLY_LENGTHS
+
+
+def legacy_transact(ser, frame: bytes, reply_len: int) -> bytes:
+    """The exchange MKSMotor used before the framed transport"""
+    ser.write(frame)
+    time.sleep(0.1)
+    return ser.read_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=200, help='exchanges per command')
+    parser.add_argument('--latency', type=float, default=0.0005, help='emulated driver processing time [s]')
+    parser.add_argument('--baudrate', type=int, default=115200, help='emulated line speed, 0 for none')
+    parser.add_argument('--legacy-count', type=int, default=5, help='exchanges with the legacy read')
+    parser.add_argument('--bus-duration', type=float, default=1.0, help='seconds of polling per pipeline depth')
+    args = parser.parse_args()
+
+    emulator = MKSEmulator(('e0', 'e1'), args.latency, args.baudrate).start()
+    transport = MKSTransport(emulator.port, 115200, 0.05)
+    motor = MKSMotor(lambda: True, 'e0', transport=transport)
+
+    commands = [
+        ('read_encoder_value', motor.read_encoder_value),
+        ('read_shaft_angle', motor.read_shaft_angle),
+        ('read_EN_status', motor.read_EN_status),
+        ('stop', motor.stop),
+        ('move_to_target', lambda: motor.move_to_target(3200, 10)),
+    ]
+    print(f'Emulated driver latency {args.latency * 1e3:.2f} ms, line {args.baudrate} baud')
+    print(f'{"command":<20} {"mean us":>9} {"p99 us":>9} {"max us":>9}')
+    for name, fn in commands:
+        fn()
+        rtt = []
+        for _ in range(args.count):
+            t0 = time.perf_counter()
+            fn()
+            rtt.append((time.perf_counter() - t0) * 1e6)
+        rtt.sort()
+        print(f'{name:<20} {statistics.fmean(rtt):>9.0f} {rtt[int(0.99 * (len(rtt) - 1))]:>9.0f} {rtt[-1]:>9.0f}')
+
+    legacy = []
+    for _ in range(args.legacy_count):
+        t0 = time.perf_counter()
+        legacy_transact(transport.ser, bytes([0xe0, 0x36, 0x16]), REPLY_LENGTHS[0x36])
+        legacy.append((time.perf_counter() - t0) * 1e6)
+    print(f'{"legacy read_shaft":<20} {statistics.fmean(legacy):>9.0f} {max(legacy):>9.0f} {max(legacy):>9.0f}')
+    transport.close()
+
+    print(f'\n{"bus depth":<10} {"req/s":>8} {"util %":>7} {"depth avg":>9} {"depth max":>9}'
+          f' {"lat ms":>7} {"errors":>6}')
+    for depth in (1, 2):
+        bus = MKSBus(MKSTransport(emulator.port, 115200, 0.05), depth)
+        motors = [MKSMotor(lambda: True, a, transport=bus) for a in ('e0', 'e1')]
+        motors[0].read_shaft_angle()
+        bus.reset_stats()
+        stop_at = time.perf_counter() + args.bus_duration
+
+        def poll(motor):
+            while time.perf_counter() < stop_at:
+                motor.read_shaft_angle()
+
+        threads = [threading.Thread(target=poll, args=(m,)) for m in motors]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        st = bus.stats()
+        print(f'{depth:<10} {st["requests_per_s"]:>8.0f} {st["utilization"] * 100:>7.1f}'
+              f' {st["queue_depth_mean"]:>9.2f} {st["queue_depth_max"]:>9} {st["latency_mean"] * 1e3:>7.2f}'
+              f' {st["errors"]:>6}')
+        bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
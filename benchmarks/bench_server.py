@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_server.py - HTTP serving engine scaling benchmark
+#
+# Serves the real Falcon app on localhost in each serving mode and lets an
+# increasing number of keep-alive clients poll a mix of cheap and slow
+# (astropy-backed) endpoints. Reports requests/second and latency percentiles
+# for each client count.
+#
+#   python benchmarks/bench_server.py [--duration 3] [--clients 1,2,4,8,16]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import http.client
+import json
+import threading
+import time
+
+from _bench_common import init_device, serve_in_thread, latency_summary
+
+# (path, weight) - roughly what a planetarium + imaging app poll
+POLL_MIX = [
+    ('rightascension', 3),
+    ('declination', 3),
+    ('slewing', 3),
+    ('tracking', 1),
+    ('siderealtime', 1),
+    ('altitude', 1),
+    ('azimuth', 1),
+]
+
+
+def client_loop(port: int, client_id: int, stop_at: float, latencies: list, errors: list):
+    paths = [p for p, w in POLL_MIX for _ in range(w)]
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    n = 0
+    while time.perf_counter() < stop_at:
+        path = paths[n % len(paths)]
+        n += 1
+        url = f'/api/v1/telescope/0/{path}?ClientID={client_id}&ClientTransactionID={n}'
+        t0 = time.perf_counter()
+        try:
+            conn.request('GET', url)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                errors.append(resp.status)
+        except (OSError, http.client.HTTPException) as ex:
+            errors.append(repr(ex))
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def run(port: int, nclients: int, duration: float) -> dict:
+    latencies: list = []
+    errors: list = []
+    stop_at = time.perf_counter() + duration
+    threads = [threading.Thread(target=client_loop, args=(port, i + 1, stop_at, latencies, errors))
+               for i in range(nclients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    res = latency_summary(latencies)
+    res.update({'clients': nclients, 'rps': len(latencies) / elapsed, 'errors': len(errors)})
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=3.0, help='seconds per client count')
+    parser.add_argument('--clients', default='1,2,4,8,16', help='comma separated client counts')
+    parser.add_argument('--modes', default='simple,threaded')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    import app
+    init_device()
+    falc_app = app.create_app()
+    results = {}
+    for mode in args.modes.split(','):
+        server, port = serve_in_thread(falc_app, mode, args.workers)
+        run(port, 1, 0.5)                               # Warm up (astropy tables, imports)
+        print(f'\n== {mode} ({args.workers} workers) ==' if mode == 'threaded' else f'\n== {mode} ==')
+        print(f'{"clients":>7} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"max ms":>8} {"errors":>6}')
+        results[mode] = []
+        for n in [int(c) for c in args.clients.split(',')]:
+            r = run(port, n, args.duration)
+            results[mode].append(r)
+            print(f'{n:>7} {r["rps"]:>9.1f} {r["p50_ms"]:>8.2f} {r["p99_ms"]:>8.2f} {r["max_ms"]:>8.2f} {r["errors"]:>6}')
+        server.shutdown()
+        server.server_close()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_sidereal.py - Fast sidereal time engine: accuracy and speed
+#
+# Accuracy: compares astrometry.gast() with ERFA gst06a, the IAU 2006/2000A
+# model behind astropy's Time.sidereal_time('apparent'), at random epochs
+# from 1980 to 2050. Both get the same UT1 and TT, so the comparison measures
+# the model only (UT1-UTC is a configuration input, Config.dut1). Exits with
+# status 1 if the worst error reaches 0.01 s of time.
+#
+# Speed: per-call cost of utilities.get_local_sidereal_time with the fast
+# engine and with the astropy reference path.
+#
+#   python benchmarks/bench_sidereal.py [--samples 20000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import math
+import random
+import sys
+import time
+
+import erfa
+
+import astrometry
+import utilities
+
+TOLERANCE_S = 0.01
+JD_1980 = 2444239.5
+JD_2050 = 2469807.5
+
+
+def check_accuracy(samples: int) -> float:
+    rng = random.Random(1)
+    worst = 0.0
+    for _ in range(samples):
+        jd_ut1 = rng.uniform(JD_1980, JD_2050)
+        jd_tt = jd_ut1 + astrometry.TT_MINUS_UTC / astrometry.SECONDS_PER_DAY
+        ref = erfa.gst06a(jd_ut1, 0.0, jd_tt, 0.0)
+        err = (astrometry.gast(jd_ut1, jd_tt) - ref + math.pi) % (2 * math.pi) - math.pi
+        worst = max(worst, abs(err))
+    return worst * 43200 / math.pi                      # rad -> s of time
+
+
+def per_call_us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=20000)
+    args = parser.parse_args()
+
+    worst_s = check_accuracy(args.samples)
+    print(f'Worst |GAST - gst06a| over 1980-2050 ({args.samples} epochs): {worst_s * 1000:.3f} ms '
+          f'(tolerance {TOLERANCE_S * 1000:.0f} ms)')
+
+    lat, lon, h = 45.0, 2.35, 100.0
+    now = time.time()
+    diff_s = abs(utilities.get_local_sidereal_time(lat, lon, h, now)
+                 - utilities.get_local_sidereal_time_astropy(lat, lon, h, now)) * 3600
+    print(f'Fast vs astropy LST now (includes DUT1 = 0 assumption): {diff_s * 1000:.1f} ms')
+
+    fast = per_call_us(lambda: utilities.get_local_sidereal_time(lat, lon, h), 100000)
+    ref = per_call_us(lambda: utilities.get_local_sidereal_time_astropy(lat, lon, h), 200)
+    print(f'get_local_sidereal_time: fast {fast:.2f} us/call, astropy {ref:.0f} us/call ({ref / fast:.0f}x)')
+
+    if worst_s >= TOLERANCE_S:
+        print('FAIL: sidereal time error above tolerance')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_slew_planner.py - Slew planning time and landing error
+#
+# Plans --slews slews from random axis positions to random targets (|HA| <
+# 9 h, Dec -30..89°, meridian flips included) at [slew] of config.toml and the
+# device max rate, and compares with the estimate of the former
+# slew_to_coordinates_task (distance / rate, RA target moved once by the
+# sidereal drift over that time), both axes moving as fast as they can:
+#
+#   distance/rate   each axis on its own fastest profile; the RA target is
+#                   where the sky is after max(distance) / rate seconds
+#   planner         slew_planner.SlewPlanner, trapezoid (jerk 0) and S-curve:
+#                   arrival time re-estimated from the moving target, the
+#                   faster axis slowed down to arrive with the other one
+#
+# Reports the planning time per slew in microseconds (this machine; a Pi 4
+# runs Python about 4-6 x slower), the landing error on the moving target
+# (sidereal motion between the time used for the target and the real arrival
+# of the RA axis) in arcseconds, and the gap between the arrivals of the axes.
+#
+#   python benchmarks/bench_slew_planner.py [--slews 10000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import random
+import time
+
+from _bench_common import percentile
+from config import Config
+from slew_planner import SIDEREAL_RATE, AxisProfile, SlewPlanner
+
+RATE = 35.7                                             # [°/s] Top speed code, r=100, Mstep=32
+
+
+def targets(n: int, rng) -> list:
+    """(ha axis [°], dec axis [°], ra [h], dec [°], lst [h])"""
+    return [(rng.uniform(-90, 90), rng.uniform(-30, 89), rng.uniform(0, 24), rng.uniform(-30, 89),
+             rng.uniform(0, 24)) for _ in range(n)]
+
+
+def distance_rate(planner: SlewPlanner, ha_axis, dec_axis, ra, dec, lst) -> tuple[float, float]:
+    """(Landing error ["], arrival gap [s]) of the former estimate"""
+    side = planner.pier_side(lst - ra)
+    target_ha, target_dec = planner.axes(lst - ra, dec, side)
+    estimate = max(abs(target_ha - ha_axis), abs(target_dec - dec_axis)) / planner.max_rate
+    target_ha, _ = planner.axes(lst - ra + SIDEREAL_RATE * estimate / 15, dec, side)
+    ra_time = AxisProfile.fastest(target_ha - ha_axis, planner.max_rate, planner.accel, planner.jerk).duration
+    dec_time = AxisProfile.fastest(target_dec - dec_axis, planner.max_rate, planner.accel, planner.jerk).duration
+    return abs(ra_time - estimate) * SIDEREAL_RATE * 3600, abs(ra_time - dec_time)
+
+
+def planned(planner: SlewPlanner, ha_axis, dec_axis, ra, dec, lst) -> tuple[float, float]:
+    plan = planner.plan(ha_axis, dec_axis, ra, dec, lst)
+    ra_time, dec_time = plan.profiles['RA'].duration, plan.profiles['DEC'].duration
+    exact_ha, _ = planner.axes(lst - ra + SIDEREAL_RATE * ra_time / 15, dec, plan.pier_side)
+    return abs(exact_ha - plan.targets['RA']) * 3600, abs(ra_time - dec_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slews', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    cases = targets(args.slews, random.Random(args.seed))
+    max_rate = min(Config.axis_rates[1] / 3600, RATE)
+    print(f'{args.slews} slews, {max_rate:g} °/s, {Config.slew_acceleration:g} °/s², jerk {Config.slew_jerk:g} °/s³')
+    print(f'{"method":<15} {"plan us p50":>11} {"p99":>7} {"land arcsec p50":>15} {"max":>7} {"gap s max":>9}')
+    for name, jerk, fn in (('distance/rate', Config.slew_jerk, distance_rate),
+                           ('planner trap.', 0, planned), ('planner S', Config.slew_jerk, planned)):
+        planner = SlewPlanner(max_rate, Config.slew_acceleration, jerk, Config.slew_flip_hour_angle,
+                              Config.slew_tolerance, Config.slew_iterations)
+        times, landing, gaps = [], [], []
+        for case in cases:
+            t0 = time.perf_counter()
+            error, gap = fn(planner, *case)
+            times.append((time.perf_counter() - t0) * 1e6)
+            landing.append(error)
+            gaps.append(gap)
+        print(f'{name:<15} {percentile(times, 50):>11.1f} {percentile(times, 99):>7.1f} '
+              f'{percentile(landing, 50):>15.3f} {max(landing):>7.3f} {max(gaps):>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
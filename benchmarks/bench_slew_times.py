@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_slew_times.py - Batch slew time estimates for sequencers
+#
+# Asks for the slew durations from the current position to --targets random
+# targets (RA 0-24 h, Dec -30..89°, meridian flips included), on the emulated
+# motors (device/mks_emulator.py):
+#
+#   plan loop   slew_planner.SlewPlanner.plan for each target, the way a
+#               SlewToCoordinates would plan it
+#   vectorized  SlewPlanner.durations, all targets in NumPy arrays
+#   action      the SlewTimes action (PUT action through the Falcon app):
+#               JSON parameters in, JSON durations out
+#
+# Reports the time per batch in milliseconds (best of --repeat) and the
+# largest difference of the durations with the plan loop, in seconds.
+#
+#   python benchmarks/bench_slew_times.py [--targets 10000] [--repeat 5]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import json
+import random
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+from _bench_common import init_device, quiet_logger, start_emulator
+
+PATH = '/api/v1/telescope/0/action'
+
+
+def slew_times(client, targets: list) -> dict:
+    body = urlencode({'Action': 'SlewTimes', 'Parameters': json.dumps(targets),
+                      'ClientID': 1, 'ClientTransactionID': 1})
+    reply = client.simulate_put(PATH, body=body, content_type='application/x-www-form-urlencoded')
+    return json.loads(reply.json['Value'])
+
+
+def best(fn, repeat: int) -> tuple[float, object]:
+    """(Best time [ms], result)"""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    emulator = start_emulator()
+    import app
+    from falcon import testing
+    tel = init_device(quiet_logger())
+    client = testing.TestClient(app.create_app())
+    time.sleep(0.5)
+    rng = random.Random(args.seed)
+    targets = [[round(rng.uniform(0, 24), 6), round(rng.uniform(-30, 89), 6)] for _ in range(args.targets)]
+    ra, dec = np.array(targets).T
+    planner = tel._slew_planner
+    ha_axis, dec_axis, lst = tel._slew_start()
+
+    print(f'{args.targets} targets, {planner.max_rate:g} °/s, {planner.accel:g} °/s², jerk {planner.jerk} °/s³')
+    print(f'{"method":<11} {"ms":>9} {"max diff s":>10}')
+    loop_ms, plans = best(lambda: [planner.plan(ha_axis, dec_axis, r, d, lst).duration for r, d in targets], 1)
+    print(f'{"plan loop":<11} {loop_ms:>9.2f} {0:>10.2g}')
+    ms, (durations, _) = best(lambda: planner.durations(ha_axis, dec_axis, ra, dec, lst), args.repeat)
+    print(f'{"vectorized":<11} {ms:>9.2f} {np.abs(durations - plans).max():>10.2g}')
+    ms, reply = best(lambda: slew_times(client, targets), args.repeat)
+    # The action starts from the position at its own time: the targets moved since
+    print(f'{"action":<11} {ms:>9.2f} {np.abs(np.array(reply["Durations"]) - plans).max():>10.2g}')
+    tel.task_manager.stop_loop()
+    tel._guide_scheduler.close()
+    tel._motor_bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_static_responses.py - Precompiled vs. serialized static property responses
+#
+# For every static Can* property (and the other config-fixed properties),
+# times building the response body the former way, PropertyResponse(...).json
+# into resp.text, against StaticPropertyResponse.send() into resp.data.
+#
+#   python benchmarks/bench_static_responses.py [--n 20000]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import time
+
+from falcon import Response
+from falcon.testing import create_req
+
+from _bench_common import init_device
+import shr
+import telescope
+
+
+def per_call_us(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--n', type=int, default=20000)
+    args = parser.parse_args()
+
+    tel_dev = init_device()
+    req = create_req(path='/api/v1/telescope/0/canslew', query_string='ClientID=1&ClientTransactionID=42')
+    resp = Response()
+
+    def serialized(prop):
+        def fn():
+            resp.text = shr.PropertyResponse(getattr(tel_dev, prop), req).json
+        return fn
+
+    def precompiled(prop):
+        template = telescope.static_responses[prop]
+        return lambda: template.send(req, resp)
+
+    print(f'{"property":<20} {"serialized":>12} {"precompiled":>12} {"speedup":>8}')
+    total_old = total_new = 0.0
+    for prop in telescope.STATIC_PROPERTIES:
+        old = per_call_us(serialized(prop), args.n)
+        new = per_call_us(precompiled(prop), args.n)
+        total_old += old
+        total_new += new
+        print(f'{prop:<20} {old:>9.2f} us {new:>9.2f} us {old / new:>7.1f}x')
+    print(f'{"all":<20} {total_old:>9.2f} us {total_new:>9.2f} us {total_old / total_new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
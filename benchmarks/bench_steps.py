@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_steps.py - Position bookkeeping over 10^9 microsteps
+#
+# Moves an axis (200 steps x r=100 x Mstep=32 = 640000 microsteps per turn) by
+# --angle degrees per update, not a whole number of microsteps, until about
+# --steps microsteps, and reads its hour angle after every update as the
+# tracking loop and the RA property do:
+#
+#   float deg     degrees accumulated in a float
+#   int() steps   each angle converted by the former utilities.angle_to_steps
+#                 (float, int() truncation) and the steps counted
+#   exact         the angle as written, as a Fraction of microsteps; the steps
+#                 sent so far = floor(updates x angle), counted with small
+#                 integers (whole steps, owed fraction), hours by a cached
+#                 microsteps.AxisScale.hours()
+#   int32 wrap    exact, counted by a raw int32 counter that overflows during
+#                 the run (as the MKS pulse counter 0x33), unwrapped by
+#                 microsteps.WrappingCounter
+#
+# Reports the time per update, the error against the exact angle moved, in
+# microsteps and arcseconds, and the same error halfway: a drift grows from
+# one to the other, the exact methods only keep the fraction of a microstep
+# not sent yet. The float sum is the fastest, but it has no step count: the
+# exact path costs about twice its time per update, tens of nanoseconds, next
+# to updates a few times a second on the device.
+#
+#   python benchmarks/bench_steps.py [--steps 1e9] [--angle 0.5628]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import time
+from fractions import Fraction
+
+from microsteps import AxisScale, WrappingCounter
+
+STEPS_ROTATION, R, MSTEP = 200, 100, 32
+SPT = STEPS_ROTATION * R * MSTEP
+INT32 = 1 << 32
+
+
+def float_deg(angle: float, n: int):
+    deg = 0.0
+    half = None
+    for i in range(n):
+        deg += angle
+        hours = deg / 15
+        if i == n // 2:
+            half = deg
+    return Fraction(half), Fraction(deg)
+
+
+def int_steps(angle: float, n: int):
+    steps = 0
+    half = None
+    for i in range(n):
+        steps += int(angle * SPT / 360)
+        hours = steps * 24 / SPT
+        if i == n // 2:
+            half = steps
+    return Fraction(half * 360, SPT), Fraction(steps * 360, SPT)
+
+
+def exact(angle: float, n: int):
+    scale = AxisScale(SPT)
+    to_hours = scale.hours                              # The scale built once, as TelescopeDevice does
+    per_update = Fraction(str(angle)) * SPT / 360       # [microsteps], the angle as written
+    whole, num = divmod(per_update.numerator, per_update.denominator)
+    den = per_update.denominator
+    counts = rest = 0                                   # Microsteps sent, fraction owed x den: small ints only
+    half = None
+    for i in range(n):
+        counts += whole
+        rest += num
+        if rest >= den:
+            rest -= den
+            counts += 1
+        hours = to_hours(counts)
+        if i == n // 2:
+            half = counts
+    return scale.exact_degrees(half), scale.exact_degrees(counts)
+
+
+def int32_wrap(angle: float, n: int):
+    scale = AxisScale(SPT)
+    per_update = Fraction(str(angle)) * SPT / 360
+    num, den = per_update.numerator, per_update.denominator
+    counter = WrappingCounter(32)
+    start = (1 << 31) - int(per_update * n) // 2        # Overflows halfway
+    base = counter.update(start)
+    acc = 0
+    half = None
+    for i in range(n):
+        acc += num
+        raw = (start + acc // den + (1 << 31)) % INT32 - (1 << 31)
+        counts = counter.update(raw) - base
+        hours = scale.hours(counts)
+        if i == n // 2:
+            half = counts
+    assert counter.wraps == 1
+    return scale.exact_degrees(half), scale.exact_degrees(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=float, default=1e9, help='microsteps in total, about')
+    parser.add_argument('--angle', type=float, default=0.5628, help='[°] per update')
+    args = parser.parse_args()
+
+    angle = Fraction(str(args.angle))                   # As written, 0.5628 exactly
+    per_update = angle * SPT / 360
+    n = int(args.steps / per_update)
+    truth_half, truth = angle * (n // 2 + 1), angle * n
+    print(f'{n:,} updates of {args.angle:g}° = {float(per_update):.4f} microsteps, '
+          f'{float(per_update * n):,.0f} microsteps ({float(truth) / 360:,.0f} axis turns)')
+    print(f'{"method":<12} {"ns/update":>10} {"half steps":>12} {"end steps":>12} {"end arcsec":>12}')
+    for name, fn in (('float deg', float_deg), ('int() steps', int_steps), ('exact', exact),
+                     ('int32 wrap', int32_wrap)):
+        t0 = time.perf_counter()
+        half, end = fn(args.angle, n)
+        ns = (time.perf_counter() - t0) / n * 1e9
+        half_error, error = (half - truth_half) * SPT / 360, (end - truth) * SPT / 360
+        print(f'{name:<12} {ns:>10.0f} {float(half_error):>12.3f} {float(error):>12.3f} '
+              f'{float(error) * 360 * 3600 / SPT:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_tracking.py - Closed-loop tracking against a lossy RA motor
+#
+# Tracks at the sidereal rate for --seconds on the emulated motors
+# (device/mks_emulator.py), in real time, while a thread makes the RA shaft
+# lose --drag pulses/s (load) and --slip pulses every --slip-every seconds
+# (missed steps), which the speed commands know nothing about:
+#
+#   open loop     tracking.TrackingLoop with max_correction 0: the encoder is
+#                 read and the error counted, never corrected
+#   closed loop   the [tracking] settings of config.toml
+#
+# Reports, from the TrackingStats action (PUT action through the Falcon app):
+# the tracking error at the end, its RMS over the run and its worst value, in
+# arcseconds at the axis, the tick jitter after the deadlines, the CPU time
+# per tick, the speed commands sent and the process CPU time per second.
+#
+#   python benchmarks/bench_tracking.py [--seconds 60] [--drag 0.2] [--slip 10] [--slip-every 15]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import json
+import threading
+import time
+from fractions import Fraction
+from urllib.parse import urlencode
+
+from _bench_common import init_device, quiet_logger, start_emulator
+
+PATH = '/api/v1/telescope/0/action'
+
+
+class Disturbance:
+    """Thread taking pulses off an emulated shaft: drag [pulses/s] and slips"""
+    def __init__(self, servo, drag: float, slip: float, slip_every: float):
+        self.servo = servo
+        self.drag = drag
+        self.slip = slip
+        self.slip_every = slip_every
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last = start = time.monotonic()
+        slips = 0
+        while not self._stop.wait(0.05):
+            now = time.monotonic()
+            self.servo.position -= self.drag * (now - last)
+            last = now
+            if self.slip_every and now - start >= (slips + 1) * self.slip_every:
+                self.servo.position -= self.slip
+                slips += 1
+
+
+def tracking_stats(client, reset: bool = False) -> dict:
+    body = urlencode({'Action': 'TrackingStats', 'Parameters': 'reset' if reset else '',
+                      'ClientID': 1, 'ClientTransactionID': 1})
+    reply = client.simulate_put(PATH, body=body, content_type='application/x-www-form-urlencoded')
+    return json.loads(reply.json['Value'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=60.0, help='tracking time per mode')
+    parser.add_argument('--drag', type=float, default=0.2, help='[pulses/s] lost by the RA shaft')
+    parser.add_argument('--slip', type=float, default=10.0, help='[pulses] lost at once')
+    parser.add_argument('--slip-every', type=float, default=15.0, help='[s] between slips (0: none)')
+    args = parser.parse_args()
+
+    emulator = start_emulator()
+    import app
+    from config import Config
+    from falcon import testing
+    tel = init_device(quiet_logger())
+    client = testing.TestClient(app.create_app())
+    time.sleep(0.5)
+    loop = tel._tracking
+    servo = emulator.servos[int(Config.ra_address, 16)]
+
+    print(f'{args.seconds:g} s per mode, sidereal, drag {args.drag:g} pulses/s, {args.slip:g} pulses slip '
+          f'every {args.slip_every:g} s, tick {loop.interval:g} s, correction over {loop.correction_time:g} s')
+    print(f'{"mode":<12} {"end arcsec":>10} {"rms arcsec":>10} {"max arcsec":>10} {"jitter ms":>9} '
+          f'{"max ms":>7} {"CPU us":>7} {"commands":>8} {"CPU %":>6}')
+    for mode, max_correction in (('open loop', Fraction(0)), ('closed loop', loop.max_correction)):
+        loop.max_correction = max_correction
+        disturbance = Disturbance(servo, args.drag, args.slip, args.slip_every)
+        commands = tel._rate_synths['RA'].commands
+        tel.Tracking = True
+        tracking_stats(client, reset=True)
+        disturbance.start()
+        c0 = time.process_time()
+        time.sleep(args.seconds)
+        cpu = (time.process_time() - c0) / args.seconds
+        stats = tracking_stats(client)
+        disturbance.stop()
+        tel.Tracking = False
+        time.sleep(1.0)
+        print(f'{mode:<12} {stats["ErrorArcsec"]:>10.1f} {stats["ErrorRmsArcsec"]:>10.1f} '
+              f'{stats["ErrorMaxArcsec"]:>10.1f} {stats["JitterMeanMs"]:>9.3f} {stats["JitterMaxMs"]:>7.3f} '
+              f'{stats["CpuMeanUs"]:>7.0f} {stats["Commands"] - commands:>8} {cpu * 100:>6.2f}')
+    tel.task_manager.stop_loop()
+    tel._guide_scheduler.close()
+    tel._motor_bus.close()
+    emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# bench_tracking_rate.py - Cumulative tracking error over a night
+#
+# Tracks each DriveRates for --hours on an emulated RA motor (the EmulatedServo
+# of device/mks_emulator.py, r=100, Mstep=32), in simulated time, and compares
+# the shaft with the ideal axis position:
+#
+#   truncate    int() of the speed code, as move_constant_speed did: code 0,
+#               the axis does not track at all
+#   min-code    MKSMotor.speed_code(): at least code 1, 67 x too fast
+#   dither Ns   rate_synth.SpeedDither, codes 0 and 1 alternated every N s
+#               slot; each command reaches the motor after a random delay of
+#               up to --jitter ms (bus and scheduling), the slots keep their
+#               absolute deadlines
+#   + late fb   dither 0.01 s, the delay of each command credited back to the
+#               dither (SpeedDither.late, as RateSynthesizer does from the
+#               command round trip)
+#
+# Reports the error at the end of the night and the worst error during it, in
+# arcseconds at the axis, and the 0xF6 commands sent.
+#
+#   python benchmarks/bench_tracking_rate.py [--hours 8] [--jitter 3]
+# -----------------------------------------------------------------------------
+import _bench_common                                    # Must be first (sys.path)
+import argparse
+import random
+import time
+from fractions import Fraction
+
+from mks_emulator import EmulatedServo
+from motor_control import MKSMotor
+from rate_synth import DRIVE_RATES, PULSES_PER_CODE, SpeedDither, drive_rate_table
+
+R, MSTEP, MOTOR_TYPE = 100, 32, 1.8
+ARCSEC_PER_PULSE = 360 * 3600 / (R * 200 * MSTEP)      # 2.025"
+
+
+def track(source, slot: float, hours: float, ideal: Fraction, jitter: float, rng,
+          feedback: bool = False) -> tuple[float, float, int]:
+    """Run source.next() codes, one per slot, return final and max error ["] and commands"""
+    servo = EmulatedServo(0xE0, MOTOR_TYPE, MSTEP)
+    servo.t = 0.0
+    ideal_rate = float(ideal * PULSES_PER_CODE)        # [pulses/s]
+    n_slots = int(hours * 3600 / slot)
+    current, commands, worst = None, 0, 0.0
+    for k in range(n_slots):
+        code = source.next()
+        if code != current:
+            delay = rng.uniform(0.0, jitter)            # Sent at the deadline, applied a bit later
+            t = k * slot + delay
+            servo.update(t)
+            worst = max(worst, abs(servo.position - ideal_rate * t))
+            servo.execute(0xF6, bytes([code]))
+            if feedback and current is not None:
+                source.late(current, code, delay / slot)
+            current = code
+            commands += 1
+        servo.update((k + 1) * slot)
+        worst = max(worst, abs(servo.position - ideal_rate * servo.t))
+    final = servo.position - ideal_rate * servo.t
+    return final * ARCSEC_PER_PULSE, worst * ARCSEC_PER_PULSE, commands
+
+
+class Constant:
+    def __init__(self, code: int):
+        self.code = code
+
+    def next(self) -> int:
+        return self.code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=8.0, help='simulated tracking time')
+    parser.add_argument('--jitter', type=float, default=3.0, help='[ms] max delay of a command')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jitter = args.jitter / 1000
+    table = drive_rate_table(R, MSTEP, MOTOR_TYPE)
+    motor = MKSMotor(lambda: False, 'e0', transport=object())
+    print(f'{args.hours:g} h per rate, 1 pulse = {ARCSEC_PER_PULSE:.3f}", command jitter <= {args.jitter:g} ms')
+    print(f'{"rate":<14} {"code":>9} {"method":<12} {"final arcsec":>12} {"max arcsec":>11} {"commands":>9} {"CPU s":>7}')
+    for rate, code in table.items():
+        rpm = float(DRIVE_RATES[rate]) * R / 21600      # Motor rpm, as move_constant_speed takes it
+        methods = [('truncate', lambda: Constant(int(code)), 1.0, False),
+                   ('min-code', lambda: Constant(motor.speed_code(rpm)), 1.0, False),
+                   ('dither 0.1s', lambda: SpeedDither(code), 0.1, False),
+                   ('dither 0.01s', lambda: SpeedDither(code), 0.01, False),
+                   ('+ late fb', lambda: SpeedDither(code), 0.01, True)]
+        for name, source, slot, feedback in methods:
+            c0 = time.process_time()
+            final, worst, commands = track(source(), slot, args.hours, code, jitter, rng, feedback)
+            cpu = time.process_time() - c0
+            print(f'{rate.name:<14} {float(code):>9.6f} {name:<12} {final:>12.1f} {worst:>11.1f} {commands:>9} {cpu:>7.1f}')
+
+
+if __name__ == '__main__':
+    main()
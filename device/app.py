@@ -13,7 +13,9 @@
 import sys
 import traceback
 import inspect
-from wsgiref.simple_server import WSGIRequestHandler, make_server
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, ServerHandler, make_server
 from enum import IntEnum
 
 # -- isort wants the above line to be blank --
@@ -74,6 +76,127 @@ class LoggingWSGIRequestHandler(WSGIRequestHandler):
         # if args[1] != '200':  # Log this only on non-200 responses
         #     log.logger.info(f'{self.client_address[0]} <- {format%args}')
 
+class KeepAliveServerHandler(ServerHandler):
+    """WSGI ServerHandler that answers with an HTTP/1.1 status line"""
+    http_version = '1.1'
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        if self.request_handler.close_connection:
+            self.headers['Connection'] = 'close'
+
+class KeepAliveWSGIRequestHandler(LoggingWSGIRequestHandler):
+    """HTTP/1.1 request handler serving several requests per connection
+
+    The stock wsgiref handler answers a single HTTP/1.0 request and then
+    drops the connection, so every Alpaca poll costs a new TCP handshake.
+    This one loops on the connection until the client asks to close it,
+    talks HTTP/1.0, or stays idle for longer than
+    :py:attr:`config.Config.keep_alive_timeout`.
+
+    Notes:
+        * Falcon always sets ``Content-Length``, which is what makes
+          keep-alive possible with the wsgiref ``ServerHandler``.
+        * Nagle is disabled, the status line/headers and the body go out
+          in separate writes and would otherwise wait for a delayed ACK.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    timeout = Config.keep_alive_timeout
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except TimeoutError:                        # Idle keep-alive connection
+            self.close_connection = True
+            return
+        if not self.raw_requestline:                # Client closed the connection
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            self.close_connection = True
+            return
+        if not self.parse_request():                # An error code has been sent
+            return
+        if self.server.waiting > 0:                 # Give the worker back to a queued client
+            self.close_connection = True
+        handler = KeepAliveServerHandler(
+            self.rfile, self.wfile, self.get_stderr(), self.get_environ(),
+            multithread=True,
+        )
+        handler.request_handler = self              # backpointer for logging
+        handler.run(self.server.get_app())
+
+class ThreadPoolWSGIServer(WSGIServer):
+    """WSGI server dispatching each connection to a fixed pool of worker threads
+
+    A slow responder (e.g. an astropy-backed ``altitude``) only holds up its own
+    connection instead of every client polling the device. The pool size bounds
+    the number of connections served at the same time. Further connections
+    wait in the pool queue, and a worker holding an idle keep-alive connection
+    closes it after its current request as soon as one is waiting.
+    """
+    daemon_threads = True
+    request_queue_size = 64                         # listen() backlog, the default of 5 drops bursts of connects
+
+    def __init__(self, server_address, RequestHandlerClass, workers: int):
+        super().__init__(server_address, RequestHandlerClass)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='AlpacaWorker')
+        self._waitlock = Lock()
+        self.waiting = 0                            # Connections queued for a worker
+
+    def process_request_thread(self, request, client_address):
+        with self._waitlock:
+            self.waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def process_request(self, request, client_address):
+        with self._waitlock:
+            self.waiting += 1
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+def make_alpaca_server(host: str, port: int, app: App, mode: str = Config.server_mode,
+                       workers: int = Config.server_threads) -> WSGIServer:
+    """Create the HTTP server for the Falcon app in the configured serving mode
+
+    Args:
+        host (str): IP address to bind to
+        port (int): Port to listen on (0 for any free port)
+        app (App): The Falcon WSGI app
+        mode (str): ``'threaded'`` for the thread pool with HTTP/1.1 keep-alive,
+            ``'simple'`` for the single-threaded wsgiref server
+        workers (int): Number of worker threads in ``'threaded'`` mode
+
+    Raises:
+        ValueError: Unknown serving mode
+    """
+    if mode == 'simple':
+        return make_server(host, port, app, handler_class=LoggingWSGIRequestHandler)
+    if mode == 'threaded':
+        server = ThreadPoolWSGIServer((host, port), KeepAliveWSGIRequestHandler, workers)
+        server.set_app(app)
+        return server
+    raise ValueError(f'Unknown server_mode "{mode}", expected "threaded" or "simple"')
+
 #-----------------------
 # Magic routing function
 # ----------------------
@@ -167,23 +290,52 @@ def falcon_uncaught_exception_handler(req: Request, resp: Response, ex: BaseExce
     custom_excepthook(exc[0], exc[1], exc[2])
     raise HTTPInternalServerError(title='Internal Server Error', description='Alpaca endpoint responder failed. See logfile.')
 
-# ===========
-# APP STARTUP
-# ===========
-def main():
-    """ Application startup"""
-    logger = log.init_logging()
-    # Share this logger throughout
+def create_app() -> App:
+    """Build the Falcon app with all Alpaca routes and the error handler"""
+    # falcon.App instances are callable WSGI apps
+    falc_app = App()
+    #
+    # Initialize routes for each endpoint the magic way
+    #
+    #########################
+    # FOR EACH ASCOM DEVICE #
+    #########################
+    init_routes(falc_app, 'telescope', telescope)
+    #
+    # Initialize routes for Alpaca support endpoints
+    falc_app.add_route('/management/apiversions', management.apiversions())
+    falc_app.add_route(f'/management/v{API_VERSION}/description', management.description())
+    falc_app.add_route(f'/management/v{API_VERSION}/configureddevices', management.configureddevices())
+    falc_app.add_route('/setup', setup.svrsetup())
+    falc_app.add_route(f'/setup/v{API_VERSION}/telescope/{{devnum}}/setup', setup.devsetup())
+
+    #
+    # Install the unhandled exception processor. See above,
+    #
+    falc_app.add_error_handler(Exception, falcon_uncaught_exception_handler)
+    return falc_app
+
+def share_logger(logger):
+    """Share the master logger throughout the app modules"""
     log.logger = logger
     exceptions.logger = logger
     discovery.logger = logger
-    set_shr_logger(logger)
+    set_shr_logger(logger, log.request_sampler)
 
     #########################
     # FOR EACH ASCOM DEVICE #
     #########################
     telescope.logger = logger
-    
+
+# ===========
+# APP STARTUP
+# ===========
+def main():
+    """ Application startup"""
+    logger = log.init_logging()
+    # Share this logger throughout
+    share_logger(logger)
+
     tel_dev = telescope.start_tel_device(logger)
 
     # -----------------------------
@@ -199,34 +351,16 @@ def main():
     # ----------------------------------
     # MAIN HTTP/REST API ENGINE (FALCON)
     # ----------------------------------
-    # falcon.App instances are callable WSGI apps
-    falc_app = App()
-    #
-    # Initialize routes for each endpoint the magic way
-    #
-    #########################
-    # FOR EACH ASCOM DEVICE #
-    #########################
-    init_routes(falc_app, 'telescope', telescope)
-    #
-    # Initialize routes for Alpaca support endpoints
-    falc_app.add_route('/management/apiversions', management.apiversions())
-    falc_app.add_route(f'/management/v{API_VERSION}/description', management.description())
-    falc_app.add_route(f'/management/v{API_VERSION}/configureddevices', management.configureddevices())
-    falc_app.add_route('/setup', setup.svrsetup())
-    falc_app.add_route(f'/setup/v{API_VERSION}/telescope/{{devnum}}/setup', setup.devsetup())
-
-    #
-    # Install the unhandled exception processor. See above,
-    #
-    falc_app.add_error_handler(Exception, falcon_uncaught_exception_handler)
+    falc_app = create_app()
 
     # ------------------
     # SERVER APPLICATION
     # ------------------
-    # Using the lightweight built-in Python wsgi.simple_server
-    with make_server(Config.ip_address, Config.port, falc_app, handler_class=LoggingWSGIRequestHandler) as httpd:
-        logger.info(f'==STARTUP== Serving on {Config.ip_address}:{Config.port}. Time stamps are UTC.')
+    # Thread pool with HTTP/1.1 keep-alive, or the lightweight built-in
+    # Python wsgi.simple_server, depending on Config.server_mode
+    with make_alpaca_server(Config.ip_address, Config.port, falc_app) as httpd:
+        logger.info(f'==STARTUP== Serving on {Config.ip_address}:{Config.port} ({Config.server_mode}, '
+                    f'{Config.server_threads} workers). Time stamps are UTC.')
         # Serve until process is killed
         try:
             httpd.serve_forever()
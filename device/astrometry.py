@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# astrometry.py - Fast analytic astrometry for the mount
+#
+# Closed-form replacements for the astropy calls made on every Alpaca poll.
+# astropy stays available as the reference path (see utilities.py).
+#
+# Sidereal time follows the IAU 2006 model used by astropy/ERFA (gst06a):
+#   GAST = ERA(UT1) + GMST polynomial(TT) + equation of the equinoxes
+# The equation of the equinoxes uses the largest terms of the IAU 1980
+# nutation series (Meeus, Astronomical Algorithms, table 22.A), which keeps
+# the difference with ERFA gst06a to a few milliseconds of time.
+#
+# Equatorial <-> horizontal transforms are NumPy rotation matrices:
+#   J2000 --(IAU 1976 precession, nutation)--> true equator of date
+#   --(annual aberration)--> apparent --(LAST, latitude)--> Alt/Az
+# accurate to about an arc second. Refraction, diurnal aberration and polar
+# motion are not modelled (astropy's AltAz without pressure has no refraction
+# either).
+# -----------------------------------------------------------------------------
+import math
+import time
+from threading import Lock
+
+import numpy as np
+
+UNIX_EPOCH_JD = 2440587.5               # JD of 1970-01-01T00:00:00 UTC
+J2000_JD = 2451545.0                    # JD of J2000.0
+SECONDS_PER_DAY = 86400.0
+TT_MINUS_UTC = 69.184                   # [s] 37 leap seconds + 32.184 (since 2017)
+ARCSEC_TO_RAD = math.pi / (180 * 3600)
+DEG_TO_RAD = math.pi / 180
+TWO_PI = 2 * math.pi
+
+# Largest terms of the IAU 1980 nutation, Meeus table 22.A
+# Multipliers of (D, M, M', F, Omega), then the longitude (sin) coefficient
+# and its rate per Julian century, then the obliquity (cos) coefficient and
+# its rate, in units of 0.0001". Terms below 0.005" are left out.
+_NUTATION_TERMS = (
+    ( 0,  0,  0,  0,  1, -171996.0, -174.2, 92025.0,  8.9),
+    (-2,  0,  0,  2,  2,  -13187.0,   -1.6,  5736.0, -3.1),
+    ( 0,  0,  0,  2,  2,   -2274.0,   -0.2,   977.0, -0.5),
+    ( 0,  0,  0,  0,  2,    2062.0,    0.2,  -895.0,  0.5),
+    ( 0,  1,  0,  0,  0,    1426.0,   -3.4,    54.0, -0.1),
+    ( 0,  0,  1,  0,  0,     712.0,    0.1,    -7.0,  0.0),
+    (-2,  1,  0,  2,  2,    -517.0,    1.2,   224.0, -0.6),
+    ( 0,  0,  0,  2,  1,    -386.0,   -0.4,   200.0,  0.0),
+    ( 0,  0,  1,  2,  2,    -301.0,    0.0,   129.0, -0.1),
+    (-2, -1,  0,  2,  2,     217.0,   -0.5,   -95.0,  0.3),
+    (-2,  0,  1,  0,  0,    -158.0,    0.0,     0.0,  0.0),
+    (-2,  0,  0,  2,  1,     129.0,    0.1,   -70.0,  0.0),
+    ( 0,  0, -1,  2,  2,     123.0,    0.0,   -53.0,  0.0),
+    ( 2,  0,  0,  0,  0,      63.0,    0.0,     0.0,  0.0),
+    ( 0,  0,  1,  0,  1,      63.0,    0.1,   -33.0,  0.0),
+    ( 2,  0, -1,  2,  2,     -59.0,    0.0,    26.0,  0.0),
+    ( 0,  0, -1,  0,  1,     -58.0,   -0.1,    32.0,  0.0),
+    ( 0,  0,  1,  2,  1,     -51.0,    0.0,    27.0,  0.0),
+)
+
+
+def unix_to_jd(unix_time: float) -> float:
+    """Julian date (same time scale as the input) of a POSIX time stamp"""
+    return unix_time / SECONDS_PER_DAY + UNIX_EPOCH_JD
+
+
+def fundamental_arguments(t: float) -> tuple[float, float, float, float, float]:
+    """Delaunay arguments D, M, M', F, Omega in radians
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    t2 = t * t
+    t3 = t2 * t
+    d = 297.85036 + 445267.111480 * t - 0.0019142 * t2 + t3 / 189474
+    m = 357.52772 + 35999.050340 * t - 0.0001603 * t2 - t3 / 300000
+    mp = 134.96298 + 477198.867398 * t + 0.0086972 * t2 + t3 / 56250
+    f = 93.27191 + 483202.017538 * t - 0.0036825 * t2 + t3 / 327270
+    om = 125.04452 - 1934.136261 * t + 0.0020708 * t2 + t3 / 450000
+    return (math.radians(d % 360), math.radians(m % 360), math.radians(mp % 360),
+            math.radians(f % 360), math.radians(om % 360))
+
+
+def nutation(t: float) -> tuple[float, float]:
+    """Nutation in longitude and in obliquity (radians)
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    d, m, mp, f, om = fundamental_arguments(t)
+    dpsi = 0.0
+    deps = 0.0
+    for kd, km, kmp, kf, kom, s0, s1, c0, c1 in _NUTATION_TERMS:
+        arg = kd * d + km * m + kmp * mp + kf * f + kom * om
+        dpsi += (s0 + s1 * t) * math.sin(arg)
+        deps += (c0 + c1 * t) * math.cos(arg)
+    return dpsi * 1e-4 * ARCSEC_TO_RAD, deps * 1e-4 * ARCSEC_TO_RAD
+
+
+def nutation_in_longitude(t: float) -> float:
+    """Nutation in longitude (radians)
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    return nutation(t)[0]
+
+
+def mean_obliquity(t: float) -> float:
+    """Mean obliquity of the ecliptic (radians), IAU 2006
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    eps = 84381.406 + t * (-46.836769 + t * (-0.0001831 + t * (0.00200340 + t * (-0.000000576 - t * 0.0000000434))))
+    return eps * ARCSEC_TO_RAD
+
+
+def equation_of_equinoxes(t: float) -> float:
+    """Equation of the equinoxes (radians)
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    om = math.radians((125.04452 - 1934.136261 * t) % 360)
+    # Largest complementary term of the IAU 2000 equation of the equinoxes
+    return nutation_in_longitude(t) * math.cos(mean_obliquity(t)) + 0.00264096 * ARCSEC_TO_RAD * math.sin(om)
+
+
+def earth_rotation_angle(jd_ut1: float) -> float:
+    """Earth rotation angle (radians) for a UT1 Julian date"""
+    du = jd_ut1 - J2000_JD
+    frac = jd_ut1 % 1.0                             # Split keeps the precision of the day fraction
+    return (TWO_PI * (frac + 0.7790572732640 + 0.00273781191135448 * du)) % TWO_PI
+
+
+def gmst(jd_ut1: float, jd_tt: float) -> float:
+    """Greenwich mean sidereal time (radians), IAU 2006"""
+    t = (jd_tt - J2000_JD) / 36525.0
+    poly = 0.014506 + t * (4612.156534 + t * (1.3915817 + t * (-0.00000044 + t * (-0.000029956 - t * 0.0000000368))))
+    return (earth_rotation_angle(jd_ut1) + poly * ARCSEC_TO_RAD) % TWO_PI
+
+
+def gast(jd_ut1: float, jd_tt: float) -> float:
+    """Greenwich apparent sidereal time (radians)"""
+    t = (jd_tt - J2000_JD) / 36525.0
+    return (gmst(jd_ut1, jd_tt) + equation_of_equinoxes(t)) % TWO_PI
+
+
+class SiderealClock:
+    """Local apparent sidereal time of the mount site
+
+    Site constants (longitude in hours, UT1-UTC) are computed once, when the
+    site is set. The equation of the equinoxes changes by less than 0.1 ms of
+    time per hour, so it is cached and refreshed every ``eqeq_refresh``
+    seconds. A call then costs the Earth rotation angle and a short polynomial.
+
+    Args:
+        longitude: Site longitude in degrees, east positive
+        dut1: UT1 - UTC in seconds (|DUT1| < 0.9 s, 0 if unknown)
+        eqeq_refresh: Seconds between equation of the equinoxes updates
+    """
+    def __init__(self, longitude: float = 0.0, dut1: float = 0.0, eqeq_refresh: float = 600.0):
+        self._lock = Lock()
+        self._eqeq_refresh = eqeq_refresh
+        self._eqeq: float = 0.0
+        self._eqeq_valid_until: float = -math.inf
+        self.set_site(longitude, dut1)
+
+    def set_site(self, longitude: float, dut1: float | None = None) -> None:
+        """Recompute the site constants (longitude in degrees, UT1-UTC in seconds)"""
+        with self._lock:
+            self.longitude = longitude
+            self._longitude_rad = math.radians(longitude)
+            if dut1 is not None:
+                self._dut1_days = dut1 / SECONDS_PER_DAY
+
+    def greenwich_apparent(self, unix_time: float | None = None) -> float:
+        """Greenwich apparent sidereal time (radians) at a POSIX time stamp (now if None)"""
+        if unix_time is None:
+            unix_time = time.time()
+        jd_utc = unix_to_jd(unix_time)
+        jd_tt = jd_utc + TT_MINUS_UTC / SECONDS_PER_DAY
+        if unix_time >= self._eqeq_valid_until or unix_time < self._eqeq_valid_until - 2 * self._eqeq_refresh:
+            eqeq = equation_of_equinoxes((jd_tt - J2000_JD) / 36525.0)
+            with self._lock:
+                self._eqeq = eqeq
+                self._eqeq_valid_until = unix_time + self._eqeq_refresh
+        return (gmst(jd_utc + self._dut1_days, jd_tt) + self._eqeq) % TWO_PI
+
+    def local_apparent(self, unix_time: float | None = None) -> float:
+        """Local apparent sidereal time (radians) at a POSIX time stamp (now if None)"""
+        return (self.greenwich_apparent(unix_time) + self._longitude_rad) % TWO_PI
+
+    def local_sidereal_hours(self, unix_time: float | None = None) -> float:
+        """Local apparent sidereal time in hours [0, 24) at a POSIX time stamp (now if None)"""
+        return self.local_apparent(unix_time) * 12 / math.pi
+
+
+# ---------------------------------
+# Equatorial <-> horizontal (NumPy)
+# ---------------------------------
+def _rot1(phi: float) -> np.ndarray:
+    """Frame rotation about the x axis"""
+    c, s = math.cos(phi), math.sin(phi)
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c]])
+
+
+def _rot2(phi: float) -> np.ndarray:
+    """Frame rotation about the y axis"""
+    c, s = math.cos(phi), math.sin(phi)
+    return np.array([[c, 0.0, -s], [0.0, 1.0, 0.0], [s, 0.0, c]])
+
+
+def _rot3(phi: float) -> np.ndarray:
+    """Frame rotation about the z axis"""
+    c, s = math.cos(phi), math.sin(phi)
+    return np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def precession_matrix(t: float) -> np.ndarray:
+    """IAU 1976 precession matrix, J2000 mean equator to mean equator of date
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    zeta = (2306.2181 + (0.30188 + 0.017998 * t) * t) * t * ARCSEC_TO_RAD
+    z = (2306.2181 + (1.09468 + 0.018203 * t) * t) * t * ARCSEC_TO_RAD
+    theta = (2004.3109 + (-0.42665 - 0.041833 * t) * t) * t * ARCSEC_TO_RAD
+    return _rot3(-z) @ _rot2(theta) @ _rot3(-zeta)
+
+
+def nutation_matrix(t: float) -> np.ndarray:
+    """Nutation matrix, mean equator of date to true equator of date
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    dpsi, deps = nutation(t)
+    eps = mean_obliquity(t)
+    return _rot1(-(eps + deps)) @ _rot3(-dpsi) @ _rot1(eps)
+
+
+def aberration_vector(t: float) -> np.ndarray:
+    """Earth velocity over c (annual aberration), true equator of date
+
+    Low precision Sun theory (Meeus ch. 23 and 25), good to about 0.1".
+
+    Args:
+        t: Julian centuries of TT since J2000.0
+    """
+    kappa = 20.49552 * ARCSEC_TO_RAD
+    l0 = 280.46646 + 36000.76983 * t
+    m = math.radians(357.52911 + 35999.05029 * t)
+    c = (1.914602 - 0.004817 * t) * math.sin(m) + (0.019993 - 0.000101 * t) * math.sin(2 * m) \
+        + 0.000289 * math.sin(3 * m)
+    sun = math.radians(l0 + c)
+    e = 0.016708634 - 0.000042037 * t
+    peri = math.radians(102.93735 + 1.71946 * t)
+    vx = kappa * (math.sin(sun) - e * math.sin(peri))
+    vy = kappa * (-math.cos(sun) + e * math.cos(peri))
+    eps = mean_obliquity(t)
+    return np.array([vx, vy * math.cos(eps), vy * math.sin(eps)])
+
+
+def _as_result(x: np.ndarray, scalar: bool):
+    return float(x) if scalar else x
+
+
+class EquatorialTransform:
+    """J2000 equatorial <-> horizontal coordinates for the mount site
+
+    The precession-nutation matrix and the aberration vector change by a
+    fraction of an arc second per minute, so they are computed once and reused
+    for ``cache_interval`` seconds. A call then costs the sidereal time and a
+    few vectorized NumPy operations, whatever the number of points.
+
+    Args:
+        latitude: Site latitude in degrees
+        longitude: Site longitude in degrees, east positive
+        dut1: UT1 - UTC in seconds
+        cache_interval: Seconds the precession-nutation matrix is reused
+    """
+    def __init__(self, latitude: float = 0.0, longitude: float = 0.0, dut1: float = 0.0,
+                 cache_interval: float = 60.0):
+        self._lock = Lock()
+        self.cache_interval = cache_interval
+        self._clock = SiderealClock(longitude, dut1, eqeq_refresh=cache_interval)
+        self._frame_time: float = -math.inf
+        self._npb = np.eye(3)
+        self._aberration = np.zeros(3)
+        self.set_site(latitude, longitude)
+
+    def set_site(self, latitude: float, longitude: float) -> None:
+        """Recompute the site constants (degrees)"""
+        with self._lock:
+            self.latitude = latitude
+            self.longitude = longitude
+            self._sin_lat = math.sin(math.radians(latitude))
+            self._cos_lat = math.cos(math.radians(latitude))
+        self._clock.set_site(longitude)
+
+    def _frame(self, unix_time: float) -> tuple[np.ndarray, np.ndarray]:
+        """Cached (precession-nutation matrix, aberration vector) for a time stamp"""
+        with self._lock:
+            if abs(unix_time - self._frame_time) <= self.cache_interval:
+                return self._npb, self._aberration
+        t = (unix_to_jd(unix_time) + TT_MINUS_UTC / SECONDS_PER_DAY - J2000_JD) / 36525.0
+        npb = nutation_matrix(t) @ precession_matrix(t)
+        aberration = aberration_vector(t)
+        with self._lock:
+            self._npb, self._aberration, self._frame_time = npb, aberration, unix_time
+        return npb, aberration
+
+    def eq_to_altaz(self, ra, dec, unix_time: float | None = None):
+        """J2000 RA (hours) / Dec (degrees) to Alt / Az (degrees, azimuth from North through East)
+
+        Accepts scalars or arrays of any matching shape and returns the same.
+        """
+        if unix_time is None:
+            unix_time = time.time()
+        scalar = np.ndim(ra) == 0 and np.ndim(dec) == 0
+        npb, aberration = self._frame(unix_time)
+        ra_rad = np.radians(np.asarray(ra, dtype=float) * 15.0)
+        dec_rad = np.radians(np.asarray(dec, dtype=float))
+        cos_dec = np.cos(dec_rad)
+        p = np.stack(np.broadcast_arrays(cos_dec * np.cos(ra_rad), cos_dec * np.sin(ra_rad), np.sin(dec_rad)), axis=-1)
+        p = p @ npb.T + aberration                      # True equator of date, apparent
+        p /= np.linalg.norm(p, axis=-1, keepdims=True)
+        last = self._clock.local_apparent(unix_time)
+        ha = last - np.arctan2(p[..., 1], p[..., 0])
+        sin_dec = p[..., 2]
+        cos_dec = np.hypot(p[..., 0], p[..., 1])
+        cos_ha = np.cos(ha)
+        alt = np.arcsin(np.clip(self._sin_lat * sin_dec + self._cos_lat * cos_dec * cos_ha, -1.0, 1.0))
+        az = np.arctan2(-cos_dec * np.sin(ha), sin_dec * self._cos_lat - cos_dec * self._sin_lat * cos_ha)
+        return _as_result(np.degrees(alt), scalar), _as_result(np.degrees(az) % 360.0, scalar)
+
+    def altaz_to_eq(self, alt, az, unix_time: float | None = None):
+        """Alt / Az (degrees, azimuth from North through East) to J2000 RA (hours) / Dec (degrees)
+
+        Accepts scalars or arrays of any matching shape and returns the same.
+        """
+        if unix_time is None:
+            unix_time = time.time()
+        scalar = np.ndim(alt) == 0 and np.ndim(az) == 0
+        npb, aberration = self._frame(unix_time)
+        alt_rad = np.radians(np.asarray(alt, dtype=float))
+        az_rad = np.radians(np.asarray(az, dtype=float))
+        sin_alt, cos_alt = np.sin(alt_rad), np.cos(alt_rad)
+        cos_az = np.cos(az_rad)
+        sin_dec = self._sin_lat * sin_alt + self._cos_lat * cos_alt * cos_az
+        ha = np.arctan2(-np.sin(az_rad) * cos_alt, sin_alt * self._cos_lat - cos_alt * self._sin_lat * cos_az)
+        cos_dec = np.sqrt(np.clip(1.0 - sin_dec * sin_dec, 0.0, 1.0))
+        ra_app = self._clock.local_apparent(unix_time) - ha
+        p = np.stack(np.broadcast_arrays(cos_dec * np.cos(ra_app), cos_dec * np.sin(ra_app), sin_dec), axis=-1)
+        p = p - aberration                              # Back to geometric, true equator of date
+        p = p @ npb                                     # Inverse rotation (orthogonal matrix)
+        p /= np.linalg.norm(p, axis=-1, keepdims=True)
+        ra_h = (np.degrees(np.arctan2(p[..., 1], p[..., 0])) / 15.0) % 24.0
+        dec_d = np.degrees(np.arcsin(np.clip(p[..., 2], -1.0, 1.0)))
+        return _as_result(ra_h, scalar), _as_result(dec_d, scalar)
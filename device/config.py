@@ -95,6 +95,9 @@ class Config:
     # --------------
     location: str = get_toml('server', 'location')
     verbose_driver_exceptions: bool = to_bool(get_toml('server', 'verbose_driver_exceptions'))
+    server_mode: str = get_toml('server', 'server_mode')
+    server_threads: int = int(get_toml('server', 'server_threads'))
+    keep_alive_timeout: float = float(get_toml('server', 'keep_alive_timeout'))
     # --------------
     # Device Section
     # --------------
@@ -107,11 +110,16 @@ class Config:
     focal_length: float = float(get_toml('device', 'focal_length'))
     equatorial_system: int = int(get_toml('device', 'equatorial_system'))
     slew_settle_time: float = int(get_toml('device', 'slew_settle_time'))
+    devicestate_ttl: float = float(get_toml('device', 'devicestate_ttl'))
     tracking_rates: list = list(get_toml('device', 'tracking_rates'))
     axis_rates: list = list(get_toml('device', 'axis_rates'))
     site_elevation: float = float(get_toml('device', 'site_elevation'))
     site_latitude: float = float(get_toml('device', 'site_latitude'))
     site_longitude: float = float(get_toml('device', 'site_longitude'))
+    dut1: float = float(get_toml('device', 'dut1'))
+    sidereal_engine: str = get_toml('device', 'sidereal_engine')
+    coord_engine: str = get_toml('device', 'coord_engine')
+    coord_cache_interval: float = float(get_toml('device', 'coord_cache_interval'))
     does_refraction: bool = to_bool(get_toml('device', 'does_refraction'))
     can_find_home: bool = to_bool(get_toml('device', 'can_find_home'))
     can_park: bool = to_bool(get_toml('device', 'can_park'))
@@ -131,10 +139,59 @@ class Config:
     can_set_sidereal_rate: bool = to_bool(get_toml('device', 'can_set_sidere)al_rate'))
     can_pulse_guide: bool = to_bool(get_toml('device', 'can_pulse_guide'))
     can_set_guide_rates: bool = to_bool(get_toml('device', 'can_set_guide_rates'))
+    guide_rate: float = float(get_toml('device', 'guide_rate'))
+    max_guide_rate: float = float(get_toml('device', 'max_guide_rate'))
+    guide_spin: float = float(get_toml('device', 'guide_spin'))
     can_sync: bool = to_bool(get_toml('device', 'can_sync'))
     can_sync_AltAz: bool = to_bool(get_toml('device', 'can_sync_AltAz'))
     can_sync_to_target: bool = to_bool(get_toml('device', 'can_sync_to_target'))
     can_set_pier_side: bool = to_bool(get_toml('device', 'can_set_pier_side'))
+    # --------------
+    # Motors Section
+    # --------------
+    motors_port: str = get_toml('motors', 'port')
+    motors_baudrate: int = int(get_toml('motors', 'baudrate'))
+    motors_reply_timeout: float = float(get_toml('motors', 'reply_timeout'))
+    motors_pipeline_depth: int = int(get_toml('motors', 'pipeline_depth'))
+    ra_address: str = get_toml('motors', 'ra_address')
+    dec_address: str = get_toml('motors', 'dec_address')
+    poll_enabled: bool = to_bool(get_toml('motors', 'poll_enabled'))
+    poll_interval_slewing: float = float(get_toml('motors', 'poll_interval_slewing'))
+    poll_interval_tracking: float = float(get_toml('motors', 'poll_interval_tracking'))
+    poll_interval_parked: float = float(get_toml('motors', 'poll_interval_parked'))
+    poll_moving_rate: float = float(get_toml('motors', 'poll_moving_rate'))
+    poll_buffer_size: int = int(get_toml('motors', 'poll_buffer_size'))
+    rate_slot: float = float(get_toml('motors', 'rate_slot'))
+    # ----------------
+    # Tracking Section
+    # ----------------
+    tracking_interval: float = float(get_toml('tracking', 'interval'))
+    tracking_correction_time: float = float(get_toml('tracking', 'correction_time'))
+    tracking_max_correction: float = float(get_toml('tracking', 'max_correction'))
+    tracking_history: int = int(get_toml('tracking', 'history'))
+    # ------------
+    # Slew Section
+    # ------------
+    slew_acceleration: float = float(get_toml('slew', 'acceleration'))
+    slew_jerk: float = float(get_toml('slew', 'jerk'))
+    slew_flip_hour_angle: float = float(get_toml('slew', 'flip_hour_angle'))
+    slew_tolerance: float = float(get_toml('slew', 'tolerance'))
+    slew_iterations: int = int(get_toml('slew', 'iterations'))
+    slew_step: float = float(get_toml('slew', 'step'))
+    # --------------
+    # Homing Section
+    # --------------
+    homing_sensor: str = get_toml('homing', 'sensor')
+    homing_poll_interval: float = float(get_toml('homing', 'poll_interval'))
+    homing_timeout: float = float(get_toml('homing', 'timeout'))
+    homing_seek_speed: float = float(get_toml('homing', 'seek_speed'))
+    homing_approach_speed: float = float(get_toml('homing', 'approach_speed'))
+    homing_backoff_angle: float = float(get_toml('homing', 'backoff_angle'))
+    homing_ra_direction: str = get_toml('homing', 'ra_direction')
+    homing_dec_direction: str = get_toml('homing', 'dec_direction')
+    homing_simulated_time: float = float(get_toml('homing', 'simulated_time'))
+    homing_hour_angle: float = float(get_toml('homing', 'home_hour_angle'))
+    homing_declination: float = float(get_toml('homing', 'home_declination'))
     
     # ---------------
     # Logging Section
@@ -143,3 +200,8 @@ class Config:
     log_to_stdout: str = get_toml('logging', 'log_to_stdout')
     max_size_mb: int = int(get_toml('logging', 'max_size_mb'))
     num_keep_logs: int = int(get_toml('logging', 'num_keep_logs'))
+    log_mode: str = get_toml('logging', 'log_mode')
+    log_batch_size: int = int(get_toml('logging', 'log_batch_size'))
+    log_flush_interval: float = float(get_toml('logging', 'log_flush_interval'))
+    log_sample_endpoints: list = list(get_toml('logging', 'log_sample_endpoints'))
+    log_sample_interval: float = float(get_toml('logging', 'log_sample_interval'))
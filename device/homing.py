@@ -0,0 +1,202 @@
+import asyncio
+import time
+from enum import IntEnum
+from logging import Logger
+from typing import Callable
+
+class HomingState(IntEnum):
+    IDLE        = 0
+    SEEK        = 1     # Toward the switch at the seek speed
+    BACKOFF     = 2     # Off the switch, away from it
+    APPROACH    = 3     # Back to the switch at the approach speed
+    HOMED       = 4
+    FAILED      = 5
+    ABORTED     = 6
+
+class HomingError(RuntimeError):
+    """Homing timed out, or the switch did not change as expected"""
+
+class HomeSensor:
+    """Home switch read by polling: check() every interval seconds
+
+    Args:
+        check: Returns True while the switch is active (``utilities.is_RA_homed``...)
+        interval: [s] Time between two reads
+    """
+    def __init__(self, check: Callable[[], bool], interval: float = 0.01):
+        self.check = check
+        self.interval = interval
+        self.reads = 0                          # check() calls, for the benchmarks
+
+    def active(self) -> bool:
+        self.reads += 1
+        return bool(self.check())
+
+    async def wait_for(self, active: bool, timeout: float) -> bool:
+        """Wait until the switch is (in)active, False after timeout seconds"""
+        deadline = time.monotonic() + timeout
+        while self.active() != active:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(self.interval)
+        return True
+
+class EdgeHomeSensor(HomeSensor):
+    """Home switch read when notified of an edge
+
+    The GPIO interrupt of the switch (e.g. ``RPi.GPIO.add_event_detect`` on
+    both edges) calls :py:meth:`notify`, from any thread. The waiting
+    coroutine then reads check(). A missed edge is caught by a read every
+    ``interval`` seconds anyway.
+
+    Args:
+        check: Returns True while the switch is active
+        interval: [s] Time between two reads without notification
+    """
+    def __init__(self, check: Callable[[], bool], interval: float = 1.0):
+        super().__init__(check, interval)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._edge: asyncio.Event | None = None
+
+    def notify(self):
+        loop, edge = self._loop, self._edge
+        if loop is not None and edge is not None:
+            loop.call_soon_threadsafe(edge.set)
+
+    async def wait_for(self, active: bool, timeout: float) -> bool:
+        self._loop = asyncio.get_running_loop()
+        self._edge = asyncio.Event()
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                self._edge.clear()
+                if self.active() == active:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(self._edge.wait(), min(self.interval, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._edge = None
+
+def make_home_sensor(kind: str, check: Callable[[], bool], interval: float) -> HomeSensor:
+    """'poll' or 'edge' sensor, see the [homing] section of config.toml ('simulated': poll)"""
+    if kind == 'edge':
+        return EdgeHomeSensor(check, interval)
+    return HomeSensor(check, interval)
+
+class AxisHoming:
+    """Homing sequence of one axis, as a state machine run by a coroutine
+
+    SEEK turns toward the switch at ``seek_speed`` until it closes, then
+    BACKOFF moves ``backoff_angle`` away so the switch opens again, and
+    APPROACH comes back at ``approach_speed``, so the switch is met at the
+    same slow speed every time. There the encoder zero is set (HOMED). An
+    axis starting on the switch backs off first. Each phase must end within
+    ``timeout`` seconds, else the motor is stopped and :py:class:`HomingError`
+    raised (FAILED). Cancelling the coroutine (AbortSlew) stops the motor
+    (ABORTED). Nothing blocks the loop, so both axes home at once.
+
+    Args:
+        name: Axis name, for the log
+        motor: The :py:class:`~motor_control.AsyncMKSMotor` of the axis
+        sensor: Its home switch
+        logger: Device logger
+        direction: 'CW' or 'CCW', toward the switch
+        seek_speed: [rpm] Motor speed of the SEEK phase
+        approach_speed: [rpm] Motor speed of the APPROACH phase
+        backoff_angle: [°] Motor shaft rotation of the BACKOFF phase
+        timeout: [s] Max duration of each phase
+    """
+    def __init__(self, name: str, motor, sensor: HomeSensor, logger: Logger, direction: str = 'CW',
+                 seek_speed: float = 60.0, approach_speed: float = 5.0, backoff_angle: float = 90.0,
+                 timeout: float = 180.0):
+        self.name = name
+        self.motor = motor
+        self.sensor = sensor
+        self.logger = logger
+        self.direction = direction
+        self.seek_speed = seek_speed
+        self.approach_speed = approach_speed
+        self.backoff_angle = backoff_angle
+        self.timeout = timeout
+        self.state = HomingState.IDLE
+
+    def _enter(self, state: HomingState):
+        self.state = state
+        self.logger.debug(f'[Homing {self.name}] {state.name}')
+
+    async def _turn_until(self, speed: float, state: HomingState):
+        self._enter(state)
+        await self.motor.move_constant_speed(self.direction, speed)
+        if not await self.sensor.wait_for(True, self.timeout):
+            raise HomingError(f'{self.name}: home switch not found within {self.timeout} s ({state.name})')
+        await self.motor.stop()
+
+    async def _backoff(self):
+        self._enter(HomingState.BACKOFF)
+        angle = -self.backoff_angle if self.direction == 'CW' else self.backoff_angle
+        await self.motor.move_by_angle(angle, self.seek_speed)
+        await asyncio.sleep(self.motor.move_time(self.motor.angle_to_pulses(angle), self.seek_speed))
+        if not await self.sensor.wait_for(False, self.timeout):
+            raise HomingError(f'{self.name}: still on the home switch after backing off {self.backoff_angle}°')
+
+    async def run(self) -> HomingState:
+        try:
+            if self.sensor.active():
+                await self._backoff()
+            await self._turn_until(self.seek_speed, HomingState.SEEK)
+            await self._backoff()
+            await self._turn_until(self.approach_speed, HomingState.APPROACH)
+            await self.motor.set_zero()
+        except asyncio.CancelledError:
+            self._enter(HomingState.ABORTED)
+            await self._stop()
+            raise
+        except Exception:
+            self._enter(HomingState.FAILED)
+            await self._stop()
+            raise
+        self._enter(HomingState.HOMED)
+        return self.state
+
+    async def _stop(self):
+        try:
+            await self.motor.stop()
+        except IOError as ex:
+            self.logger.error(f'[Homing {self.name}] Stop failed: {ex}')
+
+class SimulatedAxisHoming(AxisHoming):
+    """Homing without a switch: the axis is declared home where it stands
+
+    For mounts whose switches are not wired yet (``utilities.is_RA_homed``
+    and ``is_DEC_homed`` are stubs): waits ``duration`` seconds in SEEK,
+    then sets the encoder zero (HOMED). Cancelling stops the motor (ABORTED).
+
+    Args:
+        name: Axis name, for the log
+        motor: The :py:class:`~motor_control.AsyncMKSMotor` of the axis
+        logger: Device logger
+        duration: [s] Simulated homing time
+    """
+    def __init__(self, name: str, motor, logger: Logger, duration: float = 5.0):
+        super().__init__(name, motor, HomeSensor(lambda: True), logger)
+        self.duration = duration
+
+    async def run(self) -> HomingState:
+        try:
+            self._enter(HomingState.SEEK)
+            await asyncio.sleep(self.duration)
+            await self.motor.set_zero()
+        except asyncio.CancelledError:
+            self._enter(HomingState.ABORTED)
+            await self._stop()
+            raise
+        except Exception:
+            self._enter(HomingState.FAILED)
+            raise
+        self._enter(HomingState.HOMED)
+        return self.state
@@ -37,14 +37,128 @@
 # 08-Nov-2023   rbd 0.4 Log name is now 'alpyca'
 # 17-Feb-2024   rbd 0.6 Additional documentation.
 
+import atexit
 import logging
 import logging.handlers
+import queue
+import threading
 import time
 from config import Config
 
 global logger
 logger: logging.Logger  # Master copy (root) of the logger
 #logger  = None                   # Safe on Python 3.7 but no intellisense in VSCode etc.
+request_sampler = None  # EndpointSampler when log sampling is enabled
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that flushes only when told to
+
+    StreamHandler flushes after every record. Used behind the
+    :py:class:`AsyncLogWriter`, the file is flushed once per batch.
+    """
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+class AsyncLogWriter:
+    """Background thread writing queued log records in batches
+
+    Request threads only put records in a queue (via a
+    ``logging.handlers.QueueHandler``). This thread takes up to
+    ``batch_size`` records at a time, hands them to the real handlers, then
+    flushes once. Request latency no longer depends on the log storage
+    (an SD card on the Raspberry Pi).
+
+    Args:
+        records: The queue filled by the QueueHandler
+        handlers: The handlers doing the actual output
+        batch_size: Maximum records written between two flushes
+        flush_interval: Maximum seconds a record may wait unflushed
+    """
+    _STOP = object()
+
+    def __init__(self, records: queue.SimpleQueue, handlers: list, batch_size: int, flush_interval: float):
+        self.records = records
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread = threading.Thread(target=self._run, name='AsyncLogWriter', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write out everything queued so far and end the thread"""
+        if self._thread.is_alive():
+            self.records.put(self._STOP)
+            self._thread.join(timeout=5.0)
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.records.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._STOP:
+                    stop = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                if isinstance(handler, BatchRotatingFileHandler):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            if stop:
+                return
+
+class EndpointSampler:
+    """Rate limit for the request/response log lines of polling endpoints
+
+    Clients poll some endpoints (``devicestate``, ``slewing``...) several
+    times per second. For those, only one request per client and endpoint is
+    logged every ``interval`` seconds, the next logged line tells how many
+    were skipped. Other endpoints are always logged.
+
+    Args:
+        endpoints: Endpoint names (last URI segment, lower case) to sample
+        interval: Seconds between two logged requests of a client/endpoint
+    """
+    def __init__(self, endpoints: list[str], interval: float):
+        self.endpoints = frozenset(e.lower() for e in endpoints)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last: dict[tuple[str, str], tuple[float, int]] = {}   # (client, endpoint) -> (time, skipped)
+
+    def sample(self, client: str, path: str) -> tuple[bool, int]:
+        """Whether to log this request, and how many were skipped before it"""
+        endpoint = path.rsplit('/', 1)[-1].lower()
+        if endpoint not in self.endpoints:
+            return True, 0
+        key = (client, endpoint)
+        now = time.monotonic()
+        with self._lock:
+            last, skipped = self._last.get(key, (-self.interval, 0))
+            if now - last >= self.interval:
+                self._last[key] = (now, 0)
+                return True, skipped
+            self._last[key] = (last, skipped + 1)
+            return False, 0
 
 def init_logging():
     """ Create the logger - called at app startup
@@ -65,6 +179,12 @@ def init_logging():
         there is an option to cause logged messages to go to the console for
         debugging purposes. A new log is started each time the app is started.
 
+        With ``log_mode = 'queue'`` the handlers are moved behind a queue and
+        written by an :py:class:`AsyncLogWriter` thread, in batches. With
+        ``log_sample_interval`` > 0 the request/response lines of the
+        ``log_sample_endpoints`` are rate limited by an :py:class:`EndpointSampler`
+        (see :py:func:`shr.log_request`).
+
     Returns:
         Customized Python logger.
 
@@ -76,7 +196,8 @@ def init_logging():
     formatter.converter = time.gmtime           # UTC time
     logger.handlers[0].setFormatter(formatter)  # This is the stdout handler, level set above
     # Add a logfile handler, same formatter and level
-    handler = logging.handlers.RotatingFileHandler('logs/alpyca.log',
+    handler_class = BatchRotatingFileHandler if Config.log_mode == 'queue' else logging.handlers.RotatingFileHandler
+    handler = handler_class('logs/alpyca.log',
                                                     mode='w',
                                                     delay=True,     # Prevent creation of empty logs
                                                     maxBytes=Config.max_size_mb * 1000000,
@@ -94,4 +215,14 @@ def init_logging():
         """
         logger.debug('Logging to stdout disabled in settings')
         logger.removeHandler(logger.handlers[0])    # This is the stdout handler
+    if Config.log_mode == 'queue':
+        records = queue.SimpleQueue()
+        writer = AsyncLogWriter(records, list(logger.handlers), Config.log_batch_size, Config.log_flush_interval)
+        for h in list(logger.handlers):
+            logger.removeHandler(h)
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        writer.start()
+    global request_sampler
+    if Config.log_sample_interval > 0:
+        request_sampler = EndpointSampler(Config.log_sample_endpoints, Config.log_sample_interval)
     return logger
\ No newline at end of file
@@ -0,0 +1,87 @@
+from fractions import Fraction
+
+class AxisScale:
+    """Exact conversions between integer counts of an axis and its angle
+
+    Positions are kept as integer counts (microsteps, encoder counts), which
+    add up without rounding. A conversion to degrees or hours divides two
+    integers, which Python rounds once, correctly, whatever their size: the
+    result does not depend on how the counts were reached and nothing
+    drifts over a night. The ``exact_*`` methods return the Fraction itself.
+
+    Args:
+        counts_per_turn: Counts per turn of the axis (gear ratio included)
+    """
+    def __init__(self, counts_per_turn: int):
+        if counts_per_turn <= 0:
+            raise ValueError(f'counts_per_turn must be > 0, not {counts_per_turn}')
+        self.counts_per_turn = int(counts_per_turn)
+
+    @classmethod
+    def from_drive(cls, steps_rotation: int, gear_ratio: int, microstepping: int) -> 'AxisScale':
+        """Microsteps per axis turn: full steps x gear ratio x microstepping"""
+        return cls(steps_rotation * gear_ratio * microstepping)
+
+    def degrees(self, counts: int | float) -> float:
+        return counts * 360 / self.counts_per_turn
+
+    def hours(self, counts: int | float) -> float:
+        return counts * 24 / self.counts_per_turn
+
+    def exact_degrees(self, counts: int) -> Fraction:
+        return Fraction(counts * 360, self.counts_per_turn)
+
+    def exact_hours(self, counts: int) -> Fraction:
+        return Fraction(counts * 24, self.counts_per_turn)
+
+    def counts(self, degrees: float | Fraction | str) -> int:
+        """Nearest count of an angle [°] (half to even), exact for any input
+
+        A float is taken at its exact binary value, a str as written ('0.1').
+        """
+        return round(Fraction(degrees) * self.counts_per_turn / 360)
+
+    def counts_from_hours(self, hours: float | Fraction | str) -> int:
+        return round(Fraction(hours) * self.counts_per_turn / 24)
+
+    def split(self, counts: int) -> tuple[int, int]:
+        """(Whole turns, counts within the turn), the latter in [0, counts_per_turn)"""
+        return divmod(counts, self.counts_per_turn)
+
+class WrappingCounter:
+    """Unbounded position from a fixed-width hardware counter that wraps
+
+    The MKS pulse counter (0x33) is an int32 and overflows after 2^31
+    pulses, about 9 h of slewing at the top speed. Each :py:meth:`update`
+    adds the change since the previous reading, taken modulo 2^bits as the
+    shortest way round, so the total keeps counting across the wrap. The
+    counter must be read before it moves by half its range.
+
+    Args:
+        bits: Width of the hardware counter
+    """
+    def __init__(self, bits: int = 32):
+        self.modulus = 1 << bits
+        self._half = self.modulus >> 1
+        self._last: int | None = None
+        self.total = 0
+        self.wraps = 0                          # Readings that jumped across the end of the range
+
+    def update(self, raw: int) -> int:
+        """Take a raw reading (signed or unsigned, always the same), return the total"""
+        if self._last is None:
+            raw_mod = raw % self.modulus
+            self.total = raw_mod - self.modulus if raw_mod >= self._half else raw_mod
+        else:
+            change = raw - self._last
+            delta = (change + self._half) % self.modulus - self._half
+            if delta != change:
+                self.wraps += 1
+            self.total += delta
+        self._last = raw
+        return self.total
+
+    def reset(self):
+        """Start again from the next reading (after set_zero)"""
+        self._last = None
+        self.total = 0
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# mks_emulator.py - MKS SERVO42C serial protocol emulator on a pseudo-terminal
+#
+# Emulates one or more SERVO42C drivers in CR_UART mode sharing a UART, as
+# documented in doc/MKS-SERVO42C-User-Manual-V1.1.2.pdf (plus the 0x36 shaft
+# angle read of the earlier firmware, used by motor_control). The drivers
+# listen on a Linux pty: point [motors] port in config.toml (or the port of
+# an MKSTransport) at the path it prints and run the driver without hardware.
+#
+#   python mks_emulator.py [--addresses e0,e1] [--latency 0.0005]
+#
+# Each emulated driver models its shaft position (in microstep pulses), the
+# constant speed (0xF6) and relative (0xFD) moves, the encoder, the pulse
+# counter and the EN pin. Replies are sent after a processing latency and
+# at the speed of the line (10 bits per byte at the baud rate). An 0xFD move
+# is acknowledged with status 1, then a status 2 frame is sent when it ends.
+# Frames with a bad tCHK or for another address get no reply.
+# -----------------------------------------------------------------------------
+import argparse
+import heapq
+import os
+import select
+import threading
+import time
+import tty
+
+# Command frame length by opcode, address and tCHK included
+COMMAND_LENGTHS: dict[int, int] = {
+    0x30: 3, 0x33: 3, 0x36: 3, 0x39: 3, 0x3A: 3, 0x3D: 3, 0x3E: 3,
+    0x80: 4, 0x81: 4, 0x86: 4, 0x91: 4, 0x92: 4, 0x93: 4, 0x94: 4,
+    0xF3: 4, 0xF6: 4, 0xF7: 3, 0xFD: 8, 0xFF: 4,
+}
+
+class EmulatedServo:
+    """State of one SERVO42C driver and its motor
+
+    Args:
+        address: Bus address (0xe0...0xe9)
+        motor_type: 1.8 or 0.9 degree per full step
+        mstep: Microstepping, as configured on the driver
+    """
+    def __init__(self, address: int, motor_type: float = 1.8, mstep: int = 32):
+        self.address = address
+        self.pulses_per_turn = (200 if motor_type == 1.8 else 400) * mstep
+        self.mstep = mstep
+        self.enabled = True
+        self.protected = False                  # Locked-rotor protection
+        self.position = 0.0                     # [pulses] since power on
+        self.zero = 0.0                         # [pulses] position of the zero
+        self.velocity = 0.0                     # [pulses/s], signed
+        self.target: float | None = None        # [pulses] end of the running 0xFD move
+        self.t = time.monotonic()
+        self.pulses_received = 0                # 0x33 counter
+
+    def speed_to_pulses(self, param: int) -> float:
+        """Signed velocity [pulses/s] of a VAL byte (bit 7 direction, bits 0-6 speed)
+
+        Vrpm = speed x 30000 / pulses_per_turn, so speed x 500 pulses/s.
+        """
+        rpm = (param & 0x7F) * 30000 / self.pulses_per_turn
+        return (-1 if param & 0x80 else 1) * rpm * self.pulses_per_turn / 60
+
+    def update(self, now: float) -> bool:
+        """Advance the motion to now, return True when an 0xFD move just ended"""
+        dt = now - self.t
+        self.t = now
+        if self.velocity == 0.0 or not self.enabled:
+            return False
+        step = self.velocity * dt
+        if self.target is not None and abs(self.target - self.position) <= abs(step):
+            self.position = self.target
+            self.target = None
+            self.velocity = 0.0
+            return True
+        self.position += step
+        return False
+
+    def move_end(self) -> float | None:
+        """Monotonic time at which the running 0xFD move ends"""
+        if self.target is None or self.velocity == 0.0:
+            return None
+        return self.t + (self.target - self.position) / self.velocity
+
+    def angle(self) -> int:
+        """Shaft angle since the zero, 65536 per turn"""
+        return int((self.position - self.zero) * 65536 / self.pulses_per_turn)
+
+    def execute(self, opcode: int, args: bytes) -> bytes:
+        """Run a command, return the data bytes of the reply"""
+        match opcode:
+            case 0x30:
+                angle = self.angle()
+                return (angle >> 16).to_bytes(4, 'big', signed=True) + (angle & 0xFFFF).to_bytes(2, 'big')
+            case 0x33:
+                return self.pulses_received.to_bytes(4, 'big', signed=True)
+            case 0x36:
+                return self.angle().to_bytes(4, 'big', signed=True)
+            case 0x39:
+                lag = int(self.velocity * 0.002 * 65536 / self.pulses_per_turn)    # ~2 ms behind
+                return max(-32768, min(32767, lag)).to_bytes(2, 'big', signed=True)
+            case 0x3A:
+                return bytes([1 if self.enabled else 2])
+            case 0x3D:
+                self.protected = False
+                return b'\x01'
+            case 0x3E:
+                return bytes([1 if self.protected else 2])
+            case 0x91:
+                self.zero = self.position
+                return b'\x01'
+            case 0x94:
+                self.target = self.zero
+                self.velocity = self.speed_to_pulses(0x20 | (0x80 if self.position > self.zero else 0))
+                return b'\x01'
+            case 0xF3:
+                self.enabled = args[0] == 1
+                if not self.enabled:
+                    self.velocity, self.target = 0.0, None
+                return b'\x01'
+            case 0xF6:
+                if not self.enabled:
+                    return b'\x00'
+                self.target = None
+                self.velocity = self.speed_to_pulses(args[0])
+                return b'\x01'
+            case 0xF7:
+                self.velocity, self.target = 0.0, None
+                return b'\x01'
+            case 0xFD:
+                pulses = int.from_bytes(args[1:5], 'big')
+                if not self.enabled:
+                    return b'\x00'
+                velocity = self.speed_to_pulses(args[0])
+                if pulses == 0 or velocity == 0.0:
+                    return b'\x02'
+                self.pulses_received += pulses if velocity > 0 else -pulses
+                self.target = self.position + (pulses if velocity > 0 else -pulses)
+                self.velocity = velocity
+                return b'\x01'
+            case _:                             # Settings (calibrate, motor type, dir...)
+                return b'\x01'
+
+class MKSEmulator:
+    """SERVO42C drivers sharing a pty, served by a background thread
+
+    Args:
+        addresses: Bus addresses of the emulated drivers
+        latency: [s] Processing time before a reply starts
+        baudrate: Line speed used to pace the replies (0 for no pacing)
+        motor_type: 1.8 or 0.9 degree per full step
+        mstep: Microstepping of the drivers
+
+    Example:
+        >>> emu = MKSEmulator(('e0', 'e1')).start()
+        >>> transport = MKSTransport(emu.port)
+    """
+    def __init__(self, addresses=('e0', 'e1'), latency: float = 0.0005, baudrate: int = 115200,
+                 motor_type: float = 1.8, mstep: int = 32):
+        self.servos: dict[int, EmulatedServo] = {int(a, 16): EmulatedServo(int(a, 16), motor_type, mstep)
+                                                 for a in addresses}
+        self.latency = latency
+        self.byte_time = 10 / baudrate if baudrate else 0.0
+        self.frames_received = 0
+        self.frames_ignored = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port: str = os.ttyname(self._slave)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='MKSEmulator', daemon=True)
+        self._events: list = []                 # heap of (due, seq, address) move ends
+        self._seq = 0
+
+    def start(self) -> 'MKSEmulator':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _send(self, address: int, data: bytes):
+        frame = bytes([address]) + data + bytes([(address + sum(data)) & 0xFF])
+        if self.byte_time:
+            time.sleep(self.byte_time * len(frame))
+        os.write(self._master, frame)
+
+    def _schedule(self, servo: EmulatedServo):
+        due = servo.move_end()
+        if due is not None:
+            self._seq += 1
+            heapq.heappush(self._events, (due, self._seq, servo.address))
+
+    def _completions(self, now: float):
+        while self._events and self._events[0][0] <= now:
+            _, _, address = heapq.heappop(self._events)
+            servo = self.servos[address]
+            if servo.target is not None and servo.update(now):
+                self._send(address, b'\x02')
+
+    def _run(self):
+        buf = b''
+        while not self._stop.is_set():
+            timeout = 0.05
+            if self._events:
+                timeout = max(0.0, min(timeout, self._events[0][0] - time.monotonic()))
+            ready, _, _ = select.select([self._master], [], [], timeout)
+            self._completions(time.monotonic())
+            if not ready:
+                continue
+            try:
+                buf += os.read(self._master, 256)
+            except OSError:
+                return
+            while len(buf) >= 2:
+                length = COMMAND_LENGTHS.get(buf[1])
+                if length is None:              # Unknown opcode, resync on next byte
+                    self.frames_ignored += 1
+                    buf = buf[1:]
+                    continue
+                if len(buf) < length:
+                    break
+                frame, buf = buf[:length], buf[length:]
+                self._handle(frame)
+
+    def _handle(self, frame: bytes):
+        servo = self.servos.get(frame[0])
+        if servo is None or sum(frame[:-1]) & 0xFF != frame[-1]:
+            self.frames_ignored += 1
+            return
+        self.frames_received += 1
+        if self.latency:
+            time.sleep(self.latency)
+        servo.update(time.monotonic())
+        data = servo.execute(frame[1], frame[2:-1])
+        if frame[1] in (0xFD, 0x94) and data == b'\x01':
+            self._schedule(servo)
+        self._send(frame[0], data)
+
+def main():
+    parser = argparse.ArgumentParser(description='MKS SERVO42C emulator on a pty')
+    parser.add_argument('--addresses', default='e0,e1', help='comma separated bus addresses')
+    parser.add_argument('--latency', type=float, default=0.0005, help='reply processing time [s]')
+    parser.add_argument('--baudrate', type=int, default=115200)
+    parser.add_argument('--mstep', type=int, default=32)
+    args = parser.parse_args()
+    emu = MKSEmulator(args.addresses.split(','), args.latency, args.baudrate, mstep=args.mstep).start()
+    print(f'SERVO42C {args.addresses} on {emu.port} (Ctrl-C to stop)')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        emu.stop()
+
+if __name__ == '__main__':
+    main()
@@ -1,34 +1,375 @@
+import asyncio
+import logging
 import serial
 import struct
+import threading
 import time
+from collections import deque
+from enum import IntEnum
+from concurrent.futures import Future
 from typing import Callable
-from utilities import is_RA_homed
+from homing import AxisHoming, HomeSensor, HomingError
 # try:
 #     import RPi.GPIO as GPIO
 # except:
 #     pass
+
+# Length of the SERVO42C reply to each command, address and rCHK included
+# (firmware V1.1.2, see doc/MKS-SERVO42C-User-Manual-V1.1.2.pdf)
+REPLY_LENGTHS: dict[int, int] = {
+    0x30: 8,    # Encoder carry int32 + value uint16
+    0x33: 6,    # Pulses received, int32
+    0x36: 6,    # Shaft angle, int32
+    0x39: 4,    # Angular error, int16
+    0x3A: 3,    # EN pin status
+    0x3E: 3,    # Shaft (blocked) status
+    0x86: 3,    # Set direction
+    0x91: 3,    # Set zero
+    0x94: 3,    # Return to zero
+    0xF3: 3,    # Set EN
+    0xF6: 3,    # Constant speed
+    0xF7: 3,    # Stop
+    0xFD: 3,    # Move by pulses (1: started), then 3 more bytes when done
+}
+MOVE_COMPLETE = 0x02    # Status of the unsolicited frame ending an 0xFD move
+
+class ENStatus(IntEnum):
+    ERROR           = 0
+    ENABLED         = 1
+    DISABLED        = 2
+
+class ShaftStatus(IntEnum):
+    ERROR           = 0
+    BLOCKED         = 1
+    UNBLOCKED       = 2
+
+# Decoders of the read command replies (address, value, rCHK, big endian) and
+# the enum of the value, if any
+READ_DECODERS: dict[int, tuple[struct.Struct, type | None]] = {
+    0x30: (struct.Struct('>BiHB'), None),           # Encoder carry int32, value uint16
+    0x33: (struct.Struct('>BiB'), None),            # Pulses received, int32
+    0x36: (struct.Struct('>BiB'), None),            # Shaft angle, int32 (65536 per turn)
+    0x39: (struct.Struct('>BhB'), None),            # Angular error, int16 (65536 per turn)
+    0x3A: (struct.Struct('>BBB'), ENStatus),
+    0x3E: (struct.Struct('>BBB'), ShaftStatus),
+}
+_ENUM_MEMBERS: dict[type, dict[int, IntEnum]] = {e: {int(m): m for m in e} for e in (ENStatus, ShaftStatus)}
+
+class MKSReplyError(IOError):
+    """Missing, short or corrupted reply from a SERVO42C driver"""
+
+def check_reply(frame: bytes, reply: bytes, reply_len: int) -> bytes:
+    """Raise MKSReplyError unless reply is the complete, valid answer to frame"""
+    if reply and reply[0] != frame[0]:
+        raise MKSReplyError(f'{frame.hex(" ")}: reply from address {reply[0]:02x}')
+    if len(reply) != reply_len:
+        raise MKSReplyError(f'{frame.hex(" ")}: {len(reply)}/{reply_len} reply bytes before timeout')
+    if sum(reply[:-1]) & 0xFF != reply[-1]:
+        raise MKSReplyError(f'{frame.hex(" ")}: bad rCHK in {reply.hex(" ")}')
+    return reply
+
+def decode_reply(opcode: int, reply: bytes) -> int | IntEnum:
+    """Value of a checked read command reply, as int or status enum"""
+    decoder, kind = READ_DECODERS[opcode]
+    fields = decoder.unpack(reply)
+    value = fields[1] if len(fields) == 3 else (fields[1] << 16) + fields[2]     # Encoder carry
+    if kind is None:
+        return value
+    member = _ENUM_MEMBERS[kind].get(value)
+    if member is None:
+        raise MKSReplyError(f'{reply.hex(" ")}: unknown {kind.__name__} {value}')
+    return member
+
+class MKSTransport:
+    """Framed request/reply exchange on the SERVO42C UART
+
+    Each command is answered by a frame whose length only depends on the
+    command (see ``REPLY_LENGTHS``). The reply is read as soon as its last
+    byte arrives, within a deadline, and its address and rCHK are checked.
+    The port is opened on first use so the driver starts without the motors.
+
+    An accepted 0xFD move is followed, when it ends, by an unsolicited
+    ``<addr> 02 <rCHK>`` frame. The addresses expecting one are kept in
+    ``moving``; the frame is recognized between exchanges, in front of
+    a longer reply or of the reply of another address. In front of a 3 byte reply it cannot be told apart
+    from a status 2 reply and is taken as the reply.
+
+    Args:
+        port: Serial device
+        baudrate: UART speed of the drivers
+        reply_timeout: [s] Deadline for a complete reply, from the write
+    """
+    def __init__(self, port: str = '/dev/serial0', baudrate: int = 115200, reply_timeout: float = 0.05):
+        self.port = port
+        self.baudrate = baudrate
+        self.reply_timeout = reply_timeout
+        self.ser = None
+        self.moving: set[int] = set()           # Addresses owing a move completion frame
+
+    def open(self):
+        if self.ser is None:
+            self.ser = serial.serial_for_url(self.port, baudrate=self.baudrate, timeout=self.reply_timeout)
+
+    def close(self):
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
+
+    def transact(self, frame: bytes, reply_len: int) -> bytes:
+        """Write a command frame, return its checked reply frame
+
+        Raises:
+            MKSReplyError: No complete reply before the deadline, or a reply
+                from another address or with a bad checksum. Stale input is
+                discarded before the next command.
+        """
+        self.open()
+        self.drain()
+        self.ser.write(frame)
+        _, reply = self.read_reply({frame[0]: (frame, reply_len)})
+        return check_reply(frame, reply, reply_len)
+
+    def _is_completion(self, addr: int, body: bytes) -> bool:
+        return body[0] == MOVE_COMPLETE and body[1] == (addr + MOVE_COMPLETE) & 0xFF
+
+    def drain(self):
+        """Consume the input received between exchanges
+
+        Move completion frames clear their address from ``moving``, anything
+        else is the leftover of a late or broken reply and is discarded.
+        """
+        ser = self.ser
+        while ser.in_waiting:
+            data = ser.read(ser.in_waiting)
+            for i in range(len(data) - 2):
+                if data[i] in self.moving and self._is_completion(data[i], data[i + 1:i + 3]):
+                    self.moving.discard(data[i])
+
+    def read_reply(self, expected: dict[int, tuple[bytes, int]]) -> tuple[int, bytes]:
+        """Read the next reply frame sent by one of the expected addresses
+
+        Args:
+            expected: Address to (command frame, reply length) of the
+                commands written and not answered yet
+
+        Returns:
+            (address, reply). The reply is empty after a timeout, and only the
+            first bytes when the address was not expected (the caller resyncs).
+            Move completion frames of the addresses in ``moving`` are skipped.
+            Reading stops at the first of reply_len bytes or the timeout.
+        """
+        ser = self.ser
+        head = ser.read(1)
+        while head:
+            addr = head[0]
+            if addr not in expected:
+                if addr in self.moving:         # Another driver ending its move
+                    body = ser.read(2)
+                    if len(body) == 2 and self._is_completion(addr, body):
+                        self.moving.discard(addr)
+                        head = ser.read(1)
+                        continue
+                    return addr, head + body
+                return addr, head
+            frame, reply_len = expected[addr]
+            if addr in self.moving and reply_len > 3:
+                body = ser.read(2)
+                if len(body) == 2 and self._is_completion(addr, body):
+                    self.moving.discard(addr)
+                    head = ser.read(1)
+                    continue
+                reply = head + body + ser.read(reply_len - 3)
+            else:
+                reply = head + ser.read(reply_len - 1)
+            if frame[1] == 0xFD and len(reply) == 3 and reply[1] == 1:
+                self.moving.add(addr)
+            elif frame[1] == 0xFD:
+                self.moving.discard(addr)
+            return addr, reply
+        return 0, b''
+
+class MKSBus:
+    """Arbiter for several SERVO42C addresses sharing one UART
+
+    Every :py:class:`MKSMotor` on the bus hands its frames to this object
+    (it has the same ``transact()`` as :py:class:`MKSTransport`), from any
+    thread. A single worker thread owns the port: it takes the queued
+    requests in order and writes up to ``pipeline_depth`` of them back to
+    back, at most one per address, then routes each reply to its request
+    by the address byte. Keep ``pipeline_depth`` at 1 when the drivers
+    share the TX line to the host: simultaneous replies would collide.
+
+    Args:
+        transport: The port, see :py:class:`MKSTransport`
+        pipeline_depth: Max requests outstanding on the wire
+    """
+    def __init__(self, transport: MKSTransport, pipeline_depth: int = 1):
+        self.transport = transport
+        self.pipeline_depth = max(1, pipeline_depth)
+        self._pending: deque = deque()          # (frame, reply_len, future, queued_at)
+        self._inflight = 0                      # Requests written, reply not yet routed
+        self._cond = threading.Condition()
+        self._running = True
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+        self._thread = threading.Thread(target=self._run, name='MKSBus', daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: bytes, reply_len: int) -> Future:
+        """Queue a command frame, the future gets its checked reply frame"""
+        future = Future()
+        with self._cond:
+            if not self._running:
+                raise MKSReplyError('MKS bus is closed')
+            self._pending.append((frame, reply_len, future, time.monotonic()))
+            depth = len(self._pending) + self._inflight
+            self._cond.notify()
+        with self._stats_lock:
+            self._depth_sum += depth
+            self._depth_max = max(self._depth_max, depth)
+        return future
+
+    def transact(self, frame: bytes, reply_len: int) -> bytes:
+        return self.submit(frame, reply_len).result()
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(timeout=2.0)
+        self.transport.close()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats_since = time.monotonic()
+            self._requests = 0
+            self._errors = 0
+            self._wire_bytes = 0
+            self._depth_sum = 0
+            self._depth_max = 0
+            self._latency_sum = 0.0
+            self._latency_max = 0.0
+
+    def stats(self) -> dict:
+        """Bus load since the last :py:meth:`reset_stats`
+
+        ``utilization`` is the share of the time the line carried bits (10
+        bits per byte at the transport baud rate), ``queue_depth_*`` the
+        number of requests waiting or in flight seen by each new request,
+        ``latency_*`` [s] from submit to reply.
+        """
+        with self._stats_lock:
+            elapsed = max(time.monotonic() - self._stats_since, 1e-9)
+            n = max(self._requests, 1)
+            return {'requests': self._requests, 'errors': self._errors,
+                    'requests_per_s': self._requests / elapsed,
+                    'utilization': self._wire_bytes * 10 / self.transport.baudrate / elapsed,
+                    'queue_depth_mean': self._depth_sum / n, 'queue_depth_max': self._depth_max,
+                    'latency_mean': self._latency_sum / n, 'latency_max': self._latency_max}
+
+    def _take_batch(self) -> list:
+        with self._cond:
+            while self._running and not self._pending:
+                self._cond.wait()
+            batch = []
+            addresses = set()
+            while self._pending and len(batch) < self.pipeline_depth:
+                frame = self._pending[0][0]
+                if frame[0] in addresses:       # One outstanding request per driver
+                    break
+                addresses.add(frame[0])
+                batch.append(self._pending.popleft())
+            self._inflight = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                break                           # Closed
+            try:
+                self._exchange(batch)
+            except Exception as ex:
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(ex)
+            with self._cond:
+                self._inflight = 0
+        with self._cond:
+            for _, _, future, _ in self._pending:
+                future.set_exception(MKSReplyError('MKS bus is closed'))
+            self._pending.clear()
+
+    def _exchange(self, batch: list):
+        transport = self.transport
+        transport.open()
+        transport.drain()
+        transport.ser.write(b''.join(entry[0] for entry in batch))
+        waiting = {entry[0][0]: entry for entry in batch}
+        wire = sum(len(entry[0]) for entry in batch)
+        errors = 0
+        while waiting:
+            addr, reply = transport.read_reply({a: (e[0], e[1]) for a, e in waiting.items()})
+            if not reply:
+                break
+            entry = waiting.pop(addr, None)
+            if entry is None:
+                errors += 1                     # Noise or an unexpected address, resync
+                transport.ser.reset_input_buffer()
+                break
+            frame, reply_len, future, queued_at = entry
+            wire += len(reply)
+            with self._cond:
+                self._inflight -= 1
+            try:
+                future.set_result(check_reply(frame, reply, reply_len))
+            except MKSReplyError as ex:
+                errors += 1
+                future.set_exception(ex)
+            self._account(time.monotonic() - queued_at)
+        for frame, reply_len, future, _ in waiting.values():
+            errors += 1
+            future.set_exception(MKSReplyError(f'{frame.hex(" ")}: no reply before timeout'))
+        with self._stats_lock:
+            self._wire_bytes += wire
+            self._errors += errors
+
+    def _account(self, latency: float):
+        with self._stats_lock:
+            self._requests += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+
 class MKSMotor:
-    def __init__(self, check_home: Callable, adress:str, port='/dev/serial0', baudrate=115200, timeout=1, motor_type=1.8):
+    def __init__(self, check_home: Callable, adress:str, port='/dev/serial0', baudrate=115200, timeout=0.05, motor_type=1.8,
+                 transport: MKSTransport | MKSBus | None = None):
         #For Rpi :
         # GPIO.setmode(GPIO.BCM)
         # GPIO.setwarnings(False)
         
         # For Serial
-        self.ser = None #serial.Serial(port, baudrate, timeout=timeout)
+        self.transport = transport or MKSTransport(port, baudrate, timeout)
         self.adress = int(adress, 16)
         self._speed = 0
         self.check_home = check_home
         self.motor_type: float = motor_type # 1.8 or 0.9 degree/step
         self.Mstep = 32
+        # Read commands have no argument: build their frames once
+        self._query_frames: dict[int, tuple[bytes, int]] = {op: self._frame([op]) for op in READ_DECODERS}
 
-    def _send_command(self, command_bytes:list):
+    def _frame(self, command_bytes:list) -> tuple[bytes, int]:
+        """Command frame (address, command, tCHK) and length of its reply"""
         command: list[int] = [self.adress] + list(command_bytes)
         tCHK: int = self.calculate_checksum(command) 
-        struct.pack('<' + 'B'*(len(command) + 1), *command, tCHK)
-        self.ser.write(command_bytes)
-        time.sleep(0.1)
-        response = self.ser.read_all()
-        return response
+        frame = struct.pack('<' + 'B'*(len(command) + 1), *command, tCHK)
+        return frame, REPLY_LENGTHS[command_bytes[0]]
+
+    def _send_command(self, command_bytes:list) -> bytes:
+        return self.transport.transact(*self._frame(command_bytes))
+
+    def _query(self, opcode: int) -> int | IntEnum:
+        frame, reply_len = self._query_frames[opcode]
+        return decode_reply(opcode, self.transport.transact(frame, reply_len))
 
     def calculate_checksum(self, data):
         """
@@ -40,7 +381,7 @@ class MKSMotor:
         # Somme des octets et masquage avec 0xFF
         return sum(data) & 0xFF
 
-    def read_encoder_value(self):
+    def read_encoder_value(self) -> int:
         """Read the encoder value
         Info:
             The motor should be calibrated before reading the encoder value
@@ -49,30 +390,29 @@ class MKSMotor:
             None
         
         Returns:
-            Driver response with the form: e0 <encoder value: uint16_t> rCHK.
+            Encoder value, carry x 65536 + value (65536 per turn), from the
+            driver response: e0 <carry: int32_t> <value: uint16_t> rCHK.
 
         Example:
             >>> Send e0 30 10
-            >>> Return e0 40 00 20"""
-        command: list[int] = [0x30]
-        return self._send_command(command)
+            >>> Return e0 00 00 00 00 40 00 20"""
+        return self._query(0x30)
 
-    def read_pulse_nb(self):
+    def read_pulse_nb(self) -> int:
         """Read the number of pulses received by the motor
         
         Args:
             None
         
         Returns:
-            Driver response with the form: e0 <pulse number:int32_t> rCHK.
+            Pulse number, from the driver response: e0 <pulse number:int32_t> rCHK.
             
         Example:
             >>> Send e0 33 13
             >>> Return e0 00 00 01 00 e1 (256 pulses)"""
-        command: list[int] = [0x33]
-        return self._send_command(command)
+        return self._query(0x33)
 
-    def read_shaft_angle(self):
+    def read_shaft_angle(self) -> int:
         """Read the angle of the motor shaft. The motor rotates one circle, 
         the corresponding angle value range is 0~65535.
         
@@ -80,15 +420,14 @@ class MKSMotor:
             None
         
         Returns:
-            Driver response with the form: e0 <angle:int32_t> rCHK.
+            Angle (65536 per turn), from the driver response: e0 <angle:int32_t> rCHK.
             
         Example:
             >>> Send e0 36 16
-            >>> Return e0 00 00 40 10 (angle 90°)"""
-        command: list[int] = [0x36]
-        return self._send_command(command)
+            >>> Return e0 00 00 40 00 20 (angle 90°)"""
+        return self._query(0x36)
 
-    def read_angular_error(self):
+    def read_angular_error(self) -> int:
         """Read the angular error of the motor shaft. The error is the difference between 
         the angle you want to control minus the real-time angle of the motor, 0-FFFF corresponds 
         to 0~360°, for example, when the angle error is 1°, the return error is 65536/360= 182.444, and so on.
@@ -97,15 +436,14 @@ class MKSMotor:
             None
         
         Returns:
-            Driver response with the form: e0 <angle:int16_t> rCHK.
+            Error (65536 per turn), from the driver response: e0 <angle:int16_t> rCHK.
             
         Example:
             >>>Send e0 39 19
             >>>Return e0 00 b7 97 (1° error)"""
-        command: list[int] = [0x39]
-        return self._send_command(command)
+        return self._query(0x39)
 
-    def read_EN_status(self):
+    def read_EN_status(self) -> ENStatus:
         """Read the status EN pin. EN pin is used to control the motor driver enable signal.
 
         Status can be: 
@@ -117,15 +455,14 @@ class MKSMotor:
             None
         
         Returns:
-            Driver response with the form: e0 <status:uint8_t> rCHK.
+            :py:class:`ENStatus`, from the driver response: e0 <status:uint8_t> rCHK.
             
         Example:
             >>> Send e0 3a 1a
             >>> Return e0 01 e1 (enable)"""
-        command: list[int] = [0x3A]
-        return self._send_command(command)
+        return self._query(0x3A)
 
-    def read_shaft_status(self):
+    def read_shaft_status(self) -> ShaftStatus:
         """Read the status of the motor shaft. The status of the motor shaft is as follows:
             - 00-Error
             - 01-blocked
@@ -135,13 +472,12 @@ class MKSMotor:
             None
         
         Returns:
-            Driver response with the form: e0 <status:uint8_t> rCHK.
+            :py:class:`ShaftStatus`, from the driver response: e0 <status:uint8_t> rCHK.
             
         Example:
             >>> Send e0 3e 1e
             >>> Return e0 02 e2 (unblocked)"""
-        command: list[int] = [0x3e]
-        return self._send_command(command)
+        return self._query(0x3E)
 
     def set_dir(self, dir:str):
         """Set the direction of the motor. The direction of the motor is as follows:
@@ -163,7 +499,7 @@ class MKSMotor:
                 dir_byte = 0
             case 'CCW':
                 dir_byte = 1
-        command: list[int] = [0x3B, dir_byte]
+        command: list[int] = [0x86, dir_byte]
         return self._send_command(command)
     
     def set_zero(self):
@@ -219,7 +555,7 @@ class MKSMotor:
         Example:
             >>> Send e0 f3 01 d4 (enable)
             >>> Return e0 01 e1 (successful)"""
-        command: list[int] = [0x95, 0x01]
+        command: list[int] = [0xF3, 0x01]
         return self._send_command(command)
     
     def stop(self):
@@ -234,7 +570,7 @@ class MKSMotor:
         Example:
             >>> Send e0 f7 d7
             >>> Return e0 01 e1 (successful)"""
-        command: list[int] = [0x97]
+        command: list[int] = [0xF7]
         return self._send_command(command)
 
     def is_moving(self):
@@ -256,23 +592,19 @@ class MKSMotor:
         Example:
             >>> Send e0 f6 00 00 (CW)
             >>> Return e0 01 e1 (successful)"""
-        match dir:
-            case 'CW':
-                dir_byte = 0b0
-            case 'CCW':
-                dir_byte = 0b1
-        match self.motor_type:
-            case 1.8:
-                speed:int = int((speed_rpm * 200 * self.Mstep) / (30000))
-            case 0.9:
-                speed:int = int((speed_rpm * 400 * self.Mstep) / (30000))
-        speed_byte = bytes(speed)
-        param = (dir_byte << 7) | int.from_bytes(speed_byte, 'big')
+        return self.set_speed_code(self.speed_code(speed_rpm), dir == 'CCW')
+
+    def set_speed_code(self, code: int, reverse: bool = False):
+        """Constant speed move at a raw 7-bit speed (code x 500 pulses/s), 0 stops
 
+        Used by :py:class:`rate_synth.RateSynthesizer`, which dithers between
+        two codes to reach the speeds lying between them.
+        """
+        param = (0b1 << 7 if reverse else 0) | min(max(int(code), 0), 0x7F)
         command: list[int] = [0xf6, param]
         return self._send_command(command)
 
-    def move_to_target(self, target_position, speed_rpm): # TODO
+    def move_to_target(self, target_position, speed_rpm):
         """Move the motor to a target position at a given speed.
         Command: <adress> fd <param> <target> <tCHK>
         param: 0babbb bbb with a:direction, b:speed
@@ -281,30 +613,97 @@ class MKSMotor:
         Speed [RPM] = (speed[bin] x 30000)/(Mstep x 400) for 0.9°/step motor
         
         Args:
-            target_position: Target position
+            target_position: Pulses to move from the current position (0xFD is relative), negative for CCW
             speed_rpm: Speed of the motor in RPM
         
         Returns:
             Driver response with the form: e0 <result:uint8_t> rCHK.
             
         Example:
-            >>> Send e0 a6 05"""
-        command: list[int] = [0xA6, 0x05, target_position, speed_rpm]
+            >>> Send e0 fd 14 00 00 0c 80 7d (CW, speed 20, 3200 pulses)
+            >>> Return e0 01 e1 (successful)"""
+        pulses = int(target_position)
+        dir_byte = 0b1 if pulses < 0 else 0b0
+        param = (dir_byte << 7) | self.speed_code(speed_rpm)
+        command: list[int] = [0xFD, param, *abs(pulses).to_bytes(4, 'big')]
         return self._send_command(command)
 
+    def speed_code(self, speed_rpm: float) -> int:
+        """7-bit speed of the 0xF6 / 0xFD commands for a motor speed in RPM
+
+        Truncated, but at least 1 (the slowest speed) for a non-zero speed.
+        """
+        match self.motor_type:
+            case 1.8:
+                speed:int = int((speed_rpm * 200 * self.Mstep) / (30000))
+            case 0.9:
+                speed:int = int((speed_rpm * 400 * self.Mstep) / (30000))
+        return min(max(speed, 1 if speed_rpm > 0 else 0), 0x7F)
+
+    def move_time(self, pulses: int, speed_rpm: float) -> float:
+        """[s] Duration of an 0xFD move, the driver sends speed code x 500 pulses/s"""
+        code = self.speed_code(speed_rpm)
+        return abs(pulses) / (code * 500) if code else 0.0
+
+    def angle_to_pulses(self, angle: float) -> int:
+        """Number of (micro)step pulses for a shaft rotation in degrees"""
+        return round(angle * self.Mstep / self.motor_type)
+
     def move_by_angle(self, angle, speed_rpm):
-        current_position = self.read_shaft_angle()
-        target_position = current_position + angle
-        return self.move_to_target(target_position, speed_rpm)
+        """Rotate the shaft by angle degrees (negative for CCW), see move_to_target"""
+        return self.move_to_target(self.angle_to_pulses(angle), speed_rpm)
+
+    def find_home(self, timeout: float = 180.0, poll: float = 0.01):
+        """Turn until check_home() is True, reading it every poll seconds, then stop.
 
-    def find_home(self):
-        """Find the home position. Command is of the form <adress> 9a <tCHK>.
+        Single-speed search for scripts without an event loop, the driver
+        homes through :py:class:`homing.AxisHoming` (see AsyncMKSMotor).
+
+        Raises:
+            HomingError: check_home() still False after timeout seconds
         """
         self.move_by_angle(360, 10)
+        deadline = time.monotonic() + timeout
         while not self.check_home():
-            pass
+            if time.monotonic() >= deadline:
+                self.stop()
+                raise HomingError(f'Home not found within {timeout} s')
+            time.sleep(poll)
         self.stop()
-        
+
+class AsyncMKSMotor(MKSMotor):
+    """MKSMotor for coroutines: every command method returns an awaitable
+
+    Same commands and arguments as :py:class:`MKSMotor`, but the frames are
+    handed to the :py:class:`MKSBus` worker thread and awaited through
+    ``asyncio.wrap_future``, so the event loop keeps running while the
+    serial exchange takes place and many commands from different coroutines
+    can be in flight at once. Must be awaited on a running loop.
+
+    Example:
+        >>> reply = await motor.read_shaft_angle()
+    """
+    def __init__(self, check_home: Callable, adress:str, bus: MKSBus, motor_type=1.8, home_poll: float = 0.01):
+        super().__init__(check_home, adress, motor_type=motor_type, transport=bus)
+        self.home_poll = home_poll
+
+    async def _send_command(self, command_bytes:list) -> bytes:
+        return await asyncio.wrap_future(self.transport.submit(*self._frame(command_bytes)))
+
+    async def _query(self, opcode: int) -> int | IntEnum:
+        frame, reply_len = self._query_frames[opcode]
+        return decode_reply(opcode, await asyncio.wrap_future(self.transport.submit(frame, reply_len)))
+
+    async def find_home(self, sensor: HomeSensor | None = None, **settings):
+        """Run the homing sequence of :py:class:`homing.AxisHoming` on this motor
+
+        Args:
+            sensor: Home switch, by default check_home() polled every home_poll seconds
+            settings: direction, speeds, backoff_angle and timeout of AxisHoming
+        """
+        sensor = sensor or HomeSensor(self.check_home, self.home_poll)
+        return await AxisHoming(f'{self.adress:02x}', self, sensor, logging.getLogger(__name__), **settings).run()
+
 # Exemple d'utilisation
 if __name__ == "__main__":
     pass
\ No newline at end of file
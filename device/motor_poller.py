@@ -0,0 +1,197 @@
+import asyncio
+import bisect
+import threading
+import time
+from logging import Logger
+from typing import Callable
+
+from microsteps import AxisScale, WrappingCounter
+from motor_control import AsyncMKSMotor, ShaftStatus
+
+class SampleRing:
+    """Fixed-size ring of timestamped samples of one axis position
+
+    Written by the poller, read from any thread. Reads interpolate linearly
+    between the two samples around the requested time, and extrapolate
+    from the last two samples (at most ``horizon`` seconds) past the newest.
+
+    Args:
+        size: Number of samples kept, the oldest is overwritten
+    """
+    def __init__(self, size: int = 256):
+        self.size = max(2, size)
+        self._times: list[float] = [0.0] * self.size
+        self._values: list[float] = [0.0] * self.size
+        self._head = 0                          # Next slot written
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, t: float, value: float):
+        with self._lock:
+            self._times[self._head] = t
+            self._values[self._head] = value
+            self._head = (self._head + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+    def _ordered(self) -> tuple[list[float], list[float]]:
+        """Times and values, oldest first (called with the lock held)"""
+        start = (self._head - self._count) % self.size
+        idx = [(start + i) % self.size for i in range(self._count)]
+        return [self._times[i] for i in idx], [self._values[i] for i in idx]
+
+    def clear(self):
+        with self._lock:
+            self._count = 0
+
+    def latest(self) -> tuple[float, float] | None:
+        """(time, value) of the newest sample"""
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._head - 1) % self.size
+            return self._times[i], self._values[i]
+
+    def velocity(self) -> float:
+        """[units/s] between the two newest samples, 0 with fewer samples"""
+        with self._lock:
+            if self._count < 2:
+                return 0.0
+            i, j = (self._head - 1) % self.size, (self._head - 2) % self.size
+            dt = self._times[i] - self._times[j]
+            return (self._values[i] - self._values[j]) / dt if dt > 0 else 0.0
+
+    def at(self, t: float, horizon: float) -> float | None:
+        """Value at monotonic time t, None without samples"""
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._head - 1) % self.size
+            t1, v1 = self._times[i], self._values[i]
+            if t >= t1 or self._count == 1:     # Usual case: a read after the last poll
+                if self._count == 1:
+                    return v1
+                j = (self._head - 2) % self.size
+                t0, v0 = self._times[j], self._values[j]
+                if t1 <= t0:
+                    return v1
+                return v1 + (v1 - v0) / (t1 - t0) * min(t - t1, horizon)
+            times, values = self._ordered()
+        k = bisect.bisect_right(times, t)
+        if k == 0:
+            return values[0]
+        t0, t1 = times[k - 1], times[k]
+        return values[k - 1] + (values[k] - values[k - 1]) * (t - t0) / (t1 - t0)
+
+class MotorPoller:
+    """Background sampler of the axis positions for the property reads
+
+    A coroutine (see :py:meth:`run`) reads the encoder and the shaft status
+    of every motor through the shared :py:class:`~motor_control.MKSBus`, and
+    stores the positions in one :py:class:`SampleRing` per axis. The Alpaca
+    properties read :py:meth:`position` from memory, interpolated at the
+    time of the request, and never wait for the bus.
+
+    The poll interval follows the mount state given by ``state()``:
+    ``slewing`` while the mount is commanded to move or an axis turns faster
+    than ``moving_rate``, ``parked`` when parked, ``tracking`` otherwise.
+    The encoder counts go through a 48-bit :py:class:`~microsteps.WrappingCounter`
+    and stay integers, converted to angles by ``scale`` only when read.
+    A failed poll (no port, no reply) keeps the samples, which go stale
+    after twice the ``parked`` interval. After ``MAX_FAILURES`` failures in
+    a row the poller only retries at the ``parked`` interval.
+
+    Args:
+        motors: Axis name ('RA', 'DEC') to motor
+        logger: Device logger
+        scale: Encoder counts per axis turn (gear ratio included)
+        size: Samples kept per axis
+        intervals: [s] Poll interval per state, 'slewing', 'tracking' and 'parked'
+        moving_rate: [°/s] Axis speed above which the axis is moving (slewing)
+        state: Mount state, one of the intervals keys
+    """
+    MAX_FAILURES = 3
+
+    def __init__(self, motors: dict[str, AsyncMKSMotor], logger: Logger, scale: AxisScale,
+                 size: int, intervals: dict[str, float], moving_rate: float, state: Callable[[], str]):
+        self.motors = motors
+        self.logger = logger
+        self.scale = scale
+        self.counts_per_degree = scale.counts_per_turn / 360
+        self.rings: dict[str, SampleRing] = {name: SampleRing(size) for name in motors}
+        self.counters: dict[str, WrappingCounter] = {name: WrappingCounter(48) for name in motors}
+        self.shaft_status: dict[str, ShaftStatus | None] = {name: None for name in motors}
+        self.intervals = intervals
+        self.moving_rate = moving_rate
+        self.state = state
+        self.interval = intervals['parked']
+        self.polls = 0
+        self.failures = 0
+        self._failures_in_row = 0
+
+    def counts(self, axis: str, t: float) -> float | None:
+        """Encoder counts from the zero at monotonic time t
+
+        None without a sample, or when the newest one is older than twice
+        the longest poll interval (the poller is not running).
+        """
+        ring = self.rings[axis]
+        latest = ring.latest()
+        if latest is None or t - latest[0] > 2 * self.intervals['parked']:
+            return None
+        return ring.at(t, self.interval)
+
+    def zeroed(self, axis: str):
+        """Forget the samples of axis after its encoder zero was set"""
+        self.counters[axis].reset()
+        self.rings[axis].clear()
+
+    def position(self, axis: str, t: float) -> float | None:
+        """Axis angle [°] from the encoder zero at monotonic time t, see counts"""
+        counts = self.counts(axis, t)
+        return None if counts is None else self.scale.degrees(counts)
+
+    def moving(self) -> bool:
+        """True when an axis turns faster than moving_rate"""
+        limit = self.moving_rate * self.counts_per_degree
+        return any(abs(ring.velocity()) > limit for ring in self.rings.values())
+
+    def next_interval(self) -> float:
+        if self._failures_in_row >= self.MAX_FAILURES:
+            return self.intervals['parked']
+        state = self.state()
+        if state == 'slewing' or self.moving():
+            return self.intervals['slewing']
+        return self.intervals.get(state, self.intervals['tracking'])
+
+    async def _sample(self, axis: str, motor: AsyncMKSMotor):
+        t0 = time.monotonic()
+        counts = await motor.read_encoder_value()
+        t = (t0 + time.monotonic()) / 2                 # Middle of the exchange
+        status = await motor.read_shaft_status()
+        self.rings[axis].append(t, self.counters[axis].update(counts))
+        if status == ShaftStatus.BLOCKED and self.shaft_status[axis] != ShaftStatus.BLOCKED:
+            self.logger.warning(f'[Motor poller] {axis} shaft blocked')
+        self.shaft_status[axis] = status
+
+    async def poll(self):
+        """Sample every axis once, concurrently"""
+        try:
+            await asyncio.gather(*(self._sample(axis, motor) for axis, motor in self.motors.items()))
+        except (IOError, ValueError) as ex:
+            self.failures += 1
+            self._failures_in_row += 1
+            if self._failures_in_row == self.MAX_FAILURES:
+                self.logger.warning(f'[Motor poller] Motors not answering, positions from the last sync: {ex}')
+            return
+        self.polls += 1
+        if self._failures_in_row >= self.MAX_FAILURES:
+            self.logger.info('[Motor poller] Motors answering again')
+        self._failures_in_row = 0
+
+    async def run(self):
+        """Poll until cancelled, at the interval of the mount state"""
+        while True:
+            started = time.monotonic()
+            await self.poll()
+            self.interval = self.next_interval()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
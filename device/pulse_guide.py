@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import threading
+import time
+from fractions import Fraction
+from logging import Logger
+from typing import Callable
+
+from rate_mixer import RateMixer
+from telescope_enum import GuideDirections
+
+class DeadlineScheduler:
+    """Calls functions at monotonic deadlines, from one thread
+
+    The thread sleeps on a condition until ``spin`` seconds before the next
+    deadline, then busy-waits the rest, so the calls are not subject to the
+    millisecond rounding of the event loop timers nor to the tasks running
+    on the loop (only to the GIL). Deadlines are absolute, late calls do not
+    shift the next ones.
+
+    Args:
+        spin: [s] Busy-wait before each deadline (0 to only sleep)
+    """
+    def __init__(self, spin: float = 0.0005):
+        self.spin = spin
+        self._heap: list[tuple[float, int, Callable[[], None]]] = []
+        self._cancelled: set[int] = set()
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = False
+        self.calls = 0
+        self.late_max = 0.0                     # [s] Worst delay of a call after its deadline
+        self.thread = threading.Thread(target=self._run, name='DeadlineScheduler', daemon=True)
+        self.thread.start()
+
+    def schedule(self, deadline: float, fn: Callable[[], None]) -> int:
+        """Call fn() at time.monotonic() deadline, return an id for :py:meth:`cancel`"""
+        with self._cond:
+            entry = next(self._ids)
+            heapq.heappush(self._heap, (deadline, entry, fn))
+            self._cond.notify()
+        return entry
+
+    def cancel(self, entry: int):
+        with self._cond:
+            self._cancelled.add(entry)
+
+    def close(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop and (not self._heap or self._heap[0][0] - time.monotonic() > self.spin):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() - self.spin if self._heap else None)
+                if self._stop:
+                    return
+                deadline, entry, fn = heapq.heappop(self._heap)
+                if entry in self._cancelled:
+                    self._cancelled.discard(entry)
+                    continue
+            while time.monotonic() < deadline:
+                pass
+            self.late_max = max(self.late_max, time.monotonic() - deadline)
+            self.calls += 1
+            fn()
+
+class PulseGuider:
+    """PulseGuide: a guide rate added to the axis rate for the pulse duration
+
+    A pulse sets the ``guide`` source of the :py:class:`~rate_mixer.RateMixer`
+    of its axis to the guide rate, from the instant of the call, and back
+    to 0 at the end, called by a :py:class:`DeadlineScheduler`. The rate
+    synthesizer counts both changes at these exact instants, so the guide
+    correction does not depend on the loop or the bus timing, and adds up
+    with tracking and the rate offsets. RA (East/West) and Dec
+    (North/South) pulses run at once; a new pulse on a busy axis replaces
+    the one running.
+
+    Args:
+        mixers: Axis name ('RA', 'DEC') to its rate mixer
+        guide_code: Guide rate code of an axis (unsigned)
+        scheduler: Ends the pulses
+        logger: Device logger
+        on_change: Called when a pulse starts or ends (DeviceState cache)
+        dec_sign: Sign of the Dec axis moving North, -1 after a meridian flip
+    """
+    AXES = {GuideDirections.guideNorth: ('DEC', 1), GuideDirections.guideSouth: ('DEC', -1),
+            GuideDirections.guideEast: ('RA', -1), GuideDirections.guideWest: ('RA', 1)}
+
+    def __init__(self, mixers: dict[str, RateMixer], guide_code: Callable[[str], Fraction],
+                 scheduler: DeadlineScheduler, logger: Logger, on_change: Callable[[], None] = lambda: None,
+                 dec_sign: Callable[[], int] = lambda: 1):
+        self.mixers = mixers
+        self.guide_code = guide_code
+        self.scheduler = scheduler
+        self.logger = logger
+        self.on_change = on_change
+        self.dec_sign = dec_sign
+        self._lock = threading.Lock()
+        self._pulses: dict[str, tuple[float, int]] = {}    # Axis to (end, scheduler id)
+        self.pulses = 0
+
+    def pulse(self, direction: GuideDirections, duration_ms: int, start: float | None = None) -> float:
+        """Start a pulse now (or at the monotonic time start), return its end"""
+        axis, sign = self.AXES[GuideDirections(direction)]
+        if axis == 'DEC':
+            sign *= self.dec_sign()
+        start = time.monotonic() if start is None else start
+        end = start + duration_ms / 1000
+        with self._lock:
+            running = self._pulses.pop(axis, None)
+            if running is not None:
+                self.scheduler.cancel(running[1])
+            self.mixers[axis].set('guide', sign * self.guide_code(axis), start)
+            entry = self.scheduler.schedule(end, lambda: self._end(axis, end))
+            self._pulses[axis] = (end, entry)
+            self.pulses += 1
+        self.on_change()
+        self.logger.debug(f'[PulseGuide] {GuideDirections(direction).name} {duration_ms} ms')
+        return end
+
+    def _end(self, axis: str, end: float):
+        with self._lock:
+            if self._pulses.get(axis, (None,))[0] != end:
+                return                          # Replaced or cancelled
+            del self._pulses[axis]
+            self.mixers[axis].set('guide', 0, end)
+        self.on_change()
+
+    def guiding(self, now: float | None = None) -> bool:
+        """True until the end of the last pulse, to the clock tick"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return any(now < end for end, _ in self._pulses.values())
+
+    def cancel(self, axis: str | None = None):
+        """End the running pulses (of one axis) now"""
+        names = [axis] if axis is not None else list(self.mixers)
+        now = time.monotonic()
+        cancelled = False
+        with self._lock:
+            for name in names:
+                running = self._pulses.pop(name, None)
+                if running is not None:
+                    self.scheduler.cancel(running[1])
+                    self.mixers[name].set('guide', 0, now)
+                    cancelled = True
+        if cancelled:
+            self.on_change()
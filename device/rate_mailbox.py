@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from logging import Logger
+from typing import Callable, Coroutine
+
+class RateMailbox:
+    """Latest-value-wins mailbox for the MoveAxis rate of one axis
+
+    Handsets send a burst of MoveAxis calls while a button is held. Each call
+    only posts its rate (:py:meth:`post`). One drain coroutine at a time, queued
+    on the axis lane, sends the newest posted rate to the motor, then the
+    rate posted meanwhile, and so on. A rate replaced before it was sent is
+    counted as merged. When the drain is cancelled or dropped from the queue
+    (AbortSlew), the rate waiting to be sent is dropped.
+
+    Args:
+        axis: Axis name, for the log
+        apply: Coroutine function sending a rate [°/s] to the motor
+        schedule: Queues the drain coroutine function on the axis lane
+        logger: Device logger
+    """
+    def __init__(self, axis: str, apply: Callable[[float], Coroutine], schedule: Callable[[Callable], None],
+                 logger: Logger):
+        self.axis = axis
+        self._apply = apply
+        self._schedule = schedule
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._pending: tuple[float, float] | None = None    # (rate, monotonic time posted)
+        self._active = False                    # A drain is queued or running
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self._posted = 0
+            self._sent = 0
+            self._merged = 0
+            self._dropped = 0
+            self._failed = 0
+            self._latency_sum = 0.0
+            self._latency_max = 0.0
+
+    def stats(self) -> dict:
+        """Rates posted, sent, merged (replaced before sending), dropped
+        (AbortSlew), failed (bus error), and latency_* [s] from the post of
+        a sent rate to the motor acknowledging it.
+        """
+        with self._lock:
+            n = max(self._sent, 1)
+            return {'posted': self._posted, 'sent': self._sent, 'merged': self._merged,
+                    'dropped': self._dropped, 'failed': self._failed,
+                    'latency_mean': self._latency_sum / n, 'latency_max': self._latency_max}
+
+    def post(self, rate: float):
+        """Set the rate to send next, from any thread but the loop's"""
+        with self._lock:
+            self._posted += 1
+            if self._pending is not None:
+                self._merged += 1
+            self._pending = (rate, time.monotonic())
+            start = not self._active
+            self._active = True
+        if start:
+            drain = self._drain_task()
+            self._schedule(drain)
+
+    def _drain_task(self) -> Callable[..., Coroutine]:
+        async def drain():
+            await self.drain()
+        drain.on_drop = self._drop              # Called if an EMERGENCY task drops it from the queue
+        return drain
+
+    def _drop(self):
+        with self._lock:
+            if self._pending is not None:
+                self._dropped += 1
+            self._pending = None
+            self._active = False
+
+    async def drain(self):
+        """Send the posted rates until none is left"""
+        try:
+            while True:
+                with self._lock:
+                    if self._pending is None:
+                        self._active = False
+                        return
+                    rate, posted_at = self._pending
+                    self._pending = None
+                try:
+                    await self._apply(rate)
+                except IOError as ex:
+                    self.logger.error(f'[MoveAxis] {self.axis} rate {rate} not sent: {ex}')
+                    with self._lock:
+                        self._failed += 1
+                    continue
+                latency = time.monotonic() - posted_at
+                with self._lock:
+                    self._sent += 1
+                    self._latency_sum += latency
+                    self._latency_max = max(self._latency_max, latency)
+        except asyncio.CancelledError:
+            self._drop()
+            raise
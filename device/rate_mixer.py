@@ -0,0 +1,60 @@
+import threading
+from fractions import Fraction
+
+from rate_synth import RateSynthesizer
+
+class RateMixer:
+    """Speed of one axis: the sum of its rate contributions
+
+    Each source sets its own signed speed code (:py:func:`rate_synth.rate_code`)
+    from a monotonic instant: ``tracking`` (drive rate and its correction),
+    ``guide`` (the running pulse), ``offset`` (RightAscensionRate,
+    DeclinationRate), ``pec`` (periodic error correction) and ``slew`` (the
+    velocity profile of a slew). The codes are exact and the conversion is
+    linear, so the sum of the codes is the code of the summed rates,
+    converted once, without rounding. The sum goes to the
+    :py:class:`~rate_synth.RateSynthesizer` of the axis only when it
+    changes, and the synthesizer sends 0xF6 only when the integer code of a
+    slot changes: a source set again to the same value, or a change taken
+    up by the dither, costs no bus command.
+
+    Args:
+        synth: Rate synthesizer of the axis
+    """
+    SOURCES = ('tracking', 'guide', 'offset', 'pec', 'slew')
+
+    def __init__(self, synth: RateSynthesizer):
+        self.synth = synth
+        self.codes: dict[str, Fraction] = dict.fromkeys(self.SOURCES, Fraction(0))
+        self.updates = 0                        # set() calls
+        self.changes = 0                        # Sums sent to the synthesizer
+        self._total: Fraction | None = Fraction(0)     # Last sum sent, None after release()
+        self._lock = threading.Lock()
+
+    def set(self, source: str, code: Fraction | float, at: float | None = None):
+        """Set the code of source from the monotonic instant at (now by default)"""
+        if source not in self.codes:
+            raise ValueError(f'Unknown rate source {source}, not one of {self.SOURCES}')
+        with self._lock:
+            self.updates += 1
+            self.codes[source] = Fraction(code)
+            total = sum(self.codes.values())
+            if total == self._total:
+                return
+            self._total = total
+            self.changes += 1
+            self.synth.set_code(total, at)
+
+    def code(self, source: str | None = None) -> Fraction:
+        """Code of a source, or the sum"""
+        with self._lock:
+            return self.codes[source] if source is not None else sum(self.codes.values())
+
+    def release(self):
+        """Give the motor up to another command, see :py:meth:`rate_synth.RateSynthesizer.release`
+
+        The next :py:meth:`set` sends the sum, changed or not.
+        """
+        with self._lock:
+            self._total = None
+            self.synth.release()
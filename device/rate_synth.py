@@ -0,0 +1,225 @@
+import asyncio
+import math
+import threading
+import time
+from fractions import Fraction
+from typing import Callable
+
+from telescope_enum import DriveRates
+
+SIDEREAL_DAY = Fraction('86164.0905')   # [s] Mean sidereal day
+# Axis rates of the DriveRates ["/s], as given by ASCOM
+DRIVE_RATES: dict[DriveRates, Fraction] = {
+    DriveRates.driveSidereal:   Fraction(1296000) / SIDEREAL_DAY,      # 15.0410686
+    DriveRates.driveLunar:      Fraction('14.685'),
+    DriveRates.driveSolar:      Fraction(15),
+    DriveRates.driveKing:       Fraction('15.0369'),
+}
+PULSES_PER_CODE = 500   # [pulses/s] per unit of the 7-bit speed of 0xF6 (speed x 30000 / (Mstep x 200) rpm)
+MAX_CODE = 0x7F
+
+def rate_code(arcsec_per_s: Fraction, gear_ratio: int, mstep: int, motor_type: float) -> Fraction:
+    """Exact, fractional 0xF6 speed code turning an axis at arcsec_per_s
+
+    Args:
+        arcsec_per_s: Axis rate ["/s]
+        gear_ratio: Motor turns per axis turn
+        mstep: Microstepping of the driver
+        motor_type: Full step angle [°], 1.8 or 0.9
+    """
+    pulses_per_s = Fraction(arcsec_per_s) * gear_ratio * mstep / (3600 * Fraction(str(motor_type)))
+    return pulses_per_s / PULSES_PER_CODE
+
+def drive_rate_table(gear_ratio: int, mstep: int, motor_type: float) -> dict[DriveRates, Fraction]:
+    """Speed code of each DriveRates, see :py:func:`rate_code`"""
+    return {rate: rate_code(value, gear_ratio, mstep, motor_type) for rate, value in DRIVE_RATES.items()}
+
+class SpeedDither:
+    """Integer speed codes, one per time slot, averaging a fractional code
+
+    Each slot gets one of the two codes around the target, chosen by error
+    feedback: the running sum of the codes never differs from the running
+    sum of the target by half a code or more. The target is a Fraction, so
+    the average is exact and the error does not grow with time. Codes are
+    signed, negative for the reverse direction.
+
+    Args:
+        code: Target code (Fraction or float), clamped to -MAX_CODE...MAX_CODE
+    """
+    def __init__(self, code: Fraction | float):
+        self.error = Fraction(0)                # Sum of target - sum of codes [code x slot]
+        self.retarget(code)
+
+    def retarget(self, code: Fraction | float):
+        """Change the target, keeping the error owed so far"""
+        self.code = min(max(Fraction(code), Fraction(-MAX_CODE)), Fraction(MAX_CODE))
+        self.lo = math.floor(self.code)
+        self.hi = min(self.lo + 1, MAX_CODE)
+
+    @property
+    def duty(self) -> Fraction:
+        """Share of the slots at the high code"""
+        return self.code - self.lo
+
+    def next(self) -> int:
+        owed = self.error + self.code
+        code = self.hi if owed - self.lo >= Fraction(1, 2) else self.lo
+        self.error = owed - code
+        return code
+
+    def late(self, previous: int, code: int, slots: float):
+        """A change from previous to code took effect slots late: credit the difference
+
+        The late part of the slot ran at the previous code, later slots make
+        up for it, so delivery delays do not add up to a drift.
+        """
+        self.error -= (previous - code) * round_fraction(slots)
+
+def round_fraction(x: float) -> Fraction:
+    """x (seconds, slots) rounded to the millionth, as a Fraction with a small denominator"""
+    return Fraction(round(x * 1e6), 1000000)
+
+class RateSynthesizer:
+    """Turns a motor at a fractional speed code by dithering 0xF6 commands
+
+    A :py:class:`SpeedDither` picks the code of each ``slot`` seconds. The
+    slots follow absolute deadlines on the loop's monotonic clock, so late
+    wake-ups do not accumulate. The change is taken to happen midway
+    between sending the command and its reply, and its delay from the slot
+    start is credited back to the dither. A command is only sent when the code
+    changes (twice per cycle of the two codes). Between the sidereal codes
+    0 and 1 the axis leads or lags by up to 500 x slot pulses, so the slot
+    is kept short: 0.01 s is 5 pulses (10" at r=100, Mstep=32).
+
+    Run as a service (:py:meth:`run`), and steered from any thread by
+    :py:meth:`set_code`. A change takes effect at the monotonic instant
+    given, not when the loop gets to it: the part of the running slot after
+    that instant is re-counted at the new code. With a zero target and the
+    motor stopped, the synthesizer sleeps and sends nothing.
+
+    Args:
+        motor: The :py:class:`~motor_control.AsyncMKSMotor` to drive
+        slot: [s] Time step of the schedule
+    """
+    def __init__(self, motor, slot: float = 0.01):
+        self.motor = motor
+        self.slot = slot
+        self.commands = 0
+        self.failures = 0                       # Commands lost on the bus, retried next slot
+        self.late_max = 0.0                     # [s] Worst wake-up delay after a deadline
+        self.code = Fraction(0)                 # Target, as last set
+        self._lock = threading.Lock()
+        self._change: tuple[Fraction, float, bool] | None = None     # (code, at, release)
+        self._integral = Fraction(0)            # [code x s] Targets integrated up to _since
+        self._since: float | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        # trace(event, code, monotonic time): 'change' taken by the loop, 'command' sent; for the benchmarks
+        self.trace: Callable[[str, Fraction | int, float], None] | None = None
+
+    def set_code(self, code: Fraction | float, at: float | None = None):
+        """Turn at code (signed) from the monotonic instant at (now by default)"""
+        self._set(Fraction(code), at, False)
+
+    def release(self):
+        """Give the motor up to another command (MoveAxis, slew, stop)
+
+        The target becomes 0 but nothing is sent, the owed fraction of a
+        pulse is dropped and the next :py:meth:`set_code` sends its code
+        whatever the motor was doing.
+        """
+        self._set(Fraction(0), None, True)
+
+    def _set(self, code: Fraction, at: float | None, release: bool):
+        at = time.monotonic() if at is None else at
+        with self._lock:
+            if self._since is not None:
+                self._integral += self.code * round_fraction(at - self._since)
+            self._since = at
+            self.code = code
+            self._change = (code, at, release)
+            loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            loop.call_soon_threadsafe(wake.set)
+
+    def integral(self, t: float) -> Fraction:
+        """[code x s] Targets integrated up to the monotonic time t (after the last change)
+
+        Times the motor pulses per code, the position the axis should have
+        moved by since the first :py:meth:`set_code`, whatever the dither
+        and the bus did.
+        """
+        with self._lock:
+            if self._since is None:
+                return Fraction(0)
+            return self._integral + self.code * round_fraction(t - self._since)
+
+    def _take_change(self) -> tuple[Fraction, float, bool] | None:
+        with self._lock:
+            change, self._change = self._change, None
+            return change
+
+    async def _send(self, code: int) -> float:
+        """Send code, return the monotonic time it is taken to apply"""
+        sent = time.monotonic()
+        if self.trace is not None:
+            self.trace('command', code, sent)
+        await self.motor.set_speed_code(abs(code), code < 0)
+        self.commands += 1
+        return (sent + time.monotonic()) / 2
+
+    async def run(self, code: Fraction | float = 0):
+        """Drive the motor until cancelled (the caller stops the motor)"""
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            if self._change is None and code:
+                self.code = Fraction(code)
+                self._since = time.monotonic()
+                self._change = (self.code, self._since, False)
+        dither = SpeedDither(self.code)
+        current: int | None = None
+        start, slot = time.monotonic(), 0
+        try:
+            while True:
+                change = self._take_change()
+                if change is not None:
+                    target, at, release = change
+                    if self.trace is not None:
+                        self.trace('change', target, time.monotonic())
+                    if release:
+                        dither = SpeedDither(target)
+                        current = None              # Unknown: the next code is sent
+                    elif current is not None and slot:
+                        # The running slot only lasted until at: re-count the rest
+                        elapsed = min(max((at - (start + (slot - 1) * self.slot)) / self.slot, 0.0), 1.0)
+                        dither.error -= (dither.code - current) * round_fraction(1 - elapsed)
+                    dither.retarget(target)
+                    start, slot = at, 0
+                if dither.code == 0 and current in (None, 0) and abs(dither.error) < Fraction(1, 2):
+                    self._wake.clear()
+                    if self._change is None:        # Idle: nothing to send until the next change
+                        await self._wake.wait()
+                    continue
+                value = dither.next()
+                if value != current:
+                    try:
+                        applied = await self._send(value)
+                    except IOError:
+                        self.failures += 1          # The motor kept the previous code this slot
+                        dither.error += value - (current or 0)
+                    else:
+                        if current is not None:
+                            dither.late(current, value, (applied - start) / self.slot - slot)
+                        current = value
+                slot += 1
+                deadline = start + slot * self.slot
+                self._wake.clear()
+                if self._change is None:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), max(0.0, deadline - time.monotonic()))
+                    except asyncio.TimeoutError:
+                        self.late_max = max(self.late_max, time.monotonic() - deadline)
+        finally:
+            with self._lock:
+                self._loop = self._wake = None
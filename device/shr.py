@@ -70,12 +70,14 @@ from logging import Logger
 
 logger: Logger
 #logger = None                   # Safe on Python 3.7 but no intellisense in VSCode etc.
+sampler = None                    # log.EndpointSampler, None logs every request
 
 _bad_title: str = 'Bad Alpaca Request'
 
-def set_shr_logger(lgr):
-    global logger
+def set_shr_logger(lgr, smp = None):
+    global logger, sampler
     logger = lgr
+    sampler = smp
 
 # --------------------------
 # Alpaca Device/Server Info
@@ -109,6 +111,63 @@ def to_bool(str: str) -> bool:
         raise HTTPBadRequest(title=_bad_title, description=f'Bad boolean value "{val}"')
     return val == _bools[0]
 
+# ---------------------------------------------------------
+# Parsed request parameters, built once per request. Holds
+# the query string (GET) or body "form" data (PUT) in two
+# indexes: exact names and lowercased names (first one wins,
+# like the former linear scans).
+# ---------------------------------------------------------
+class RequestParams():
+    """Per-request index of the Alpaca parameters/fields"""
+    def __init__(self, req: Request):
+        """Initialize a ``RequestParams`` object.
+
+        Args:
+            req: The Falcon Request. For a PUT this reads the body form data.
+        """
+        self.is_get: bool = req.method == 'GET'
+        if self.is_get:
+            fields = req.params
+        else:                                   # Assume PUT since we never route other methods
+            fields = req.get_media()
+        self.exact: dict = dict(fields)
+        self.caseless: dict = {}
+        for fn, val in fields.items():
+            self.caseless.setdefault(fn.lower(), val)
+
+    def get(self, name: str, caseless: bool = False, default: str|None = None) -> str:
+        """Look up a field following the Alpaca casing rules
+
+        GET query parameters are always caseless. PUT form fields are caseless
+        only on request (ClientID and ClientTransactionID), otherwise the name
+        must match exactly and the value must not be empty. If default is None
+        the field is required, raise a 400 BAD REQUEST when it is missing.
+        """
+        if self.is_get:
+            val = self.caseless.get(name.lower())
+            if val is not None:
+                return str(val)
+        elif caseless:
+            val = self.caseless.get(name.lower())
+            if val is not None:
+                return val
+        else:
+            val = self.exact.get(name)
+            if val is not None and val != '':
+                return val
+        if default == None:
+            raise HTTPBadRequest(title=_bad_title,
+                                 description=f'Missing, empty, or misspelled parameter "{name}"')    # Missing or incorrect casing
+        return default
+
+def request_params(req: Request) -> RequestParams:
+    """The RequestParams of this request, parsed on first use and kept in ``req.context``"""
+    params = getattr(req.context, 'alpaca_params', None)
+    if params is None:
+        params = RequestParams(req)
+        req.context.alpaca_params = params
+    return params
+
 # ---------------------------------------------------------
 # Get parameter/field from query string or body "form" data
 # If default is missing then the field is required. Maybe the
@@ -117,40 +176,36 @@ def to_bool(str: str) -> bool:
 # caseless (mostly for the ClientID and ClientTransactionID)
 # ---------------------------------------------------------
 def get_request_field(name: str, req: Request, caseless: bool = False, default: str|None = None) -> str:
-    bad_desc = f'Missing, empty, or misspelled parameter "{name}"'
-    lcName = name.lower()
-    if req.method == 'GET':
-        for param in req.params.items():        # [name,value] tuples
-            if param[0].lower() == lcName:
-                return str(param[1])
-        if default == None:
-            raise HTTPBadRequest(title=_bad_title, description=bad_desc)                # Missing or incorrect casing
-        return default                          # not in args, return default
-    else:                                       # Assume PUT since we never route other methods
-        formdata = req.get_media()
-        if caseless:
-            for fn in formdata.keys():
-                if fn.lower() == lcName:
-                    return formdata[fn]
-        else:
-            if name in formdata and formdata[name] != '':
-                return formdata[name]
-        if default == None:
-            raise HTTPBadRequest(title=_bad_title, description=bad_desc)                # Missing or incorrect casing
-        return default
+    return request_params(req).get(name, caseless, default)
 
 #
 # Log the request as soon as the resource handler gets it so subsequent
-# logged messages are in the right order. Logs PUT body as well.
+# logged messages are in the right order. Logs PUT body as well. With a
+# sampler, polled endpoints are logged only now and then; the decision is
+# kept in req.context so the response line follows the request line. force
+# logs a request the sampler skipped (a bad request).
 #
-def log_request(req: Request):
+def log_request(req: Request, force: bool = False):
+    skipped = 0
+    if force:
+        req.context.alpaca_logged = True
+    elif sampler is not None:
+        req.context.alpaca_logged, skipped = sampler.sample(req.remote_addr, req.path)
+        if not req.context.alpaca_logged:
+            return
     msg = f'{req.remote_addr} -> {req.method} {req.path}'
     if req.query_string != '':
         msg += f'?{req.query_string}'
+    if skipped:
+        msg += f' (+{skipped} not logged)'
     logger.info(msg)
     if req.method == 'PUT' and req.content_length != 0:
         logger.info(f'{req.remote_addr} -> {req.media}')
 
+def log_response(req: Request, value):
+    if req.context.get('alpaca_logged', True):
+        logger.info(f'{req.remote_addr} <- {str(value)}')
+
 # ------------------------------------------------
 # Incoming Pre-Logging and Request Quality Control
 # ------------------------------------------------
@@ -187,21 +242,17 @@ class PreProcessRequest():
     def _check_request(self, req: Request, devnum: int):  # Raise on failure
         if devnum > self.maxdev:
             msg = f'Device number {str(devnum)} does not exist. Maximum device number is {self.maxdev}.'
-            logger.error(msg)
             raise HTTPBadRequest(title=_bad_title, description=msg)
         test: str|list[str] = get_request_field('ClientID', req, True)        # Caseless
         if test is None:
             msg = 'Request has missing Alpaca ClientID value'
-            logger.error(msg)
             raise HTTPBadRequest(title=_bad_title, description=msg)
         if not self._pos_or_zero(test):
             msg = f'Request has bad Alpaca ClientID value {test}'
-            logger.error(msg)
             raise HTTPBadRequest(title=_bad_title, description=msg)
         test_2: str = get_request_field('ClientTransactionID', req, True)
         if not self._pos_or_zero(test_2):
             msg = f'Request has bad Alpaca ClientTransactionID value {test_2}'
-            logger.error(msg)
             raise HTTPBadRequest(title=_bad_title, description=msg)
 
     #
@@ -209,8 +260,15 @@ class PreProcessRequest():
     # and format converter. This is the device number from the URI
     #
     def __call__(self, req: Request, resp: Response, resource, params):
-        log_request(req)                            # Log even a bad request
-        self._check_request(req, params['devnum'])   # Raises to 400 error on check failure
+        log_request(req)                            # Sampled: a bad request is logged below anyway
+        try:
+            request_params(req)                     # Parse the fields once for the whole request
+            self._check_request(req, params['devnum'])   # Raises to 400 error on check failure
+        except HTTPBadRequest as ex:
+            if not req.context.get('alpaca_logged', True):
+                log_request(req, force=True)
+            logger.error(ex.description)
+            raise
 
 # ------------------
 # PropertyResponse
@@ -234,7 +292,7 @@ class PropertyResponse():
         self.ClientTransactionID = int(get_request_field('ClientTransactionID', req, False, "0"))  #Caseless on GET
         if err.Number == 0 and not value is None:
             self.Value = value
-            logger.info(f'{req.remote_addr} <- {str(value)}')
+            log_response(req, value)
         self.ErrorNumber: int = err.Number
         self.ErrorMessage: str = err.Message
 
@@ -245,6 +303,40 @@ class PropertyResponse():
         # https://stackoverflow.com/questions/3768895/how-to-make-a-class-json-serializable
         return json.dumps(self, default=lambda o: o.__dict__)
 
+# ----------------------
+# StaticPropertyResponse
+# ----------------------
+class StaticPropertyResponse():
+    """Precompiled JSON response for a property that never changes after startup
+
+    The JSON body is serialized once, into a byte template where only the
+    ServerTransactionID and ClientTransactionID remain to be filled in. The
+    bytes are identical to those of ``PropertyResponse(value, req).json``.
+    """
+    def __init__(self, value):
+        """Initialize a ``StaticPropertyResponse`` object.
+
+        Args:
+            value:  The constant value of the property. Anything
+                :py:class:`PropertyResponse` can serialize.
+        """
+        self.value = value
+        body = json.dumps({'ServerTransactionID': 0, 'ClientTransactionID': 0, 'Value': value,
+                           'ErrorNumber': 0, 'ErrorMessage': ''}, default=lambda o: o.__dict__)
+        tail = body[body.index(', "Value": '):]
+        self._template: bytes = ('{"ServerTransactionID": %d, "ClientTransactionID": %d'
+                                 + tail.replace('%', '%%')).encode()
+
+    def send(self, req: Request, resp: Response):
+        """Fill in the transaction IDs and write the body to the Falcon response
+
+        Notes:
+            * Bumps the ServerTransactionID value and returns it in sequence
+        """
+        client_trans_id = int(get_request_field('ClientTransactionID', req, False, "0"))
+        resp.data = self._template % (getNextTransId(), client_trans_id)
+        log_response(req, self.value)
+
 # --------------
 # MethodResponse
 # --------------
@@ -268,7 +360,7 @@ class MethodResponse():
         self.ClientTransactionID = int(get_request_field('ClientTransactionID', req, False, "0"))
         if err.Number == 0 and not value is None:
             self.Value = value
-            logger.info(f'{req.remote_addr} <- {str(value)}')
+            log_response(req, value)
         self.ErrorNumber = err.Number
         self.ErrorMessage = err.Message
 
@@ -0,0 +1,264 @@
+import bisect
+import math
+
+import numpy as np
+
+from telescope_enum import PierSide
+
+SIDEREAL_RATE = 360 / 86164.0905               # [°/s] Hour angle change of a fixed RA
+
+class AxisProfile:
+    """Rest-to-rest move of one axis, acceleration and jerk limited
+
+    An S-curve (jerk given) has seven phases: jerk up, constant
+    acceleration, jerk down, cruise, and the same backwards; the constant
+    acceleration or the cruise may last 0. A trapezoid (jerk None) has
+    three: acceleration, cruise, deceleration. The profile is built for a
+    peak velocity, see :py:meth:`fastest` and :py:meth:`timed`.
+
+    Args:
+        distance: [°] Signed move
+        peak: [°/s] Velocity at the end of the acceleration (> 0 to move)
+        accel: [°/s²] Max acceleration
+        jerk: [°/s³] Max jerk, None for a trapezoid
+    """
+    def __init__(self, distance: float, peak: float, accel: float, jerk: float | None = None):
+        self.distance = distance
+        self.peak = peak
+        self.accel = accel
+        self.jerk = jerk
+        d = abs(distance)
+        ramp = self._ramp(peak, accel, jerk) if d > 0 and peak > 0 else []
+        t_ramp = sum(duration for duration, _, _ in ramp)
+        cruise = max(0.0, d / peak - t_ramp) if ramp else 0.0      # The ramps cover peak x t_ramp
+        # Deceleration: the ramp backwards in time, accelerations negated
+        down = [(duration, -(a0 + j * duration), j) for duration, a0, j in reversed(ramp)]
+        phases = ramp + ([(cruise, 0.0, 0.0)] if cruise > 0 else []) + down
+        sign = math.copysign(1.0, distance)
+        self._starts: list[float] = []
+        self._segments: list[tuple[float, float, float, float]] = []     # (x0, v0, a0, j), signed
+        t = x = v = 0.0
+        for duration, a0, j in phases:
+            self._starts.append(t)
+            self._segments.append((x, v, sign * a0, sign * j))
+            x, v = self._advance(x, v, sign * a0, sign * j, duration)
+            t += duration
+        self.duration = t
+
+    @staticmethod
+    def _ramp(peak: float, accel: float, jerk: float | None) -> list[tuple[float, float, float]]:
+        """(duration, acceleration at start, jerk) phases from rest to peak"""
+        if jerk is None:
+            return [(peak / accel, accel, 0.0)]
+        if peak >= accel * accel / jerk:        # Reaches accel
+            t_jerk = accel / jerk
+            return [(t_jerk, 0.0, jerk), (peak / accel - t_jerk, accel, 0.0), (t_jerk, accel, -jerk)]
+        t_jerk = math.sqrt(peak / jerk)
+        return [(t_jerk, 0.0, jerk), (t_jerk, jerk * t_jerk, -jerk)]
+
+    @staticmethod
+    def _advance(x: float, v: float, a: float, j: float, dt: float) -> tuple[float, float]:
+        return x + v * dt + a * dt * dt / 2 + j * dt ** 3 / 6, v + a * dt + j * dt * dt / 2
+
+    @staticmethod
+    def ramp_time(peak: float, accel: float, jerk: float | None) -> float:
+        """[s] From rest to peak (the ramp covers peak x ramp_time / 2 degrees)"""
+        if jerk is None:
+            return peak / accel
+        return peak / accel + accel / jerk if peak >= accel * accel / jerk else 2 * math.sqrt(peak / jerk)
+
+    @staticmethod
+    def reachable_peak(distance: float, accel: float, jerk: float | None) -> float:
+        """[°/s] Highest peak velocity of a move without cruise"""
+        d = abs(distance)
+        if jerk is None:
+            return math.sqrt(accel * d)
+        peak = (d * d * jerk / 4) ** (1 / 3)    # Without the constant acceleration phase
+        if peak <= accel * accel / jerk:
+            return peak
+        b = accel * accel / jerk                # peak² + b peak - accel d = 0
+        return (-b + math.sqrt(b * b + 4 * accel * d)) / 2
+
+    @classmethod
+    def move_time(cls, distance: float, peak: float, accel: float, jerk: float | None) -> float:
+        """[s] Duration of a move at a peak velocity (not above the reachable one)"""
+        d = abs(distance)
+        if d == 0:
+            return 0.0
+        t_ramp = cls.ramp_time(peak, accel, jerk)
+        return t_ramp + d / peak               # 2 ramps + cruise (d - peak x t_ramp) / peak
+
+    @classmethod
+    def fastest(cls, distance: float, v_max: float, accel: float, jerk: float | None = None) -> 'AxisProfile':
+        return cls(distance, min(v_max, cls.reachable_peak(distance, accel, jerk)), accel, jerk)
+
+    @classmethod
+    def timed(cls, distance: float, duration: float, v_max: float, accel: float,
+              jerk: float | None = None) -> 'AxisProfile':
+        """The move lasting duration, at the lowest peak velocity (the fastest if it is longer)"""
+        fastest = cls.fastest(distance, v_max, accel, jerk)
+        d = abs(distance)
+        if d == 0 or duration <= fastest.duration:
+            return fastest
+        if jerk is None:                        # duration = peak / accel + d / peak
+            peak = (accel * duration - math.sqrt(max(0.0, (accel * duration) ** 2 - 4 * accel * d))) / 2
+        else:                                   # move_time decreases with the peak
+            lo, hi = d / duration, fastest.peak
+            for _ in range(48):
+                peak = (lo + hi) / 2
+                if cls.move_time(d, peak, accel, jerk) > duration:
+                    lo = peak
+                else:
+                    hi = peak
+            peak = hi
+        return cls(distance, peak, accel, jerk)
+
+    @staticmethod
+    def fastest_times(distance: np.ndarray, v_max: float, accel: float, jerk: float | None = None) -> np.ndarray:
+        """[s] Durations of the :py:meth:`fastest` moves of an array of distances [°]"""
+        d = np.abs(distance)
+        if jerk is None:
+            peak = np.minimum(v_max, np.sqrt(accel * d))
+            ramp = peak / accel
+        else:
+            b = accel * accel / jerk
+            peak = np.cbrt(d * d * jerk / 4)
+            peak = np.where(peak <= b, peak, (-b + np.sqrt(b * b + 4 * accel * d)) / 2)
+            peak = np.minimum(v_max, peak)
+            ramp = np.where(peak >= b, peak / accel + accel / jerk, 2 * np.sqrt(peak / jerk))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(d > 0, ramp + d / peak, 0.0)
+
+    def _segment(self, t: float) -> tuple[float, tuple[float, float, float, float]]:
+        i = max(0, bisect.bisect_right(self._starts, t) - 1)
+        return t - self._starts[i], self._segments[i]
+
+    def position(self, t: float) -> float:
+        """[°] From the start, at t [s] after the start"""
+        if not self._segments or t >= self.duration:
+            return self.distance
+        if t <= 0:
+            return 0.0
+        dt, (x, v, a, j) = self._segment(t)
+        return self._advance(x, v, a, j, dt)[0]
+
+    def velocity(self, t: float) -> float:
+        """[°/s] At t [s] after the start"""
+        if not self._segments or t <= 0 or t >= self.duration:
+            return 0.0
+        dt, (x, v, a, j) = self._segment(t)
+        return self._advance(x, v, a, j, dt)[1]
+
+class SlewPlan:
+    """Result of :py:meth:`SlewPlanner.plan`
+
+    Attributes:
+        duration: [s] Both axes arrive at the end
+        profiles: Axis name ('RA', 'DEC') to its profile; the RA axis turns the hour angle [°]
+        targets: Axis name to its angle at the arrival [°]
+        pier_side: Side of pier at the arrival
+        iterations: Arrival time estimates made
+        residual: ["] Sky motion between the last two estimates, the landing error
+    """
+    def __init__(self, duration: float, profiles: dict[str, AxisProfile], targets: dict[str, float],
+                 pier_side: PierSide, iterations: int, residual: float):
+        self.duration = duration
+        self.profiles = profiles
+        self.targets = targets
+        self.pier_side = pier_side
+        self.iterations = iterations
+        self.residual = residual
+
+class SlewPlanner:
+    """Coordinated, acceleration limited slews of a German equatorial mount
+
+    The axes are the hour angle axis (0 at the meridian, counterweight
+    down) and the Dec axis, past ±90° on the other side of the pier, as
+    read by the device. A target within ``flip_hour_angle`` of the meridian
+    is reached on the east side of the pier (axes = hour angle, Dec),
+    farther ones after a meridian flip (hour angle ± 180°, ±180° - Dec), so
+    the hour angle axis stays within ±90°.
+
+    The hour angle of the target grows at the sidereal rate during the slew:
+    the arrival time is estimated again from the target at the last
+    estimate until it moves the target by less than ``tolerance``. The
+    slower axis sets the duration and the other one moves at the lowest
+    peak velocity arriving at the same time.
+
+    Args:
+        max_rate: [°/s] Max axis velocity
+        accel: [°/s²] Max axis acceleration
+        jerk: [°/s³] Max axis jerk, 0 or None for trapezoidal profiles
+        flip_hour_angle: [h] Farthest hour angle reached without a meridian flip
+        tolerance: ["] Landing error of the arrival time estimate
+        iterations: Max estimates
+    """
+    def __init__(self, max_rate: float, accel: float, jerk: float | None = None, flip_hour_angle: float = 6.0,
+                 tolerance: float = 0.01, iterations: int = 8):
+        self.max_rate = max_rate
+        self.accel = accel
+        self.jerk = jerk or None
+        self.flip_hour_angle = flip_hour_angle
+        self.tolerance = tolerance
+        self.iterations = iterations
+
+    def pier_side(self, hour_angle: float) -> PierSide:
+        """Side of pier pointing at hour_angle [h]"""
+        ha = (hour_angle + 12) % 24 - 12
+        return PierSide.pierEast if abs(ha) <= self.flip_hour_angle else PierSide.pierWest
+
+    @staticmethod
+    def axes(hour_angle: float, dec: float, pier_side: PierSide) -> tuple[float, float]:
+        """Axis angles [°] pointing at hour_angle [h] and dec [°] from pier_side"""
+        ha = ((hour_angle + 12) % 24 - 12) * 15
+        if pier_side == PierSide.pierEast:
+            return ha, dec
+        return ha - math.copysign(180, ha), math.copysign(180, dec) - dec
+
+    @staticmethod
+    def axes_array(hour_angle: np.ndarray, dec: np.ndarray,
+                   east: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """:py:meth:`axes` of arrays, east: True east of the pier"""
+        ha = ((hour_angle + 12) % 24 - 12) * 15
+        return (np.where(east, ha, ha - np.copysign(180, ha)),
+                np.where(east, dec, np.copysign(180, dec) - dec))
+
+    def durations(self, ha_axis: float, dec_axis: float, ra: np.ndarray, dec: np.ndarray,
+                  lst: float) -> tuple[np.ndarray, np.ndarray]:
+        """Durations [s] and sides of pier (PierSide values) of the :py:meth:`plan` of many targets
+
+        The iterations of :py:meth:`plan` on arrays, all targets at once,
+        without building the profiles: the duration of a slew is the one of
+        the slower axis.
+        """
+        hour_angle = lst - np.asarray(ra, dtype=float)
+        dec = np.asarray(dec, dtype=float)
+        east = np.abs((hour_angle + 12) % 24 - 12) <= self.flip_hour_angle
+        duration = np.zeros_like(hour_angle)
+        for _ in range(self.iterations):
+            target_ha, target_dec = self.axes_array(hour_angle + SIDEREAL_RATE * duration / 15, dec, east)
+            estimate = np.maximum(AxisProfile.fastest_times(target_ha - ha_axis, self.max_rate, self.accel, self.jerk),
+                                  AxisProfile.fastest_times(target_dec - dec_axis, self.max_rate, self.accel, self.jerk))
+            residual = np.abs(estimate - duration) * SIDEREAL_RATE * 3600
+            duration = estimate
+            if not (residual > self.tolerance).any():
+                break
+        return duration, np.where(east, PierSide.pierEast.value, PierSide.pierWest.value)
+
+    def plan(self, ha_axis: float, dec_axis: float, ra: float, dec: float, lst: float) -> SlewPlan:
+        """Slew from the axis angles ha_axis, dec_axis [°] to ra [h], dec [°], starting at the sidereal time lst [h]"""
+        hour_angle = lst - ra
+        side = self.pier_side(hour_angle)
+        duration, residual, iterations = 0.0, math.inf, 0
+        while iterations < self.iterations and residual > self.tolerance:
+            iterations += 1
+            target_ha, target_dec = self.axes(hour_angle + SIDEREAL_RATE * duration / 15, dec, side)
+            estimate = max(AxisProfile.fastest(target_ha - ha_axis, self.max_rate, self.accel, self.jerk).duration,
+                           AxisProfile.fastest(target_dec - dec_axis, self.max_rate, self.accel, self.jerk).duration)
+            residual = abs(estimate - duration) * SIDEREAL_RATE * 3600
+            duration = estimate
+        target_ha, target_dec = self.axes(hour_angle + SIDEREAL_RATE * duration / 15, dec, side)
+        profiles = {'RA': AxisProfile.timed(target_ha - ha_axis, duration, self.max_rate, self.accel, self.jerk),
+                    'DEC': AxisProfile.timed(target_dec - dec_axis, duration, self.max_rate, self.accel, self.jerk)}
+        duration = max(profile.duration for profile in profiles.values())
+        return SlewPlan(duration, profiles, {'RA': target_ha, 'DEC': target_dec}, side, iterations, residual)
@@ -14,7 +14,7 @@
 from falcon import Request, Response, HTTPBadRequest, before
 from logging import Logger
 from shr import PropertyResponse, MethodResponse, PreProcessRequest, \
-    StateValue, get_request_field, to_bool
+    StateValue, StaticPropertyResponse, get_request_field, to_bool
 from exceptions import *        # Nothing but exception classes
 from telescopedevice import TelescopeDevice
 from telescope_enum import *
@@ -52,14 +52,35 @@ class TelescopeMetadata:
     InterfaceVersion = 4  # ITelescopeV4 (Platform 7)
 
 
+# Precompiled responses for the metadata properties
+metadata_responses: dict[str, StaticPropertyResponse] = {
+    'Description': StaticPropertyResponse(TelescopeMetadata.Description),
+    'Info': StaticPropertyResponse(TelescopeMetadata.Info),
+    'InterfaceVersion': StaticPropertyResponse(TelescopeMetadata.InterfaceVersion),
+    'Version': StaticPropertyResponse(TelescopeMetadata.Version),
+    'Name': StaticPropertyResponse(TelescopeMetadata.Name),
+    'SupportedActions': StaticPropertyResponse(TelescopeDevice.SUPPORTED_ACTIONS),
+}
+
+# TelescopeDevice properties fixed by config.toml, never changed after startup
+STATIC_PROPERTIES = [
+    'ApertureArea', 'ApertureDiameter', 'FocalLength', 'TrackingRates',
+    'CanFindHome', 'CanPark', 'CanPulseGuide', 'CanSetDECRate', 'CanSetGuiderates',
+    'CanSetPark', 'CanSetPierside', 'CanSetRaRate', 'CanSetTracking', 'CanSlew',
+    'CanSlewAltAz', 'CanSlewAltAzAsync', 'CanSlewAsync', 'CanSync', 'CanSyncAltAz',
+    'CanUnpark',
+]
+
 tel_dev: TelescopeDevice
+static_responses: dict[str, StaticPropertyResponse]
 # At app init not import :-)
 
 
 def start_tel_device(logger: Logger):
     logger = logger
-    global tel_dev
+    global tel_dev, static_responses
     tel_dev = TelescopeDevice(logger)
+    static_responses = {prop: StaticPropertyResponse(getattr(tel_dev, prop)) for prop in STATIC_PROPERTIES}
     return tel_dev
 
 
@@ -71,7 +92,26 @@ def start_tel_device(logger: Logger):
 @before(PreProcessRequest(maxdev))
 class action:
     def on_put(self, req: Request, resp: Response, devnum: int):
-        resp.text = MethodResponse(req, NotImplementedException()).json
+        if not tel_dev.connected:
+            resp.text = PropertyResponse(None, req,
+                                         NotConnectedException()).json
+            return
+
+        actionname: str = get_request_field('Action', req)
+        # Raises 400 bad request if missing
+        if actionname is None or actionname == "":
+            resp.text = MethodResponse(req,
+                                       DriverException(0x400, 'Missing Action field in request.')).json
+            return
+        parameters: str = get_request_field('Parameters', req, False, "")
+        try:
+            result = tel_dev.Action(actionname, parameters)
+            resp.text = MethodResponse(req, value=result).json
+        except (ActionNotImplementedException, InvalidValueException) as ex:
+            resp.text = MethodResponse(req, ex).json
+        except Exception as ex:
+            resp.text = MethodResponse(req,
+                                       DriverException(0x500, 'Telescope.Action failed', ex)).json
 
 
 @before(PreProcessRequest(maxdev))
@@ -162,7 +202,7 @@ class disconnect:
 @before(PreProcessRequest(maxdev))
 class description:
     def on_get(self, req: Request, resp: Response, devnum: int):
-        resp.text = PropertyResponse(TelescopeMetadata.Description, req).json
+        metadata_responses['Description'].send(req, resp)
 
 
 @before(PreProcessRequest(maxdev))
@@ -175,19 +215,8 @@ class devicestate:
             return
         try:
             # ----------------------
-            val = []
-            val.append(StateValue('AtPark', tel_dev.AtPark))
-            val.append(StateValue('AtHome', tel_dev.AtHome))
-            val.append(StateValue('Declination', tel_dev.DEC))
-            val.append(StateValue('IsPulseGuiding', tel_dev.PulseGuiding))
-            val.append(StateValue('RightAscension', tel_dev.RA))
-            val.append(StateValue('SiderealTime', tel_dev.SiderealTime))
-            val.append(StateValue('SideOfPier', tel_dev.SideOfPier))
-            val.append(StateValue('Slewing', tel_dev.Slewing))
-            val.append(StateValue('Tracking', tel_dev.Tracking))
-            val.append(StateValue('UTCDate', tel_dev.UTCDate))
-            val.append(StateValue('Altitude', tel_dev.Altitude))
-            val.append(StateValue('Azimuth', tel_dev.Azimuth))
+            # One coherent snapshot, shared by concurrent requests
+            val = [StateValue(name, value) for name, value in tel_dev.DeviceState]
             # ----------------------
             resp.text = PropertyResponse(val, req).json
         except Exception as ex:
@@ -198,33 +227,32 @@ class devicestate:
 @before(PreProcessRequest(maxdev))
 class driverinfo:
     def on_get(self, req: Request, resp: Response, devnum: int):
-        resp.text = PropertyResponse(TelescopeMetadata.Info, req).json
+        metadata_responses['Info'].send(req, resp)
 
 
 @before(PreProcessRequest(maxdev))
 class interfaceversion:
     def on_get(self, req: Request, resp: Response, devnum: int):
-        resp.text = PropertyResponse(
-            TelescopeMetadata.InterfaceVersion, req).json
+        metadata_responses['InterfaceVersion'].send(req, resp)
 
 
 @before(PreProcessRequest(maxdev))
 class driverversion():
     def on_get(self, req: Request, resp: Response, devnum: int):
-        resp.text = PropertyResponse(TelescopeMetadata.Version, req).json
+        metadata_responses['Version'].send(req, resp)
 
 
 @before(PreProcessRequest(maxdev))
 class name():
     def on_get(self, req: Request, resp: Response, devnum: int):
-        resp.text = PropertyResponse(TelescopeMetadata.Name, req).json
+        metadata_responses['Name'].send(req, resp)
 
 
-@before(PreProcessRequest(maxdev)) # NOTE : No additional actions implemented
+@before(PreProcessRequest(maxdev))
 class supportedactions:
     def on_get(self, req: Request, resp: Response, devnum: int):
         # Not PropertyNotImplemented
-        resp.text = PropertyResponse([], req).json
+        metadata_responses['SupportedActions'].send(req, resp)
 
 
 @before(PreProcessRequest(maxdev))
@@ -293,14 +321,9 @@ class aperturearea:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: float = tel_dev.ApertureArea
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Aperturearea failed', ex)).json
+        # ----------------------
+        static_responses['ApertureArea'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -312,14 +335,9 @@ class aperturediameter:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: float = tel_dev.ApertureArea
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Aperturediameter failed', ex)).json
+        # ----------------------
+        static_responses['ApertureDiameter'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -419,14 +437,9 @@ class canfindhome:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanFindHome
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canfindhome failed', ex)).json
+        # ----------------------
+        static_responses['CanFindHome'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -470,14 +483,9 @@ class canpark:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanPark
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canpark failed', ex)).json
+        # ----------------------
+        static_responses['CanPark'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -489,14 +497,9 @@ class canpulseguide:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanPulseGuide
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canpulseguide failed', ex)).json
+        # ----------------------
+        static_responses['CanPulseGuide'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -508,14 +511,9 @@ class cansetdeclinationrate:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetDECRate
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansetdeclinationrate failed', ex)).json
+        # ----------------------
+        static_responses['CanSetDECRate'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -527,14 +525,9 @@ class cansetguiderates:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetGuiderates
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansetguiderates failed', ex)).json
+        # ----------------------
+        static_responses['CanSetGuiderates'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -546,14 +539,9 @@ class cansetpark:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetPark
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansetpark failed', ex)).json
+        # ----------------------
+        static_responses['CanSetPark'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -565,14 +553,9 @@ class cansetpierside:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetPierside
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansetpierside failed', ex)).json
+        # ----------------------
+        static_responses['CanSetPierside'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -584,14 +567,9 @@ class cansetrightascensionrate:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetRaRate
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansetrightascensionrate failed', ex)).json
+        # ----------------------
+        static_responses['CanSetRaRate'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -603,14 +581,9 @@ class cansettracking:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSetTracking
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansettracking failed', ex)).json
+        # ----------------------
+        static_responses['CanSetTracking'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -622,14 +595,9 @@ class canslew:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSlew
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canslew failed', ex)).json
+        # ----------------------
+        static_responses['CanSlew'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -641,14 +609,9 @@ class canslewaltaz:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSlewAltAz
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canslewaltaz failed', ex)).json
+        # ----------------------
+        static_responses['CanSlewAltAz'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -660,14 +623,9 @@ class canslewaltazasync:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSlewAltAzAsync
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canslewaltazasync failed', ex)).json
+        # ----------------------
+        static_responses['CanSlewAltAzAsync'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -679,14 +637,9 @@ class canslewasync:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSlewAsync
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canslewasync failed', ex)).json
+        # ----------------------
+        static_responses['CanSlewAsync'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -698,14 +651,9 @@ class cansync:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSync
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansync failed', ex)).json
+        # ----------------------
+        static_responses['CanSync'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -717,14 +665,9 @@ class cansyncaltaz:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanSyncAltAz
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Cansyncaltaz failed', ex)).json
+        # ----------------------
+        static_responses['CanSyncAltAz'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -736,14 +679,9 @@ class canunpark:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: bool = tel_dev.CanUnpark
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Canunpark failed', ex)).json
+        # ----------------------
+        static_responses['CanUnpark'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -973,14 +911,9 @@ class focallength:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: float = tel_dev.FocalLength
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Focallength failed', ex)).json
+        # ----------------------
+        static_responses['FocalLength'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev))
@@ -1021,11 +954,11 @@ class guideratedeclination:
                                        InvalidValueException(f'GuideRateDeclination {guideratedeclinationstr} not a valid number.')).json
             return
         # RANGE CHECK AS NEEDED ###  # Raise Alpaca InvalidValueException with details!
-        max_rate = tel_dev.AxisRates["Maximum"]
-        min_rate = tel_dev.AxisRates["Minimum"]
-        if not min_rate <= guideratedeclination <= max_rate:
+        max_rate = tel_dev.MaxGuideRate
+        if not 0 < guideratedeclination <= max_rate:
             resp.text = MethodResponse(req,
-                                       InvalidValueException(f'GuideRateDeclination {guideratedeclination} is outside the range [{min_rate}, {max_rate}°/s].')).json
+                                       InvalidValueException(f'GuideRateDeclination {guideratedeclination} is outside the range ]0, {max_rate:g}°/s].')).json
+            return
         try:
             # -----------------------------
             if not tel_dev.CanPulseGuide:
@@ -1082,11 +1015,11 @@ class guideraterightascension:
                                        InvalidValueException(f'GuideRateRightAscension {guideraterightascensionstr} not a valid number.')).json
             return
         # RANGE CHECK AS NEEDED ###  # Raise Alpaca InvalidValueException with details!
-        max_rate = tel_dev.AxisRates["Maximum"]
-        min_rate = tel_dev.AxisRates["Minimum"]
-        if not min_rate <= guideraterightascension <= max_rate:
+        max_rate = tel_dev.MaxGuideRate
+        if not 0 < guideraterightascension <= max_rate:
             resp.text = MethodResponse(req,
-                                       InvalidValueException(f'GuideRateRightAscension {guideraterightascension} is outside the range [{min_rate}, {max_rate}°/s].')).json
+                                       InvalidValueException(f'GuideRateRightAscension {guideraterightascension} is outside the range ]0, {max_rate:g}°/s].')).json
+            return
         try:
             # -----------------------------
             if not tel_dev.CanPulseGuide:
@@ -1223,7 +1156,7 @@ class park:
                                        DriverException(0x500, 'Telescope.Park failed', ex)).json
 
 
-@before(PreProcessRequest(maxdev))  # TODO : Guiding not implemented | Yet: returns NotImplementedException
+@before(PreProcessRequest(maxdev))
 class pulseguide:
 
     def on_put(self, req: Request, resp: Response, devnum: int):
@@ -1232,42 +1165,60 @@ class pulseguide:
                                          NotConnectedException()).json
             return
 
-        # NOTE: Not implemented yet
-        resp.text = MethodResponse(req, NotImplementedException()).json
-        return
+        directionstr: str = get_request_field('Direction', req)
+        # Raises 400 bad request if missing
+        if directionstr is None or directionstr == "":
+            resp.text = MethodResponse(req,
+                                       DriverException(0x400, 'Missing Direction field in request.')).json
+            return
+        try:
+            direction = int(directionstr)
+        except:
+            resp.text = MethodResponse(req,
+                                       InvalidValueException(f'Direction {directionstr} not a valid integer.')).json
+            return
+        if not direction in [e.value for e in GuideDirections]:
+            resp.text = MethodResponse(req,
+                                       InvalidValueException(f'Direction {direction} not a valid enum value. Valid directions are : {[e.value for e in GuideDirections]}')).json
+            return
 
-        # # Raises 400 bad request if missing
-        # directionstr = get_request_field('Direction', req)
-        # try:
-        #     direction = int(directionstr)
-        # except:
-        #     resp.text = MethodResponse(req,
-        #                                InvalidValueException(f'Direction {directionstr} not a valid integer.')).json
-        #     return
-        # if not direction in [0, 1, 2, 3]:
-        #     resp.text = MethodResponse(req,
-        #                                InvalidValueException(f'Direction {direction} not a valid enum value.')).json
-        #     return
+        durationstr: str = get_request_field('Duration', req)
+        # Raises 400 bad request if missing
+        if durationstr is None or durationstr == "":
+            resp.text = MethodResponse(req,
+                                       DriverException(0x400, 'Missing Duration field in request.')).json
+            return
+        try:
+            duration = int(durationstr)
+        except:
+            resp.text = MethodResponse(req,
+                                       InvalidValueException(f'Duration {durationstr} not a valid integer.')).json
+            return
+        if duration < 0:
+            resp.text = MethodResponse(req,
+                                       InvalidValueException(f'Duration {duration} must be >= 0 ms.')).json
+            return
 
-        # # Raises 400 bad request if missing
-        # durationstr = get_request_field('Duration', req)
-        # try:
-        #     duration = int(durationstr)
-        # except:
-        #     resp.text = MethodResponse(req,
-        #                                InvalidValueException(f'Duration {durationstr} not a valid integer.')).json
-        #     return
-        # # RANGE CHECK AS NEEDED ###  # Raise Alpaca InvalidValueException with details!
-        # try:
-        #     # -----------------------------
-        #     ### DEVICE OPERATION(PARAM) ###
-        #     resp.text = MethodResponse(req,
-        #                                NotImplementedError(0x500, "Guiding not implemented")).json
-        #     # -----------------------------
-        #     # resp.text = MethodResponse(req).json
-        # except Exception as ex:
-        #     resp.text = MethodResponse(req,
-        #                                DriverException(0x500, 'Telescope.Pulseguide failed', ex)).json
+        if not tel_dev.CanPulseGuide:
+            resp.text = MethodResponse(req, NotImplementedException("Can't pulse guide on this device")).json
+            return
+        if tel_dev.AtPark:
+            resp.text = MethodResponse(req,
+                                       ParkedException("Can't pulse guide while parked")).json
+            return
+        if tel_dev.Slewing:
+            resp.text = MethodResponse(req,
+                                       InvalidOperationException("Can't pulse guide while slewing")).json
+            return
+
+        try:
+            # -----------------------------
+            tel_dev.PulseGuide(GuideDirections(direction), duration)
+            resp.text = MethodResponse(req).json
+            # -----------------------------
+        except Exception as ex:
+            resp.text = MethodResponse(req,
+                                       DriverException(0x500, 'Telescope.Pulseguide failed', ex)).json
 
 
 @before(PreProcessRequest(maxdev))
@@ -2253,14 +2204,9 @@ class trackingrates:
                                          NotConnectedException()).json
             return
 
-        try:
-            # ----------------------
-            val: list[DriveRates] = tel_dev.TrackingRates
-            # ----------------------
-            resp.text = PropertyResponse(val, req).json
-        except Exception as ex:
-            resp.text = PropertyResponse(None, req,
-                                         DriverException(0x500, 'Telescope.Trackingrates failed', ex)).json
+        # ----------------------
+        static_responses['TrackingRates'].send(req, resp)
+        # ----------------------
 
 
 @before(PreProcessRequest(maxdev)) # TODO : format utc date correctly and verify format
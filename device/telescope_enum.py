@@ -37,3 +37,9 @@ class TelescopeAxes(IntEnum):
     axisPrimary     = 0
     axisSecondary   = 1
     axisTertiary    = 2
+
+class TaskPriority(IntEnum):       # AsyncTaskManager scheduling classes, lower runs first
+    EMERGENCY       = 0
+    GUIDING         = 1
+    SLEW            = 2
+    HOUSEKEEPING    = 3
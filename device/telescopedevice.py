@@ -4,65 +4,286 @@ from serial import protocol_handler_packages
 from telescope_enum import *
 from utilities import *
 from logging import Logger
-from motor_control import MKSMotor
+from motor_control import AsyncMKSMotor, MKSBus, MKSTransport
+from motor_poller import MotorPoller
+from homing import AxisHoming, HomingError, HomingState, SimulatedAxisHoming, make_home_sensor
+from rate_mailbox import RateMailbox
+from rate_synth import DRIVE_RATES, MAX_CODE, RateSynthesizer, drive_rate_table, rate_code, round_fraction
+from rate_mixer import RateMixer
+from pulse_guide import DeadlineScheduler, PulseGuider
+from tracking import TrackingLoop
+from slew_planner import SlewPlan, SlewPlanner
+from microsteps import AxisScale
 from config import Config
+from exceptions import ActionNotImplementedException, InvalidValueException
 from datetime import datetime
 import asyncio
-from astropy.time import Time as astropyTime
+import json
+import math
+import numpy as np
+from fractions import Fraction
 from typing import Callable, Coroutine, Any
 import threading
+import time
+
+class _TaskLane:
+    """One priority queue and its worker, see :py:class:`AsyncTaskManager`"""
+    def __init__(self, manager: 'AsyncTaskManager', name: str):
+        self.manager = manager
+        self.name = name
+        self.logger = manager.logger
+        self.tasks = asyncio.PriorityQueue()
+        self._current = None                    # (entry, asyncio.Task) being run
+
+    async def worker(self):
+        while self.manager.running:
+            try:
+                entry = await self.tasks.get()
+                if entry[3] is None:
+                    break
+                await self.run_task(entry)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in {self.name} worker: {e}")
+
+    async def run_task(self, entry: tuple):
+        priority, seq, name, task, queued_at = entry
+        started = time.monotonic()
+        running = asyncio.get_running_loop().create_task(task())
+        self._current = (entry, running)
+        outcome = 'done'
+        try:
+            await asyncio.wait((running,))
+            if running.cancelled():
+                outcome = 'cancelled'
+            elif running.exception() is not None:
+                outcome = 'failed'
+                self.logger.error(f"Error executing task {name}: {running.exception()}")
+        finally:
+            self._current = None
+            self.manager._record(name, outcome, started - queued_at, time.monotonic() - started)
+            self.tasks.task_done()
+
+    def submit(self, entry: tuple):
+        """Queue an entry, preempting lower-priority work (runs on the loop)"""
+        priority, name = entry[0], entry[2]
+        if priority == TaskPriority.EMERGENCY:
+            self._drop_queued((TaskPriority.GUIDING, TaskPriority.SLEW))
+        current = self._current
+        if current is not None and current[0][0] > priority:
+            cur_entry, running = current
+            if priority == TaskPriority.EMERGENCY or cur_entry[0] == TaskPriority.HOUSEKEEPING:
+                self.logger.info(f"Task {name} preempts {cur_entry[2]}")
+                running.cancel()
+                if cur_entry[0] == TaskPriority.HOUSEKEEPING and priority != TaskPriority.EMERGENCY:
+                    self.tasks.put_nowait((cur_entry[0], self.manager._next_seq(), cur_entry[2], cur_entry[3],
+                                           time.monotonic()))
+        self.tasks.put_nowait(entry)
+
+    def _drop_queued(self, priorities: tuple):
+        kept = []
+        while not self.tasks.empty():
+            entry = self.tasks.get_nowait()
+            self.tasks.task_done()
+            if entry[0] in priorities:
+                self.logger.info(f"Task {entry[2]} dropped from the queue")
+                done = getattr(entry[3], 'done', None)
+                if done is not None and not done.done():
+                    done.set_result(False)
+                on_drop = getattr(entry[3], 'on_drop', None)
+                if on_drop is not None:
+                    on_drop()
+                self.manager._record(entry[2], 'cancelled', time.monotonic() - entry[4], 0.0)
+            else:
+                kept.append(entry)
+        for entry in kept:
+            self.tasks.put_nowait(entry)
+
+    def cancel_current(self):
+        current = self._current
+        if current is not None:
+            current[1].cancel()
+
 
 class AsyncTaskManager:
+    """Priority scheduler running the device coroutines on a private event loop
+
+    Work is split in lanes sharing the loop: one per mount axis (``RA``,
+    ``DEC``) and ``main`` for the rest. Lanes run concurrently, so RA and DEC
+    motions overlap. Within a lane, tasks are queued with a
+    :py:class:`~telescope_enum.TaskPriority` and run one at a time, highest
+    priority (lowest value) first, FIFO within a class. A task submitted
+    while a lower-priority one is running in its lane preempts it as follows:
+
+    * EMERGENCY cancels the running task and drops the queued GUIDING and
+      SLEW tasks (the motions the emergency stops).
+    * Any other class only preempts a running HOUSEKEEPING task, which is
+      cancelled and queued again to restart from the beginning.
+
+    Two-axis operations (slews, park...) go through :py:meth:`add_axes_task`,
+    which runs one part per axis lane and calls a completion coroutine once
+    they all finished. Queue-wait and run times are recorded per task name,
+    see :py:meth:`stats`.
+    """
+    LANES = ('main', 'RA', 'DEC')
+
     def __init__(self, logger: Logger):
-        self.tasks = asyncio.Queue()
         self.running = True
         self.loop = asyncio.new_event_loop()
         self.thread = threading.Thread(target=self._run_loop, name="AsyncTaskManagerThread", daemon=True)
         self.logger = logger
+        self.lanes: dict[str, _TaskLane] = {name: _TaskLane(self, name) for name in self.LANES}
+        self._seq = 0                           # FIFO order within a priority class
+        self.services: list[asyncio.Task] = []
+        self._stats: dict[str, dict] = {}
+        self._stats_lock = threading.Lock()
 
     def _run_loop(self):
         asyncio.set_event_loop(self.loop)
-        self.worker_task = self.loop.create_task(self.worker())
+        self.worker_tasks = [self.loop.create_task(lane.worker()) for lane in self.lanes.values()]
         try:
             self.loop.run_forever()
         finally:
             self.loop.close()
 
-    async def worker(self):
-        while self.running:
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _record(self, name: str, outcome: str, wait: float, run: float):
+        with self._stats_lock:
+            st = self._stats.get(name)
+            if st is None:
+                st = self._stats[name] = {'count': 0, 'cancelled': 0, 'failed': 0,
+                                          'wait_total': 0.0, 'wait_max': 0.0,
+                                          'run_total': 0.0, 'run_max': 0.0}
+            st['count'] += 1
+            if outcome != 'done':
+                st[outcome] += 1
+            st['wait_total'] += wait
+            st['wait_max'] = max(st['wait_max'], wait)
+            st['run_total'] += run
+            st['run_max'] = max(st['run_max'], run)
+
+    def stats(self) -> dict[str, dict]:
+        """Per task name: count, cancelled, failed, mean/max queue wait and run time [s]"""
+        with self._stats_lock:
+            return {name: {'count': st['count'], 'cancelled': st['cancelled'], 'failed': st['failed'],
+                           'wait_mean': st['wait_total'] / st['count'], 'wait_max': st['wait_max'],
+                           'run_mean': st['run_total'] / st['count'], 'run_max': st['run_max']}
+                    for name, st in self._stats.items()}
+
+    async def _submit(self, lane: str, task: Callable[..., Coroutine], priority: TaskPriority, name: str):
+        self.lanes[lane].submit((int(priority), self._next_seq(), name, task, time.monotonic()))
+
+    async def _submit_axes(self, tasks: dict[str, Callable[..., Coroutine]], priority: TaskPriority, name: str,
+                           on_done: Callable[..., Coroutine] | None):
+        parts = []
+        for lane, task in tasks.items():
+            done = self.loop.create_future()
+            parts.append(done)
+            self.lanes[lane].submit((int(priority), self._next_seq(), f'{name} {lane}',
+                                     self._signalling(task, done), time.monotonic()))
+        if on_done is not None:
+            self.loop.create_task(self._join(parts, name, on_done))
+
+    @staticmethod
+    def _signalling(task: Callable[..., Coroutine], done: asyncio.Future) -> Callable[..., Coroutine]:
+        async def part():
             try:
-                task = await self.tasks.get()
-                if task is None:
-                    break
-                await self.run_task(task)
-            except asyncio.CancelledError:
-                break
+                await task()
+            except BaseException:
+                if not done.done():
+                    done.set_result(False)
+                raise
+            if not done.done():
+                done.set_result(True)
+        part.done = done                        # Lets _drop_queued release the join
+        return part
+
+    async def _join(self, parts: list, name: str, on_done: Callable[..., Coroutine]):
+        if all(await asyncio.gather(*parts)):
+            try:
+                await on_done()
             except Exception as e:
-                self.logger.error(f"Error in worker: {e}")
+                self.logger.error(f"Error completing task {name}: {e}")
+        else:
+            self.logger.info(f"Task {name} did not complete on all axes")
 
-    async def run_task(self, task: Callable[..., Coroutine]):
-        try:
-            await task()
-        except Exception as e:
-            self.logger.error(f"Error executing task: {e}")
-        finally:
-            self.tasks.task_done()
+    def add_task(self, task: Callable[..., Coroutine], priority: TaskPriority = TaskPriority.HOUSEKEEPING,
+                 name: str | None = None, lane: str = 'main'):
+        """Queue a coroutine function, preempting lower-priority work as needed
+
+        A task function with an ``on_drop`` attribute gets it called if the
+        task is dropped from the queue by an EMERGENCY task.
 
-    def add_task(self, task: Callable[..., Coroutine]):
-        future = asyncio.run_coroutine_threadsafe(self.tasks.put(task), self.loop)
+        Args:
+            task: Coroutine function (called without arguments when run)
+            priority: Scheduling class of the task
+            name: Key of the task in :py:meth:`stats`, defaults to the function name
+            lane: ``'main'``, ``'RA'`` or ``'DEC'``
+        """
+        name = name or getattr(task, '__name__', repr(task))
+        future = asyncio.run_coroutine_threadsafe(self._submit(lane, task, priority, name), self.loop)
         return future.result()  # Bloque jusqu'à ce que la tâche soit ajoutée
 
+    def add_axes_task(self, tasks: dict[str, Callable[..., Coroutine]], priority: TaskPriority, name: str,
+                      on_done: Callable[..., Coroutine] | None = None):
+        """Queue a two-axis operation, one coroutine function per axis lane
+
+        The parts are queued atomically (no other task can slip between them)
+        and run concurrently. ``on_done`` is awaited once every part finished
+        normally; it is skipped if one was cancelled (e.g. by AbortSlew) or failed.
+        Parts are reported in :py:meth:`stats` as ``'<name> <lane>'``.
+
+        Args:
+            tasks: Lane name (``'RA'``, ``'DEC'``) to coroutine function
+            priority: Scheduling class of every part
+            name: Name of the operation
+            on_done: Optional coroutine function run after all the parts
+        """
+        future = asyncio.run_coroutine_threadsafe(self._submit_axes(tasks, priority, name, on_done), self.loop)
+        return future.result()
+
+    def add_service(self, task: Callable[..., Coroutine], name: str):
+        """Run a long-lived coroutine function on the loop, outside the lanes
+
+        Services (the motor poller...) are not scheduled by priority nor
+        preempted; they run until cancelled by :py:meth:`stop_loop`.
+        """
+        self.loop.call_soon_threadsafe(self._start_service, task, name)
+
+    def _start_service(self, task: Callable[..., Coroutine], name: str):
+        service = self.loop.create_task(task(), name=name)
+        service.add_done_callback(self._service_done)
+        self.services.append(service)
+
+    def _service_done(self, service: asyncio.Task):
+        if not service.cancelled() and service.exception() is not None:
+            self.logger.error(f"Service {service.get_name()} stopped: {service.exception()}")
+
     def start(self):
         self.logger.info("Starting AsyncTaskManager thread")
         self.thread.start()
 
+    async def _shutdown(self):
+        for lane in self.lanes.values():
+            lane.cancel_current()
+        for worker in self.worker_tasks + self.services:
+            worker.cancel()
+        await asyncio.gather(*self.worker_tasks, *self.services, return_exceptions=True)
+        self.loop.stop()
+
     def stop_loop(self):
         self.running = False
-        self.loop.call_soon_threadsafe(self.loop.stop)
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
         self.thread.join(timeout=5.0)
 
 
 class TelescopeDevice:
+    SUPPORTED_ACTIONS = ['TrackingStats', 'SlewTimes']     # Action() names, see Action
+
     def __init__(self, logger:Logger):
         # Initialize telescope properties
         self.logger = logger
@@ -84,12 +305,7 @@ class TelescopeDevice:
         self.steps_rotation = 200 # steps per degree of the motor
         self.max_rpm: int = 10000 # maximum rotational speed in revolutions per minute
         self.microstepping = 32 # miccrostepping division factor
-        self._tracking_rates_values: dict[str, float] = {
-                                                        "driveSidereal"   : 15.041 , # ["/s]
-                                                        "driveLunar"      : 1,
-                                                        "driveSolar"      : 2,
-                                                        "driveKing"       : 3
-                                                            }
+        self._tracking_rates_values: dict[str, float] = {rate.name: float(value) for rate, value in DRIVE_RATES.items()} # ["/s]
         # --------------------------- Telescope parameters --------------------------- #
         # Example, adjust as needed
         self._alignment_mode: AlignmentModes = AlignmentModes(Config.alignment_mode)
@@ -134,25 +350,84 @@ class TelescopeDevice:
         self._side_of_pier: PierSide = PierSide.pierUnknown
 
         self._is_tracking: bool = False
-        self._is_pulse_guiding: bool = False
         self._is_moving: bool = False
         self._parked: bool = True
-        self._slewing: bool = False
+        # (hour angle axis [h], Dec axis [°], RA axis, DEC axis [encoder counts]) at the last sync, see _axes()
+        self._sync_ref: tuple[float, float, float, float] | None = None
 
         self._target_ra: float | None = None
         self._target_dec: float | None = None
-        self._RA_rate: float = 0.0 # ["/SI s]
+        self._RA_rate: float = 0.0 # [s of RA / sidereal s]
         self._DEC_rate: float = 0.0 # ["/SI s]
-        self._guide_RA_rate: float = 0.0
-        self._guide_DEC_rate: float = 0.0
+        self._guide_RA_rate: float = Config.guide_rate * float(DRIVE_RATES[DriveRates.driveSidereal]) / 3600 # [°/s]
+        self._guide_DEC_rate: float = self._guide_RA_rate
+        self._max_guide_rate: float = Config.max_guide_rate * float(DRIVE_RATES[DriveRates.driveSidereal]) / 3600 # [°/s]
         self._tracking_rate: DriveRates = DriveRates.driveSidereal
 
         self._utc_date: str = datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%fZ')[:-3] + 'Z'
         self._local_sidereal_time: float = 0.0
 
+        # (monotonic time, values) of the last DeviceState snapshot
+        self._state_snapshot: tuple[float, list[tuple[str, Any]]] | None = None
+        self._state_snapshot_lock = threading.Lock()
+        self._state_snapshot_ttl: float = Config.devicestate_ttl
+        self._state_generation = 0                  # Bumped by _invalidate_device_state()
+        self._state_generation_lock = threading.Lock()
+
         # ----------------------------------- Setup ---------------------------------- #
-        self._RA_motor = MKSMotor(is_RA_homed, "e0")
-        self._DEC_motor = MKSMotor(is_DEC_homed, "e1")
+        self._motor_bus = MKSBus(MKSTransport(Config.motors_port, Config.motors_baudrate, Config.motors_reply_timeout),
+                                 Config.motors_pipeline_depth)
+        self._RA_motor = AsyncMKSMotor(is_RA_homed, Config.ra_address, self._motor_bus)
+        self._DEC_motor = AsyncMKSMotor(is_DEC_homed, Config.dec_address, self._motor_bus)
+        # Exact (Fraction) RA speed code of each DriveRates, dithered by rate_synth.RateSynthesizer
+        self._drive_rate_codes = drive_rate_table(self.r, self._RA_motor.Mstep, self._RA_motor.motor_type)
+        # Fractional axis rates (tracking, guiding) dithered on each motor
+        self._rate_synths = {'RA': RateSynthesizer(self._RA_motor, Config.rate_slot),
+                             'DEC': RateSynthesizer(self._DEC_motor, Config.rate_slot)}
+        for axis, synth in self._rate_synths.items():
+            self.task_manager.add_service(synth.run, f'RateSynthesizer {axis}')
+        # Tracking, guiding, RA/DEC rate offsets summed per axis, see rate_mixer.RateMixer
+        self._rate_mixers = {axis: RateMixer(synth) for axis, synth in self._rate_synths.items()}
+        self._guide_codes = {'RA': self._axis_code(self._guide_RA_rate), 'DEC': self._axis_code(self._guide_DEC_rate)}
+        self._guide_scheduler = DeadlineScheduler(Config.guide_spin)
+        self._guider = PulseGuider(self._rate_mixers, self._guide_codes.__getitem__, self._guide_scheduler, logger,
+                                   self._invalidate_device_state, self._dec_sign)
+        # Coordinated slews, at most the axis_rates maximum and the top speed code
+        self._slew_planner = SlewPlanner(min(Config.axis_rates[1] / 3600, float(MAX_CODE / self._axis_code(1.0))),
+                                         Config.slew_acceleration, Config.slew_jerk, Config.slew_flip_hour_angle,
+                                         Config.slew_tolerance, Config.slew_iterations)
+        # Axis positions are integer counts, converted exactly (microsteps.AxisScale)
+        self._encoder_scale = AxisScale(65536 * self.r)
+        self._step_scale = AxisScale.from_drive(self.steps_rotation, self.r, self.microstepping)
+        # Tracking: the RA drive rate, corrected from the encoder
+        self._tracking = TrackingLoop(self._rate_synths['RA'], self._RA_motor, self._encoder_scale,
+                                      lambda code, at: self._rate_mixers['RA'].set('tracking', code, at), logger,
+                                      Config.tracking_interval, Config.tracking_correction_time,
+                                      Config.tracking_max_correction, Config.tracking_history)
+        self.task_manager.add_service(self._tracking.run, 'TrackingLoop')
+        self._poller = MotorPoller({'RA': self._RA_motor, 'DEC': self._DEC_motor}, logger, self._encoder_scale,
+                                   Config.poll_buffer_size,
+                                   {'slewing': Config.poll_interval_slewing,
+                                    'tracking': Config.poll_interval_tracking,
+                                    'parked': Config.poll_interval_parked},
+                                   Config.poll_moving_rate, self._poll_state)
+        if Config.poll_enabled:
+            self.task_manager.add_service(self._poller.run, 'MotorPoller')
+        # The GPIO edge callbacks of the switches call self._home_sensors[axis].notify() ('edge' sensor)
+        self._home_sensors = {'RA': make_home_sensor(Config.homing_sensor, is_RA_homed, Config.homing_poll_interval),
+                              'DEC': make_home_sensor(Config.homing_sensor, is_DEC_homed, Config.homing_poll_interval)}
+        if Config.homing_sensor == 'simulated':     # No switches yet: home where the mount stands
+            self._homing = {axis: SimulatedAxisHoming(axis, motor, logger, Config.homing_simulated_time)
+                            for axis, motor in (('RA', self._RA_motor), ('DEC', self._DEC_motor))}
+        else:
+            self._homing = {axis: AxisHoming(axis, motor, self._home_sensors[axis], logger, direction,
+                                             Config.homing_seek_speed, Config.homing_approach_speed,
+                                             Config.homing_backoff_angle, Config.homing_timeout)
+                            for axis, motor, direction in (('RA', self._RA_motor, Config.homing_ra_direction),
+                                                           ('DEC', self._DEC_motor, Config.homing_dec_direction))}
+        self._axis_moving: dict[str, bool] = {'RA': False, 'DEC': False}     # MoveAxis rate not 0
+        self._move_axis = {axis: RateMailbox(axis, self._axis_mover(axis, motor), self._move_axis_scheduler(axis), logger)
+                           for axis, motor in (('RA', self._RA_motor), ('DEC', self._DEC_motor))}
         # Add GPS Setup
 
     # ---------------------------- Async loop methods ---------------------------- #
@@ -176,7 +451,7 @@ class TelescopeDevice:
                     self.logger.info("[Instant connected]")
                 else:
                     self.logger.info("[Delayed connecting]")
-                    self.task_manager.add_task(self._async_connect)
+                    self.task_manager.add_task(self._async_connect, TaskPriority.HOUSEKEEPING, 'Connect')
                     self.logger.info("[Connection task added]")
             else:
                 self._connected = False
@@ -214,6 +489,7 @@ class TelescopeDevice:
         self._lock.acquire()
         self._site_elevation = elevation
         self._lock.release()
+        self._invalidate_device_state()
         self.logger.debug(f'[Site elevation] {str(elevation)}')
 
     @property
@@ -227,6 +503,7 @@ class TelescopeDevice:
         self._lock.acquire()
         self._site_latitude = latitude
         self._lock.release()
+        self._invalidate_device_state()
         self.logger.debug(f'[Site latitude] {str(latitude)}')
 
     @property
@@ -240,6 +517,7 @@ class TelescopeDevice:
         self._lock.acquire()
         self._site_longitude = longitude
         self._lock.release()
+        self._invalidate_device_state()
         self.logger.debug(f'[Site longitude] {str(longitude)}')
 
     # --------------------------- Telescope properties --------------------------- #
@@ -479,32 +757,25 @@ class TelescopeDevice:
         elevation = self.SiteElevation
         latitude = self.SiteLatitude
         longitude = self.SiteLongitude
-        time = astropyTime.now()
-        return convert_eq_to_altaz(self.RA, self.DEC, latitude, longitude, elevation, time)[0]
+        return convert_eq_to_altaz(self.RA, self.DEC, latitude, longitude, elevation, time.time())[0]
 
     @property
     def Azimuth(self) -> float:
         elevation = self.SiteElevation
         latitude = self.SiteLatitude
         longitude = self.SiteLongitude
-        time = astropyTime.now()
-        return convert_eq_to_altaz(self.RA, self.DEC, latitude, longitude, elevation, time)[1]
+        return convert_eq_to_altaz(self.RA, self.DEC, latitude, longitude, elevation, time.time())[1]
     
     @property
     def RA(self) -> float:
-        self._lock.acquire()
-        res = self._RA
-        self._lock.release()
-        return res
+        return self._equatorial(time.time(), time.monotonic())[0]
     @RA.setter
     def RA(self, ra: float) -> None:
-        self._lock.acquire()
-        self._RA = ra
-        self._lock.release()
+        self._set_position(ra, self.DEC)
         self.logger.debug(f'[RA] {str(ra)}')
 
     @property
-    def RA_Rate(self) -> float:# NOTE: Returns rate as arc"/sidereal second
+    def RA_Rate(self) -> float:# NOTE: Returns rate as seconds of RA/sidereal second
         self._lock.acquire()
         res = self._RA_rate
         self._lock.release()
@@ -514,8 +785,14 @@ class TelescopeDevice:
         self._lock.acquire()
         self._RA_rate = rate
         self._lock.release()
+        self._apply_rate_offsets()
         self.logger.debug(f'[RA rate] {str(rate)}')
 
+    @property
+    def MaxGuideRate(self) -> float:
+        """Highest RA and Dec guide rate [°/s]"""
+        return self._max_guide_rate
+
     @property
     def RAGuideRate(self) -> float:
         self._lock.acquire()
@@ -526,21 +803,17 @@ class TelescopeDevice:
     def RAGuideRate(self, rate: float) -> None:
         self._lock.acquire()
         self._guide_RA_rate = rate
+        self._guide_codes['RA'] = self._axis_code(rate)
         self._lock.release()
         self.logger.debug(f'[RA guide rate] {str(rate)}')
 
 
     @property
     def DEC(self) -> float:# NOTE: Returns rate as arc"/sidereal second
-        self._lock.acquire()
-        res = self._DEC
-        self._lock.release()
-        return res
+        return self._equatorial(time.time(), time.monotonic())[1]
     @DEC.setter
     def DEC(self, dec: float) -> None:
-        self._lock.acquire()
-        self._DEC = dec
-        self._lock.release()
+        self._set_position(self.RA, dec)
         self.logger.debug(f'[DEC] {str(dec)}')
 
     @property
@@ -554,6 +827,7 @@ class TelescopeDevice:
         self._lock.acquire()
         self._DEC_rate = rate
         self._lock.release()
+        self._apply_rate_offsets()
         self.logger.debug(f'[DEC rate] {str(rate)}')
 
     @property
@@ -566,15 +840,16 @@ class TelescopeDevice:
     def DECGuideRate(self, rate: float) -> None:
         self._lock.acquire()
         self._guide_DEC_rate = rate
+        self._guide_codes['DEC'] = self._axis_code(rate)
         self._lock.release()
         self.logger.debug(f'[DEC guide rate] {str(rate)}')
 
     @property
     def Slewing(self) -> bool:
         self._lock.acquire()
-        res = self._slewing
+        res = self._is_moving
         self._lock.release()
-        return res
+        return res or self._poller.moving()
 
     @property
     def Tracking(self) -> bool:
@@ -585,10 +860,15 @@ class TelescopeDevice:
     @Tracking.setter
     def Tracking(self, tracking: bool) -> None:
         self._lock.acquire()
-        tracking_rate_value = self._tracking_rates_values[self._tracking_rate.name]
-        # self._RA_motor.move_constant_speed('CW', tracking_rate_value) # TODO : still dummy code
-        self.tracking: bool = tracking
+        self._is_tracking = tracking
+        tracking_code = self._drive_rate_codes[self._tracking_rate]
         self._lock.release()
+        if tracking:
+            self._tracking.start(tracking_code)
+        else:
+            self._tracking.stop()
+        self._apply_rate_offsets()
+        self._invalidate_device_state()
         self.logger.debug(f'[Tracking] {str(tracking)} at rate {str(self.TrackingRate)}')
 
     @property
@@ -601,15 +881,15 @@ class TelescopeDevice:
     def TrackingRate(self, rate: float) -> None:
         self._lock.acquire()
         self._tracking_rate = DriveRates(rate)
+        tracking, tracking_code = self._is_tracking, self._drive_rate_codes[self._tracking_rate]
         self._lock.release()
+        if tracking:
+            self._tracking.start(tracking_code)
         self.logger.debug(f'[Tracking rate] {str(rate)}')
 
     @property
     def PulseGuiding(self) -> bool:
-        self._lock.acquire()
-        res = self._is_pulse_guiding
-        self._lock.release()
-        return res
+        return self._guider.guiding()
     @property
     def TrackingRates(self) -> list[DriveRates]:
         return [rate for rate in DriveRates]
@@ -639,6 +919,8 @@ class TelescopeDevice:
         self._lock.acquire()
         self._side_of_pier = side
         self._lock.release()
+        self._apply_rate_offsets()                  # The Dec axis sign follows the side
+        self._invalidate_device_state()
         self.logger.debug(f'[Side of pier] {str(side)}')
     
     @property
@@ -695,6 +977,159 @@ class TelescopeDevice:
         self._utc_date = utc_date
         self._lock.release()
         self.logger.debug(f'[UTC date] {str(utc_date)}')
+    # ------------------------------ State snapshot ------------------------------ #
+    @property
+    def DeviceState(self) -> list[tuple[str, Any]]:
+        """
+        All the DeviceState values, taken at a single instant.
+
+        The snapshot is computed once per tick of ``Config.devicestate_ttl``
+        seconds and shared by every request arriving during the tick. Only one
+        thread computes it, concurrent callers wait for its result. A snapshot
+        invalidated by a setter while it was computed is returned to its
+        caller but not kept.
+
+        Returns:
+            list[tuple[str, Any]]: (Alpaca name, value) pairs in DeviceState order.
+        """
+        snapshot = self._state_snapshot
+        if snapshot is not None and time.monotonic() - snapshot[0] < self._state_snapshot_ttl:
+            return snapshot[1]
+        with self._state_snapshot_lock:
+            snapshot = self._state_snapshot                 # Maybe computed while we waited
+            if snapshot is not None and time.monotonic() - snapshot[0] < self._state_snapshot_ttl:
+                return snapshot[1]
+            generation = self._state_generation
+            unix_time, t = time.time(), time.monotonic()
+            values = self._compute_device_state(unix_time, t)
+            with self._state_generation_lock:
+                if generation == self._state_generation:
+                    self._state_snapshot = (t, values)
+            return values
+
+    def _compute_device_state(self, unix_time: float, t: float) -> list[tuple[str, Any]]:
+        with self._lock:                                    # One consistent read of the status
+            at_park = self._at_park
+            at_home = self._at_home
+            pulse_guiding = self._guider.guiding()
+            side_of_pier = self._side_of_pier
+            slewing = self._is_moving
+            tracking = self._is_tracking
+            latitude = self._site_latitude
+            longitude = self._site_longitude
+            elevation = self._site_elevation
+        ra, dec = self._equatorial(unix_time, t)
+        slewing = slewing or self._poller.moving()
+        sidereal_time = get_local_sidereal_time(latitude, longitude, elevation, unix_time)
+        altitude, azimuth = convert_eq_to_altaz(ra, dec, latitude, longitude, elevation, unix_time)
+        return [
+            ('AtPark', at_park),
+            ('AtHome', at_home),
+            ('Declination', dec),
+            ('IsPulseGuiding', pulse_guiding),
+            ('RightAscension', ra),
+            ('SiderealTime', sidereal_time),
+            ('SideOfPier', side_of_pier),
+            ('Slewing', slewing),
+            ('Tracking', tracking),
+            ('UTCDate', get_UTC_date(unix_time)),
+            ('Altitude', altitude),
+            ('Azimuth', azimuth),
+        ]
+
+    def _invalidate_device_state(self) -> None:
+        with self._state_generation_lock:
+            self._state_generation += 1
+            self._state_snapshot = None
+
+    # ------------------------------ Motor positions ----------------------------- #
+    def _poll_state(self) -> str:
+        """Mount state setting the motor poll interval, see :py:class:`motor_poller.MotorPoller`"""
+        with self._lock:
+            if self._is_moving:
+                return 'slewing'
+            return 'parked' if self._at_park else 'tracking'
+
+    def _axes(self, unix_time: float, t: float) -> tuple[float, float] | None:
+        """
+        Hour angle axis [h] and Dec axis [°] (past ±90° beyond the pole) at the monotonic time t.
+
+        From the motor positions sampled by the poller relative to the last
+        sync, None without motor samples.
+        """
+        with self._lock:
+            ra, dec, ref = self._RA, self._DEC, self._sync_ref
+        ra_axis = self._poller.counts('RA', t)
+        dec_axis = self._poller.counts('DEC', t)
+        if ra_axis is None or dec_axis is None:
+            return None
+        if ref is None:             # First samples since the sync: the mount points at the synced position
+            ref = self._bind_reference(ra, dec, unix_time, ra_axis, dec_axis)
+        ha_ref, dec_ref, ra_axis_ref, dec_axis_ref = ref
+        return (ha_ref + self._encoder_scale.hours(ra_axis - ra_axis_ref),
+                dec_ref + self._encoder_scale.degrees(dec_axis - dec_axis_ref))
+
+    def _equatorial(self, unix_time: float, t: float) -> tuple[float, float]:
+        """
+        RA [h] and Dec [°] the mount points at.
+
+        From the axes (see :py:meth:`_axes`, interpolated at the monotonic
+        time ``t``): the RA axis moves the hour angle, so RA = LST - HA.
+        Without motor samples, the coordinates of the last sync.
+
+        Args:
+            unix_time: POSIX time of the read, for the sidereal time
+            t: time.monotonic() at the same instant
+        """
+        with self._lock:
+            ra, dec = self._RA, self._DEC
+        axes = self._axes(unix_time, t)
+        if axes is None:
+            return ra, dec
+        return self._axes_equatorial(*axes, unix_time)
+
+    def _axes_equatorial(self, ha: float, dec: float, unix_time: float) -> tuple[float, float]:
+        """RA [h] and Dec [°] at unix_time of the hour angle axis ha [h] and Dec axis dec [°]"""
+        with self._lock:
+            latitude, longitude, elevation = self._site_latitude, self._site_longitude, self._site_elevation
+        if abs(dec) > 90:           # Past the pole
+            dec = math.copysign(180, dec) - dec
+            ha += 12
+        return (get_local_sidereal_time(latitude, longitude, elevation, unix_time) - ha) % 24, dec
+
+    def _axis_angles(self, hour_angle: float, dec: float) -> tuple[float, float]:
+        """Hour angle axis [h] and Dec axis [°] pointing at hour_angle [h], dec [°] from the side of pier"""
+        with self._lock:
+            side = PierSide.pierWest if self._side_of_pier == PierSide.pierWest else PierSide.pierEast
+        ha_axis, dec_axis = SlewPlanner.axes(hour_angle, dec, side)
+        return ha_axis / 15, dec_axis
+
+    def _dec_sign(self) -> int:
+        """Sign of the Dec axis motion moving North: -1 past the pole (west of the pier)"""
+        with self._lock:
+            return -1 if self._side_of_pier == PierSide.pierWest else 1
+
+    def _bind_reference(self, ra: float, dec: float, unix_time: float, ra_axis: float,
+                        dec_axis: float) -> tuple[float, float, float, float]:
+        with self._lock:
+            lst = get_local_sidereal_time(self._site_latitude, self._site_longitude, self._site_elevation,
+                                          unix_time)
+            self._sync_ref = (*self._axis_angles(lst - ra, dec), ra_axis, dec_axis)
+            return self._sync_ref
+
+    def _set_position(self, ra: float, dec: float) -> None:
+        """Declare the mount pointing at (ra, dec) now, i.e. sync the motor positions"""
+        unix_time, t = time.time(), time.monotonic()
+        with self._lock:
+            self._RA = ra
+            self._DEC = dec
+            self._sync_ref = None
+        ra_axis = self._poller.counts('RA', t)
+        dec_axis = self._poller.counts('DEC', t)
+        if ra_axis is not None and dec_axis is not None:
+            self._bind_reference(ra, dec, unix_time, ra_axis, dec_axis)
+        self._invalidate_device_state()
+
     # ---------------------------------------------------------------------------- #
     #                                    Methods                                   #
     # ---------------------------------------------------------------------------- #
@@ -739,36 +1174,44 @@ class TelescopeDevice:
         self._connlock.release()
     # --------------------------- Slew related methods --------------------------- #
     # Utilities
-    def MoveAxis(self, axis: int, rate: float) -> None: # TODO : swap dunny funtion to real motor control
-        # async def move_axis_task():
-        #     if rate > 0:
-        #         dir = "CW"
-        #     else:
-        #         dir = "CCW"
-                
-        #     with self._lock:
-        #         self._is_moving = True
-        #         self._at_home = False
-        #         self._at_park = False
-                
-        #         # Exécution immédiate du mouvement
-        #         if axis == 'RA':
-        #             self._RA_motor.move_constant_speed(dir, abs(rate))
-        #         elif axis == 'DEC':
-        #             self._DEC_motor.move_constant_speed(dir, abs(rate))
-                    
-        #     self.logger.debug(f"Started moving axis {axis} at rate {rate}")
-
-        # self.task_manager.add_task(move_axis_task)
-        # self.logger.debug(f"MoveAxis task added to queue for axis {axis}")
-        async def simulator():
+    def MoveAxis(self, axis: int, rate: float) -> None:
+        """
+        Turn an axis at rate [°/s], or stop it (rate 0).
+
+        The rate goes to the axis :py:class:`rate_mailbox.RateMailbox`: a burst
+        of calls (handset button held) costs one motor command per bus slot,
+        with the newest rate, instead of one queued task per call.
+
+        Args:
+            axis (TelescopeAxes): Axis to move (the tertiary axis moves DEC)
+            rate (float): [°/s] Signed axis speed
+        """
+        with self._lock:
+            self._at_home = False
+            self._at_park = False
+        lane = 'RA' if TelescopeAxes(axis) == TelescopeAxes.axisPrimary else 'DEC'
+        self._move_axis[lane].post(rate)
+
+    def _axis_mover(self, lane: str, motor: AsyncMKSMotor) -> Callable[[float], Coroutine]:
+        async def apply(rate: float):
+            self._guider.cancel(lane)
             with self._lock:
-                self._is_moving = True
-                self._at_home = False
-                self._at_park = False
                 self.Tracking = False
-            await asyncio.sleep(5)
-        self.task_manager.add_task(simulator)
+            self._rate_mixers[lane].release()  # The motor is ours, the synthesizer sends nothing more
+            if rate == 0:
+                await motor.stop()
+            else:           # Motor rpm for the axis speed through the reduction ratio
+                await motor.move_constant_speed('CW' if rate > 0 else 'CCW', abs(rate) * self.r / 6)
+            with self._lock:
+                self._axis_moving[lane] = rate != 0
+                self._is_moving = any(self._axis_moving.values())
+            self._invalidate_device_state()
+        return apply
+
+    def _move_axis_scheduler(self, lane: str) -> Callable[[Callable], None]:
+        def schedule(drain: Callable[..., Coroutine]):
+            self.task_manager.add_task(drain, TaskPriority.SLEW, 'MoveAxis', lane)
+        return schedule
 
 
     def Park(self) -> None: # TODO : swap dunny funtion to real motor control
@@ -798,143 +1241,212 @@ class TelescopeDevice:
 
         # self.task_manager.add_task(park_task)
         # self.logger.debug("Park task added to queue")
-        async def simulator():
-            with self._lock:
-                self._is_moving = True
-                self._at_home = False
-                self._at_park = False
-                self.Tracking = False
+        async def simulator():                  # Same for each axis
             await asyncio.sleep(5)
-        
+
+        async def parked():
             with self._lock:
                 self._is_moving = False
                 self._at_home = False
                 self._at_park = True
                 self.Tracking = False
-        self.task_manager.add_task(simulator)
-    
-    def FindHome(self) -> None: # TODO : swap dunny funtion to real motor control
-        # def find_home_task():
-        #     self.logger.info("Finding home position...")
-        #     self._lock.acquire()
-        #     self._is_moving = True
-        #     self._at_home = False
-        #     self._at_park = False
-        #     self.Tracking = False
-        #     self._lock.release()
-
-        #     # Lancer la recherche du point d'origine pour RA et DEC
-        #     self._RA_motor.find_home()
-        #     self._DEC_motor.find_home()
-
-        #     # Attendre que les deux moteurs aient terminé leur mouvement
-        #     while self._RA_motor.is_moving() or self._DEC_motor.is_moving():
-        #         asyncio.sleep(0.1)
 
-        #     self._lock.acquire()
-        #     self._is_moving = False
-        #     self._at_home = True
-        #     self._lock.release()
-
-        #     self.logger.info("Home position found.")
+        with self._lock:
+            self._is_moving = True
+            self._at_home = False
+            self._at_park = False
+            self.Tracking = False
+        self.task_manager.add_axes_task({'RA': simulator, 'DEC': simulator}, TaskPriority.SLEW, 'Park', parked)
+    
+    def FindHome(self) -> None:
+        """
+        Home both axes at once, see :py:class:`homing.AxisHoming`.
 
-        # self.task_manager.add_task(find_home_task)
-        # self.logger.debug("FindHome task added to queue")
-        async def simulator():
-            with self._lock:
-                self._is_moving = True
-                self._at_home = False
-                self._at_park = False
-                self.Tracking = False
-            await asyncio.sleep(5)
-        
+        AtHome becomes True when both axes found their switch. A failed axis
+        is logged and leaves AtHome False; AbortSlew stops both. A homed axis
+        has a new encoder zero: its position becomes the home pose of
+        [homing] in config.toml. The other axis keeps its encoder reference,
+        its zero did not change.
+        """
+        def axis_homing(homing: AxisHoming):
+            async def find_home():
+                try:
+                    await homing.run()
+                except (HomingError, IOError) as ex:
+                    self.logger.error(f'[FindHome] {homing.name} failed: {ex}')
+            return find_home
+
+        async def homed():
+            homed_axes = {axis for axis, homing in self._homing.items() if homing.state == HomingState.HOMED}
+            at_home = len(homed_axes) == len(self._homing)
+            for axis in homed_axes:
+                self._poller.zeroed(axis)
             with self._lock:
                 self._is_moving = False
-                self._at_home = True
+                self._at_home = at_home
                 self._at_park = False
+                if at_home:                     # At the home pose, at the new zero, also without motor samples
+                    self._side_of_pier = PierSide.pierEast
+                    self._sync_ref = (Config.homing_hour_angle, Config.homing_declination, 0, 0)
+                    self._RA, self._DEC = self._axes_equatorial(Config.homing_hour_angle, Config.homing_declination,
+                                                                time.time())
+                elif self._sync_ref is not None:    # Only the homed axis moves to the home pose
+                    ha, dec, ra_axis, dec_axis = self._sync_ref
+                    if 'RA' in homed_axes:
+                        ha, ra_axis = Config.homing_hour_angle, 0
+                    if 'DEC' in homed_axes:
+                        dec, dec_axis = Config.homing_declination, 0
+                    self._sync_ref = (ha, dec, ra_axis, dec_axis)
                 self.Tracking = False
-        self.task_manager.add_task(simulator)
-
-    def AbortSlew(self): # TODO : swap dunny funtion to real motor control
-        # async def abort_slew_task():
-        #     self.logger.info("Aborting slew...")
-        #     with self._lock:
-        #         self._RA_motor.stop()
-        #         self._DEC_motor.stop()
-        #         self._is_moving = False
-        #     self.logger.info("Slew aborted.")
-
-        # self.task_manager.add_task(abort_slew_task)
-        # self.logger.debug("AbortSlew task added to queue")
-        async def simulator():
-            await asyncio.sleep(5)
+            self._invalidate_device_state()
+            self.logger.info(f'[FindHome] {"Home position found" if at_home else "Homing failed"}')
+
+        self._axes(time.time(), time.monotonic())  # Bind the encoder reference before a zero changes
+        with self._lock:
+            self._is_moving = True
+            self._at_home = False
+            self._at_park = False
+            self.Tracking = False
+        for mixer in self._rate_mixers.values():
+            mixer.release()
+        self.task_manager.add_axes_task({axis: axis_homing(homing) for axis, homing in self._homing.items()},
+                                        TaskPriority.SLEW, 'FindHome', homed)
+
+    def AbortSlew(self):
+        """
+        Stop both motors at once, cancelling the running and queued motions
+        (slews, MoveAxis rates, homing).
+        """
+        def axis_stop(axis: str, motor: AsyncMKSMotor):
+            async def stop():
+                try:
+                    await motor.stop()
+                except IOError as ex:
+                    self.logger.error(f'[AbortSlew] {axis} stop failed: {ex}')
+            return stop
+
+        async def stopped():
             with self._lock:
                 self._is_moving = False
+                self._axis_moving = {'RA': False, 'DEC': False}
+            for mixer in self._rate_mixers.values():   # Stopped: resend from the next code (tracking tick)
+                mixer.release()
+            self._invalidate_device_state()
 
-        self.task_manager.add_task(simulator)
+        self._guider.cancel()
+        self.task_manager.add_axes_task({'RA': axis_stop('RA', self._RA_motor), 'DEC': axis_stop('DEC', self._DEC_motor)},
+                                        TaskPriority.EMERGENCY, 'AbortSlew', stopped)
 
-    def SlewToCoordinates(self, RightAscension: float, Declination: float): # TODO : swap dunny funtion to real motor control
-        # async def slew_to_coordinates_task():
-        #     self.logger.info(f"Slewing to coordinates RA={RightAscension}, DEC={Declination}...")
-        #     self._lock.acquire()
-        #     self._is_moving = True
-        #     self._at_home = False
-        #     self._at_park = False
-        #     self.Tracking = False
-        #     self._lock.release()
-    
-        #     # Calcul des vitesses de déplacement pour RA et DEC
-        #     tracking_rate_value = self._tracking_rates_values[self.TrackingRate]
-        #     ra_rate = self.RA_Rate
-        #     dec_rate = self.DEC_Rate
-
-        #     # Calcul des mouvements pour RA et DEC
-        #     motor_ra = self._RA_motor.read_shaft_angle()
-        #     motor_dec = self._DEC_motor.read_shaft_angle()
-        #     ra_slew_duration = abs(RightAscension - motor_ra) / ra_rate
-        #     dec_slew_duration = abs(Declination - motor_dec) / dec_rate
-        #     slew_time = max(ra_slew_duration, dec_slew_duration)
-
-        #     # calculate RA drift due to slew
-        #     ra_drift = tracking_rate_value * slew_time
-        #     compensated_ra = motor_ra + ra_drift
-
-        #     self._RA_motor.move_to_position(compensated_ra)
-        #     self._DEC_motor.move_to_position(Declination)
-
-        #     # Exécution des mouvements
-        #     self._RA_motor.move_to_target(RightAscension, ra_rate)
-        #     self._DEC_motor.move_to_target(Declination, dec_rate)
-            
-        #     # Attendre que les deux moteurs aient terminé leur mouvement
-        #     while self._RA_motor.is_moving() or self._DEC_motor.is_moving():
-        #         asyncio.sleep(0.1)
-
-        #     self._lock.acquire()
-        #     self._is_moving = False
-        #     self._lock.release()
-        #     self.logger.info("Slewing complete.")
-        # self.task_manager.add_task(slew_to_coordinates_task)
-        # self.logger.debug("SlewToCoordinates task added to queue")
-        
-        async def simulator():
-            with self._lock:
-                self._is_moving = True
-                self._at_home = False
-                self._at_park = False
-                tracking_state = self.Tracking
-                self.Tracking = False
-            await asyncio.sleep(5)
-        
+    def SlewToCoordinates(self, RightAscension: float, Declination: float):
+        """
+        Slew to RightAscension [h], Declination [°] along a planned trajectory.
+
+        :py:class:`slew_planner.SlewPlanner` gives each axis an acceleration
+        and jerk limited profile, both arriving at once on the target where
+        it will be at the arrival, after a meridian flip if needed. Each
+        lane waits until the other one starts (a lane may still be busy with
+        an earlier task): the plan is made then, from the position at that
+        time, and both axes start together. Each axis follows its profile
+        through the ``slew`` source of its rate mixer, at the average
+        velocity of every step, so the position is exact at the end of each
+        step. Tracking, if on, resumes on arrival.
+        """
+        slew: dict[str, Any] = {}
+        lanes_started: set[str] = set()
+        all_started = asyncio.Event()           # Both lanes running: planned (AbortSlew cancels the waiting one)
+
+        async def started(axis: str) -> tuple[SlewPlan, float]:
+            lanes_started.add(axis)
+            if len(lanes_started) < 2:
+                await all_started.wait()
+            elif not all_started.is_set():      # Last lane to start: plan from the position now
+                slew['plan'] = self._plan_slew(RightAscension, Declination)
+                slew['start'] = time.monotonic()
+                all_started.set()
+                self.logger.debug(f'[SlewToCoordinates] {slew["plan"].duration:.2f} s, '
+                                  f'{PierSide(slew["plan"].pier_side).name}, {slew["plan"].iterations} estimates')
+            return slew['plan'], slew['start']
+
+        def follow(axis: str):
+            async def move():
+                plan, start = await started(axis)
+                profile, mixer = plan.profiles[axis], self._rate_mixers[axis]
+                step = Config.slew_step
+                end = None
+                try:
+                    k = 0
+                    while k * step < profile.duration:
+                        t0, t1 = k * step, min((k + 1) * step, profile.duration)
+                        rate = (profile.position(t1) - profile.position(t0)) / (t1 - t0)
+                        mixer.set('slew', round_fraction(self._axis_code(rate)), start + t0)
+                        k += 1
+                        await asyncio.sleep(max(0.0, start + t1 - time.monotonic()))
+                    end = start + profile.duration
+                finally:                        # Arrived, or cancelled by AbortSlew: stop now
+                    mixer.set('slew', 0, end)
+            return move
+
+        async def arrived():
             with self._lock:
                 self._is_moving = False
                 self._at_home = False
                 self._at_park = False
+                self._side_of_pier = slew['plan'].pier_side
+                if self._poller.counts('RA', time.monotonic()) is None:    # No motor readback
+                    self._RA, self._DEC = RightAscension, Declination
                 self.Tracking = tracking_state
-        self.task_manager.add_task(simulator)
+
+        with self._lock:
+            self._is_moving = True
+            self._at_home = False
+            self._at_park = False
+            tracking_state = self.Tracking
+            self.Tracking = False
+        self.task_manager.add_axes_task({'RA': follow('RA'), 'DEC': follow('DEC')}, TaskPriority.SLEW,
+                                        'SlewToCoordinates', arrived)
+
+    def _slew_start(self) -> tuple[float, float, float]:
+        """Hour angle axis [°], Dec axis [°] and local sidereal time [h] a slew starts from now"""
+        unix_time, t = time.time(), time.monotonic()
+        with self._lock:
+            latitude, longitude, elevation = self._site_latitude, self._site_longitude, self._site_elevation
+            synced = self._RA, self._DEC
+        lst = get_local_sidereal_time(latitude, longitude, elevation, unix_time)
+        axes = self._axes(unix_time, t)
+        if axes is None:                        # No motor samples: at the synced position
+            axes = self._axis_angles(lst - synced[0], synced[1])
+        return axes[0] * 15, axes[1], lst
+
+    def _plan_slew(self, ra: float, dec: float) -> SlewPlan:
+        """Slew plan from the axes now to ra [h], dec [°]"""
+        ha_axis, dec_axis, lst = self._slew_start()
+        return self._slew_planner.plan(ha_axis, dec_axis, ra, dec, lst)
+
+    def _slew_times(self, parameters: str) -> dict[str, list]:
+        """Durations [s] and sides of pier of slews from now to the [[ra, dec], ...] targets of parameters (JSON)"""
+        form = 'SlewTimes parameters must be a JSON list of targets [[ra_h, dec_deg], ...]'
+        try:
+            targets = np.asarray(json.loads(parameters), dtype=float)
+        except (ValueError, TypeError) as ex:
+            raise InvalidValueException(f'{form}: {ex}')
+        if targets.size == 0:
+            targets = targets.reshape(0, 2)
+        if targets.ndim != 2 or targets.shape[1] != 2:
+            raise InvalidValueException(f'{form}, not an array of shape {targets.shape}')
+        ra, dec = targets[:, 0], targets[:, 1]
+        # Same bounds as the SlewToCoordinates endpoint (NaN fails both)
+        bad = np.flatnonzero(~((-90 <= dec) & (dec <= 90)))
+        if bad.size:
+            raise InvalidValueException(f'Declination {dec[bad[0]]} of target {bad[0]} is out of range (-90, 90)')
+        bad = np.flatnonzero(~((0 <= ra) & (ra <= 23.999999)))
+        if bad.size:
+            raise InvalidValueException(f'RightAscension {ra[bad[0]]} of target {bad[0]} is out of range (0, 23.999999)')
+        ha_axis, dec_axis, lst = self._slew_start()
+        durations, sides = self._slew_planner.durations(ha_axis, dec_axis, ra, dec, lst)
+        return {'Durations': np.round(durations, 3).tolist(), 'SideOfPier': sides.tolist()}
 
     def SlewToAltAz(self, Altitude: float, Azimuth: float, ): #REVIEW
-        ra, dec = convert_altaz_to_eq(Altitude, Azimuth, self.SiteLatitude, self.SiteLongitude, self.SiteElevation, Time.now())
+        ra, dec = convert_altaz_to_eq(Altitude, Azimuth, self.SiteLatitude, self.SiteLongitude, self.SiteElevation, time.time())
         self.SlewToCoordinates(ra, dec)
 
     def SlewToTarget(self): #REVIEW
@@ -952,24 +1464,34 @@ class TelescopeDevice:
 
     def DestinationSideOfPier(self, ra:float, dec: float) -> PierSide: # REVIEW
         lst: float = get_local_sidereal_time(self.SiteLatitude, self.SiteLongitude, self.SiteElevation)
-
-        ha: float = lst - ra
-
-        # Normalisation de HA entre -12 et +12 heures
-        if ha < -12:
-            ha += 24
-        elif ha > 12:
-            ha -= 24
-        # Détermination du côté du pilier en fonction de HA
-        if -6 <= ha <= 6:
-            return PierSide.pierEast
-        else:
-            return PierSide.pierWest
+        # Same rule as the slews (HA within flip_hour_angle: east of the pier)
+        return self._slew_planner.pier_side(lst - ra)
 
     # -------------------------- Guiding relatedmethods -------------------------- #
-    def PulseGuide(self, Direction, Duration):# TODO : Not implemented yet
-        # Implementation here
-        pass
+    def PulseGuide(self, Direction: GuideDirections, Duration: int) -> None:
+        """
+        Move at the guide rate in Direction for Duration milliseconds, on top of tracking.
+
+        Returns at once; PulseGuiding stays True until the end of the pulse.
+        North/South and East/West pulses run at the same time, see
+        :py:class:`pulse_guide.PulseGuider`.
+        """
+        self._guider.pulse(GuideDirections(Direction), Duration)
+
+    def _axis_code(self, rate: float) -> Fraction:
+        """Exact motor speed code of an axis rate [°/s]"""
+        return rate_code(Fraction(str(rate)) * 3600, self.r, self._RA_motor.Mstep, self._RA_motor.motor_type)
+
+    def _apply_rate_offsets(self):
+        """Set the RightAscensionRate and DeclinationRate offsets of the axes, 0 when not tracking"""
+        with self._lock:
+            tracking = self._is_tracking
+            # [s of RA / sidereal s] -> ["/s]: x 15 x 1.0027379 (the sidereal rate); RA up is hour angle down
+            ra = -Fraction(str(self._RA_rate)) * DRIVE_RATES[DriveRates.driveSidereal]
+            dec = Fraction(str(self._DEC_rate)) * self._dec_sign()
+        for axis, rate in (('RA', ra), ('DEC', dec)):
+            code = rate_code(rate, self.r, self._RA_motor.Mstep, self._RA_motor.motor_type) if tracking else 0
+            self._rate_mixers[axis].set('offset', code)
 
     # ---------------------- Telescope parameters related methods --------------------- #
     def CanMoveAxis(self, Axis:int) -> bool:# NOTE : Can always move each axis
@@ -1007,8 +1529,7 @@ class TelescopeDevice:
             RightAscension (float): The right ascension coordinate to sync to, in hours.
             Declination (float): The declination coordinate to sync to, in degrees.
         """
-        self._RA:float = RightAscension
-        self._DEC:float = Declination
+        self._set_position(RightAscension, Declination)
 
     def SyncToAltAz(self, Altitude: float, Azimuth: float) -> None:# TODO : change time source
         """
@@ -1020,9 +1541,8 @@ class TelescopeDevice:
             Altitude (float): The altitude coordinate to sync to, in degrees.
             Azimuth (float): The azimuth coordinate to sync to, in degrees.
         """
-        RA, DEC = convert_altaz_to_eq(Altitude, Azimuth, self._site_latitude, self._site_longitude, self._site_elevation, Time.now())
-        self._RA = RA
-        self._DEC = DEC
+        RA, DEC = convert_altaz_to_eq(Altitude, Azimuth, self._site_latitude, self._site_longitude, self._site_elevation, time.time())
+        self._set_position(RA, DEC)
 
     def SyncToTarget(self) -> None:
         """
@@ -1032,8 +1552,39 @@ class TelescopeDevice:
         """
         # Implement logic to sync to target
         if self._target_ra is not None and self._target_dec is not None:
-            self._RA = self._target_ra
-            self._DEC = self._target_dec
+            self._set_position(self._target_ra, self._target_dec)
+
+    # ---------------------------------- Actions --------------------------------- #
+    def Action(self, ActionName: str, ActionParameters: str) -> str:
+        """
+        Run a driver specific action, one of SUPPORTED_ACTIONS, return its result as JSON.
+
+        TrackingStats: statistics of the tracking loop (tick jitter, CPU per
+        tick, tracking and following errors), see
+        :py:meth:`tracking.TrackingLoop.stats`. With ActionParameters 'reset',
+        they are cleared after being returned.
+
+        SlewTimes: durations of slews from the current position, for
+        sequencers ordering targets. ActionParameters is a JSON list of
+        [RightAscension, Declination] pairs; the result has ``Durations`` [s]
+        and ``SideOfPier`` (PierSide values, after a meridian flip or not),
+        one per target, from :py:meth:`slew_planner.SlewPlanner.durations`.
+
+        Raises:
+            ActionNotImplementedException: Unknown ActionName
+            InvalidValueException: Malformed SlewTimes parameters or targets
+        """
+        if ActionName.lower() == 'trackingstats':
+            stats = self._tracking.stats()
+            if ActionParameters.strip().lower() == 'reset':
+                self._tracking.reset()
+            return json.dumps(stats)
+        if ActionName.lower() == 'slewtimes':
+            return json.dumps(self._slew_times(ActionParameters))
+        raise ActionNotImplementedException(f'Action {ActionName} is not implemented, see SupportedActions')
 
     # --------------------------------- Utilities -------------------------------- #
+    def angle_to_steps(self, angle_degrees: float) -> int:
+        """Motor microsteps of an axis angle [°] (nearest microstep, exact, see microsteps.AxisScale)"""
+        return self._step_scale.counts(angle_degrees)
     
\ No newline at end of file
@@ -0,0 +1,208 @@
+import asyncio
+import collections
+import math
+import threading
+import time
+from fractions import Fraction
+from logging import Logger
+from typing import Callable
+
+from microsteps import AxisScale, WrappingCounter
+from motor_control import AsyncMKSMotor
+from rate_synth import PULSES_PER_CODE, RateSynthesizer, round_fraction
+
+class TrackingLoop:
+    """Closed-loop RA tracking, ticking on absolute deadlines
+
+    While tracking, a tick runs every ``interval`` seconds, at start + k x
+    interval: a late tick does not delay the next ones, and ticks missed by
+    more than an interval are counted and skipped. Each tick reads the
+    encoder and the following error of the motor, and compares the encoder
+    with the position the axis was asked for since tracking started: the
+    integral of the codes given to the rate synthesizer (tracking rate,
+    guide pulses, rate offsets), the corrections left out. The error is corrected over
+    ``correction_time`` by a code added to the tracking code, at most
+    ``max_correction`` times it, which the synthesizer dithers with the rest.
+    The commanded position is exact (Fractions of a pulse), so the
+    corrections only remove what the motor really lost (bus, load, slip).
+
+    ``apply(code, at)`` sets the tracking code of RA from the monotonic
+    time at, the ``tracking`` source of its :py:class:`~rate_mixer.RateMixer`:
+    guide pulses and rate offsets add up with it in the synthesizer, and in
+    the commanded position.
+
+    Args:
+        synth: Rate synthesizer of the RA motor
+        motor: RA motor, for the encoder
+        scale: Encoder counts per axis turn
+        apply: Sets the RA code (tracking + correction)
+        logger: Device logger
+        interval: [s] Tick period
+        correction_time: [s] Time to correct an error
+        max_correction: Max correction code, times the tracking code
+        history: Tick errors kept for the RMS
+    """
+    def __init__(self, synth: RateSynthesizer, motor: AsyncMKSMotor, scale: AxisScale,
+                 apply: Callable[[Fraction, float], None], logger: Logger, interval: float = 1.0,
+                 correction_time: float = 5.0, max_correction: float = 1.0, history: int = 600):
+        self.synth = synth
+        self.motor = motor
+        self.scale = scale
+        self.apply = apply
+        self.logger = logger
+        self.interval = interval
+        self.correction_time = correction_time
+        self.max_correction = Fraction(str(max_correction))
+        # [encoder counts per code x s]: 500 pulses/s per code, 65536 counts per motor turn
+        self.counts_per_code_s = PULSES_PER_CODE * Fraction(65536) * Fraction(str(motor.motor_type)) / (360 * motor.Mstep)
+        self.active = False
+        self.code = Fraction(0)                 # Tracking code (drive rate)
+        self.correction = Fraction(0)
+        self._lock = threading.Lock()
+        self._run = 0                           # Bumped by start(): the ticks of an older run stop
+        self._wake: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._counter = WrappingCounter(48)
+        self._errors: collections.deque[float] = collections.deque(maxlen=max(1, history))
+        self.reset()
+
+    def reset(self):
+        """Clear the statistics"""
+        self.ticks = 0
+        self.misses = 0                         # Ticks skipped, more than an interval late
+        self.failures = 0                       # Ticks without a reading
+        self.jitter_sum = 0.0                   # [s] Tick wake-up after its deadline
+        self.jitter_max = 0.0
+        self.cpu_sum = 0.0                      # [s] CPU time of a tick, bus waits excluded
+        self.cpu_max = 0.0
+        self.error = 0.0                        # ["] Encoder - commanded position, at the axis
+        self.error_max = 0.0
+        self.following = 0.0                    # ["] Following error of the driver (0x39), at the axis
+        self.following_max = 0.0
+        self._errors.clear()
+
+    # ------------------------------ Any thread ------------------------------ #
+    def start(self, code: Fraction):
+        """Track at code, from now"""
+        with self._lock:
+            self.code = Fraction(code)
+            if self.active:
+                self.apply(self.code + self.correction, time.monotonic())
+                return
+            self.active = True
+            self.correction = Fraction(0)
+            self._run += 1
+            self.apply(self.code, time.monotonic())
+            loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            loop.call_soon_threadsafe(wake.set)
+
+    def stop(self):
+        """Stop tracking: the tracking code becomes 0"""
+        with self._lock:
+            if not self.active:
+                return
+            self.active = False
+            self.correction = Fraction(0)
+            self.apply(Fraction(0), time.monotonic())
+
+    def stats(self) -> dict:
+        """Loop and error statistics since the last :py:meth:`reset`"""
+        ticks = max(self.ticks, 1)
+        errors = list(self._errors)
+        rms = math.sqrt(sum(e * e for e in errors) / len(errors)) if errors else 0.0
+        return {'Tracking': self.active, 'Interval': self.interval, 'Ticks': self.ticks,
+                'Misses': self.misses, 'Failures': self.failures,
+                'JitterMeanMs': self.jitter_sum / ticks * 1e3, 'JitterMaxMs': self.jitter_max * 1e3,
+                'CpuMeanUs': self.cpu_sum / ticks * 1e6, 'CpuMaxUs': self.cpu_max * 1e6,
+                'ErrorArcsec': self.error, 'ErrorRmsArcsec': rms, 'ErrorMaxArcsec': self.error_max,
+                'FollowingArcsec': self.following, 'FollowingMaxArcsec': self.following_max,
+                'Correction': float(self.correction / self.code) if self.code else 0.0,
+                'Commands': self.synth.commands}
+
+    # ---------------------------- Event loop ---------------------------- #
+    async def _read_encoder(self) -> tuple[float, int]:
+        """(Monotonic time, encoder counts), the time at the middle of the exchange"""
+        t0 = time.monotonic()
+        raw = await self.motor.read_encoder_value()
+        return (t0 + time.monotonic()) / 2, self._counter.update(raw)
+
+    def _arcsec(self, counts: float) -> float:
+        return self.scale.degrees(counts) * 3600
+
+    async def run(self):
+        """Track whenever started, until cancelled"""
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+        try:
+            while True:
+                with self._lock:
+                    active, run = self.active, self._run
+                if not active:
+                    self._wake.clear()
+                    if not self.active:
+                        await self._wake.wait()
+                    continue
+                try:
+                    await self._track(run)
+                except IOError as ex:
+                    self.failures += 1
+                    self.logger.warning(f'[Tracking] No encoder reading, open loop for now: {ex}')
+                    await asyncio.sleep(self.interval)
+        finally:
+            with self._lock:
+                self._loop = self._wake = None
+
+    async def _track(self, run: int):
+        """Ticks of one tracking run, from an encoder reading taken as the reference"""
+        t_ref, e_ref = await self._read_encoder()
+        i_ref = self.synth.integral(t_ref)
+        corr_integral, corr_since = Fraction(0), t_ref          # [code x s] of the corrections
+        start = time.monotonic()
+        k = 0
+        while True:
+            k += 1
+            deadline = start + k * self.interval
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            late = time.monotonic() - deadline
+            if late >= self.interval:           # Blocked loop: skip, keep the schedule
+                skipped = int(late // self.interval)
+                self.misses += skipped
+                k += skipped
+                late -= skipped * self.interval
+            with self._lock:
+                if self._run != run or not self.active:
+                    return
+            try:
+                t, counts = await self._read_encoder()
+                following = await self.motor.read_angular_error()
+            except IOError as ex:
+                self.failures += 1
+                self.logger.debug(f'[Tracking] Tick without a reading: {ex}')
+                continue
+            c0 = time.thread_time()
+            with self._lock:
+                if self._run != run or not self.active:
+                    return
+                commanded = self.synth.integral(t) - i_ref - corr_integral - self.correction * round_fraction(t - corr_since)
+                error = counts - e_ref - commanded * self.counts_per_code_s
+                limit = self.max_correction * abs(self.code)
+                correction = -error / (self.counts_per_code_s * Fraction(str(self.correction_time)))
+                correction = round_fraction(min(max(correction, -limit), limit))   # Bounded denominators
+                now = time.monotonic()
+                corr_integral += self.correction * round_fraction(now - corr_since)
+                corr_since = now
+                self.correction = correction
+                self.apply(self.code + correction, now)
+            self.ticks += 1
+            self.jitter_sum += late
+            self.jitter_max = max(self.jitter_max, late)
+            self.error = self._arcsec(float(error))
+            self.error_max = max(self.error_max, abs(self.error))
+            self._errors.append(self.error)
+            self.following = self._arcsec(following)
+            self.following_max = max(self.following_max, abs(self.following))
+            cpu = time.thread_time() - c0
+            self.cpu_sum += cpu
+            self.cpu_max = max(self.cpu_max, cpu)
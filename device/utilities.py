@@ -2,6 +2,10 @@ from astropy.coordinates import AltAz, FK5, EarthLocation
 from astropy.coordinates.angles.core import Longitude
 from astropy.units import m, deg, hourangle, hour # type: ignore
 from astropy.time import Time
+from config import Config
+import time as _time_module
+from datetime import datetime, timezone
+from astrometry import SiderealClock, EquatorialTransform
 
 def read_pos_RA():
     # Implementation for reading RA position
@@ -14,14 +18,37 @@ def read_pos_Dec():
     pass
 
 
-def get_local_sidereal_time(latitude:float, longitude:float, height:float):
+_sidereal_clock = SiderealClock(Config.site_longitude, Config.dut1)
+
+def get_local_sidereal_time(latitude:float, longitude:float, height:float, unix_time:float|None = None):
     """
-    Récupère le Local Sidereal Time pour une position donnée
-    
+    Récupère le Local Sidereal Time pour une position donnée (heures)
+
+    Utilise le moteur analytique de astrometry.py, ou astropy si
+    Config.sidereal_engine vaut 'astropy'. Les constantes du site ne
+    sont recalculées que lorsque la longitude change.
+
+    Paramètres:
+    - latitude: latitude en degrés
+    - longitude: longitude en degrés
+    - height: altitude en mètres (optionnel, défaut: 0)
+    - unix_time: instant POSIX (optionnel, défaut: maintenant)
+    """
+    if Config.sidereal_engine == 'astropy':
+        return get_local_sidereal_time_astropy(latitude, longitude, height, unix_time)
+    if longitude != _sidereal_clock.longitude:
+        _sidereal_clock.set_site(longitude)
+    return _sidereal_clock.local_sidereal_hours(unix_time)
+
+def get_local_sidereal_time_astropy(latitude:float, longitude:float, height:float, unix_time:float|None = None):
+    """
+    Local Sidereal Time de référence, calculé par astropy (heures)
+
     Paramètres:
     - latitude: latitude en degrés
     - longitude: longitude en degrés
     - height: altitude en mètres (optionnel, défaut: 0)
+    - unix_time: instant POSIX (optionnel, défaut: maintenant)
     """
     # Création de l'objet EarthLocation
     location = EarthLocation(
@@ -31,20 +58,22 @@ def get_local_sidereal_time(latitude:float, longitude:float, height:float):
     )
     
     # Récupération du temps GPS actuel
-    current_time: Time = Time.now()
+    current_time: Time = Time.now() if unix_time is None else Time(unix_time, format='unix')
     
     # Calcul du Local Apparent Sidereal Time
     last: Longitude = current_time.sidereal_time('apparent', longitude=location.lon)
     last_hour:float = last.to_value(hourangle) # type: ignore
     return last_hour
 
-def get_UTC_date():
+def get_UTC_date(unix_time: float | None = None) -> str:
     """The UTC date/time of the telescope's internal clock in ISO 8601 format including 
     fractional seconds. The general format (in Microsoft custom date format style) is 
     yyyy-MM-ddTHH:mm:ss.fffffffZ, e.g. 2016-03-04T17:45:31.1234567Z or 
     2016-11-14T07:03:08.1234567Z. 
-    Please note the compulsary trailing Z indicating the 'Zulu', UTC time zone."""
-    return "2016-03-04T17:45:31.1234567Z"
+    Please note the compulsary trailing Z indicating the 'Zulu', UTC time zone.
+    At the POSIX time unix_time, now by default."""
+    date = datetime.fromtimestamp(_unix_time(unix_time), timezone.utc)
+    return date.strftime('%Y-%m-%dT%H:%M:%S.') + f'{date.microsecond:06d}0Z'
 
 def is_RA_homed() -> bool:
     return False
@@ -52,20 +81,72 @@ def is_RA_homed() -> bool:
 def is_DEC_homed() -> bool:
     return True
 
-def convert_altaz_to_eq(alt:float, az:float, latitude:float, longitude:float, elevation:float, time):
+_eq_transform = EquatorialTransform(Config.site_latitude, Config.site_longitude, Config.dut1,
+                                    Config.coord_cache_interval)
+
+def _unix_time(time) -> float:
+    """Instant POSIX depuis None (maintenant), un float ou un astropy Time"""
+    if time is None:
+        return _time_module.time()
+    if isinstance(time, Time):
+        return float(time.unix)
+    return float(time)
+
+def _astropy_time(time) -> Time:
+    """astropy Time depuis None (maintenant), un float POSIX ou un astropy Time"""
+    if time is None:
+        return Time.now()
+    if isinstance(time, Time):
+        return time
+    return Time(time, format='unix')
+
+def _use_astropy(accurate:bool|None) -> bool:
+    return Config.coord_engine == 'astropy' if accurate is None else accurate
+
+def convert_altaz_to_eq(alt, az, latitude:float, longitude:float, elevation:float, time=None, accurate:bool|None = None):
+    """
+    Convertit Alt/Az (degrés) en RA (heures) / Dec (degrés) J2000
+
+    Scalaires ou tableaux NumPy. Le calcul NumPy de astrometry.py est utilisé
+    par défaut; accurate=True (ou Config.coord_engine = 'astropy') passe par
+    astropy.
+
+    Paramètres:
+    - time: None (maintenant), instant POSIX ou astropy Time
+    """
+    if not _use_astropy(accurate):
+        if (latitude, longitude) != (_eq_transform.latitude, _eq_transform.longitude):
+            _eq_transform.set_site(latitude, longitude)
+        return _eq_transform.altaz_to_eq(alt, az, _unix_time(time))
+
     # Définir la position du site
     location = EarthLocation(lat=latitude*deg, lon=longitude*deg, height=elevation*m)
     
     # Définir les coordonnées AltAz
-    altaz = AltAz(alt=alt*deg, az=az*deg, location=location, obstime=time)
+    altaz = AltAz(alt=alt*deg, az=az*deg, location=location, obstime=_astropy_time(time))
     
     # Convertir en équatorial
-    equatorial = altaz.transform_to(FK5)
+    equatorial = altaz.transform_to(FK5(equinox='J2000'))
     
     # Retourner les valeurs RA et Dec
     return equatorial.ra.hour, equatorial.dec.degree
 
-def convert_eq_to_altaz(ra:float, dec:float, latitude:float, longitude:float, elevation:float, time):
+def convert_eq_to_altaz(ra, dec, latitude:float, longitude:float, elevation:float, time=None, accurate:bool|None = None):
+    """
+    Convertit RA (heures) / Dec (degrés) J2000 en Alt/Az (degrés)
+
+    Scalaires ou tableaux NumPy. Le calcul NumPy de astrometry.py est utilisé
+    par défaut; accurate=True (ou Config.coord_engine = 'astropy') passe par
+    astropy.
+
+    Paramètres:
+    - time: None (maintenant), instant POSIX ou astropy Time
+    """
+    if not _use_astropy(accurate):
+        if (latitude, longitude) != (_eq_transform.latitude, _eq_transform.longitude):
+            _eq_transform.set_site(latitude, longitude)
+        return _eq_transform.eq_to_altaz(ra, dec, _unix_time(time))
+
     # Définir la position du site
     location = EarthLocation(lat=latitude*deg, lon=longitude*deg, height=elevation*m)
     
@@ -73,15 +154,8 @@ def convert_eq_to_altaz(ra:float, dec:float, latitude:float, longitude:float, el
     equatorial = FK5(ra=ra*hourangle, dec=dec*deg, equinox='J2000')
     
     # Convertir en AltAz
-    altaz = equatorial.transform_to(AltAz(obstime=time, location=location))
+    altaz = equatorial.transform_to(AltAz(obstime=_astropy_time(time), location=location))
     
     # Retourner les valeurs Alt et Az
     return altaz.alt.degree, altaz.az.degree
 
-
-def angle_to_steps(self, angle_degrees:float) -> int:
-    """
-    Convert an angle in degrees to motor steps
-    """
-    steps_per_revolution = self.steps_rotation * self.r * self.microstepping
-    return int(angle_degrees * steps_per_revolution / 360)
\ No newline at end of file